@@ -26,13 +26,38 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.batch_runner import BatchRunner, save_account_state
+from tradingagents.graph.delayed_reflection import DelayedReflectionManager
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.price_store import price_store_in_use, warm_price_store
+from tradingagents.dataflows.fundamentals_store import prefetch_fundamentals
+from tradingagents.dataflows.interface import get_category_for_method, get_vendor
+from tradingagents.dataflows.trading_calendar import get_trading_calendar, window_start
 from tradingagents.agents.utils.debate_separator import split_debate_responses
+from tradingagents.agents.utils.debate_compaction import compaction_report
 from cli.models import AnalystType
 from cli.utils import *
 
 console = Console()
 
+# 全局交易日志（trade_history.csv）的列
+TRADE_HISTORY_FIELDS = [
+    "timestamp",
+    "ticker",
+    "date",
+    "action",
+    "quantity",
+    "reference_price",
+    "trade_value",
+    "cash_before",
+    "cash_after",
+    "position_before",
+    "position_after",
+    "avg_cost_before",
+    "avg_cost_after",
+    "notes",
+]
+
 app = typer.Typer(
     name="TradingAgents",
     help="TradingAgents CLI: Multi-Agents LLM Financial Trading Framework",
@@ -859,9 +884,7 @@ def extract_content_string(content):
     else:
         return str(content)
 
-def run_analysis():
-    selections = get_user_selections()
-
+def _config_from_selections(selections):
     base_config = DEFAULT_CONFIG.copy()
     base_config["max_debate_rounds"] = selections["research_depth"]
     base_config["max_risk_discuss_rounds"] = selections["research_depth"]
@@ -869,10 +892,11 @@ def run_analysis():
     base_config["deep_think_llm"] = selections["deep_thinker"]
     base_config["backend_url"] = selections["backend_url"]
     base_config["llm_provider"] = selections["llm_provider"].lower()
+    return base_config
 
-    analyst_values = [analyst.value for analyst in selections["analysts"]]
-    analyst_value_set = set(analyst_values)
 
+def _schedule_dates(base_config, selections):
+    """Return ``(dates to run, skipped non-session dates)`` for the selected range."""
     start_date_obj = datetime.datetime.strptime(selections["start_date"], "%Y-%m-%d").date()
     end_date_obj = datetime.datetime.strptime(selections["end_date"], "%Y-%m-%d").date()
     date_range = []
@@ -881,27 +905,163 @@ def run_analysis():
         date_range.append(current_date.isoformat())
         current_date += datetime.timedelta(days=1)
 
+    # 只在交易所交易日调度：周末和节假日的数据与上一交易日相同，不再重复运行整张图
+    skipped_dates = []
+    if base_config.get("schedule_sessions_only", True):
+        calendar = get_trading_calendar(base_config.get("trading_calendar_exchange"))
+        sessions = set(calendar.sessions(start_date_obj, end_date_obj))
+        skipped_dates = [day for day in date_range if day not in sessions]
+        date_range = [day for day in date_range if day in sessions]
+    return date_range, skipped_dates
+
+
+def _load_account_state(account_file):
+    """Return ``(account state or None, notice or None)``."""
+    if not account_file.exists():
+        return None, None
+    try:
+        import json
+        with open(account_file, "r") as f:
+            account_state = json.load(f)
+        return account_state, ("System", f"已自动加载全局账户状态: {account_file}")
+    except Exception as exc:
+        return None, ("Error", f"全局账户状态加载失败: {exc}")
+
+
+def _warm_prices(base_config, tickers):
+    """Warm the price store for the whole ticker list with one bulk download; returns notices."""
+    warmup_notices = []
+    # 回放模式下所有数据来自录制归档，价格与指标都不走 yfinance 时价格存储用不上，均不做网络预热
+    if (
+        base_config.get("price_warmup_enabled", True)
+        and base_config.get("vendor_replay_mode", "off") != "replay"
+        and price_store_in_use()
+    ):
+        with console.status("[bold green]预热价格数据..."):
+            try:
+                warmup_report = warm_price_store(tickers)
+            except Exception as exc:
+                warmup_report = {ticker: f"warm-up failed: {exc}" for ticker in tickers}
+        failed = {t: reason for t, reason in warmup_report.items() if reason not in ("ok", "cached")}
+        ready = len(warmup_report) - len(failed)
+        warmup_notices.append(("System", f"价格数据预热完成: {ready}/{len(warmup_report)} 个标的已就绪。"))
+        for ticker, reason in failed.items():
+            warmup_notices.append(("Error", f"价格数据预热失败 {ticker}: {reason}"))
+    return warmup_notices
+
+
+# yfinance 财报存储中的报表 -> 读取它的数据工具
+FUNDAMENTALS_PREFETCH_METHODS = {
+    "balance_sheet": "get_balance_sheet",
+    "cashflow": "get_cashflow",
+    "income_stmt": "get_income_statement",
+    "insider_transactions": "get_insider_transactions",
+}
+
+
+def _routes_to_yfinance(method):
+    """Whether yfinance is among the vendors configured for a data tool (tool-level overrides category-level)."""
+    return "yfinance" in (v.strip() for v in get_vendor(get_category_for_method(method), method).split(","))
+
+
+def _warm_fundamentals(base_config, tickers):
+    """Prefetch the yfinance-backed statements for the whole ticker list; returns notices."""
+    warmup_notices = []
+    statements = [
+        statement
+        for statement, method in FUNDAMENTALS_PREFETCH_METHODS.items()
+        if _routes_to_yfinance(method)
+    ]
+    # 财报走其他数据源或处于回放模式时，预取 yfinance 财报只会浪费请求
+    if (
+        not statements
+        or not base_config.get("fundamentals_prefetch_enabled", True)
+        or base_config.get("vendor_replay_mode", "off") == "replay"
+    ):
+        return warmup_notices
+    with console.status("[bold green]预取财报数据..."):
+        try:
+            report = prefetch_fundamentals(tickers, statements)
+        except Exception as exc:
+            report = {ticker: {"all": f"prefetch failed: {exc}"} for ticker in tickers}
+    failed = {
+        ticker: ", ".join(f"{label}: {status}" for label, status in statuses.items() if status != "ok")
+        for ticker, statuses in report.items()
+        if any(status != "ok" for status in statuses.values())
+    }
+    ready = len(report) - len(failed)
+    warmup_notices.append(("System", f"财报数据预取完成: {ready}/{len(report)} 个标的已就绪。"))
+    for ticker, reason in failed.items():
+        warmup_notices.append(("Error", f"财报数据预取失败 {ticker}: {reason}"))
+    return warmup_notices
+
+
+def _format_llm_cache_stats(stats):
+    """One-line summary of the LLM response cache with the per-node hit rates."""
+    nodes = ", ".join(
+        f"{node} {counts['hit_rate']:.0%}" for node, counts in sorted(stats["by_node"].items())
+    )
+    return (
+        f"LLM 缓存命中率 {stats['hit_rate']:.1%} ({stats['hits']} 命中 / {stats['misses']} 未命中 / "
+        f"{stats['bypassed']} 绕过)；按节点: {nodes or 'N/A'}"
+    )
+
+
+def _format_prompt_cache_stats(stats):
+    """One-line summary of provider prefix-cache usage with per-node cached-token ratios and latency."""
+    nodes = ", ".join(
+        f"{node} {counts['cached_ratio']:.0%}/{counts['avg_latency_seconds']:.1f}s"
+        for node, counts in sorted(stats["by_node"].items())
+        if counts["reported_calls"]
+    )
+    return (
+        f"提示词前缀缓存: {stats['cached_tokens']:,}/{stats['input_tokens']:,} 输入 token 命中 "
+        f"({stats['cached_ratio']:.1%})；按节点(命中占比/平均耗时): {nodes or 'N/A'}"
+    )
+
+
+def _format_compaction_report(report):
+    """One-line summary of debate-history compaction savings for a single run."""
+    parts = ", ".join(
+        f"{label} {report[name]['tokens_saved']:,}"
+        for name, label in (("invest", "投资辩论"), ("risk", "风险辩论"))
+    )
+    total = report["total"]
+    return (
+        f"辩论历史压缩: 提示词约节省 {total['tokens_saved']:,} token（{parts}），"
+        f"摘要花费 {total['tokens_spent']:,}，净节省 {total['net_tokens_saved']:,}"
+    )
+
+
+def run_analysis():
+    selections = get_user_selections()
+
+    base_config = _config_from_selections(selections)
+
+    analyst_values = [analyst.value for analyst in selections["analysts"]]
+    analyst_value_set = set(analyst_values)
+
+    date_range, skipped_dates = _schedule_dates(base_config, selections)
+    if not date_range:
+        console.print("[yellow]所选日期范围内没有交易日，无需运行。[/yellow]")
+        return
+
     results_root = Path(base_config["results_dir"])
     results_root.mkdir(parents=True, exist_ok=True)
 
     # Load global account state if available
     account_file = results_root / "account_state.json"
-    current_account_state = None
-    account_notice = None
-    if account_file.exists():
-        try:
-            import json
-            with open(account_file, "r") as f:
-                current_account_state = json.load(f)
-            account_notice = ("System", f"已自动加载全局账户状态: {account_file}")
-        except Exception as exc:
-            account_notice = ("Error", f"全局账户状态加载失败: {exc}")
+    current_account_state, account_notice = _load_account_state(account_file)
 
     account_notice_delivered = False
 
     # Prepare reusable graph to maintain reflection memory across runs
     graph = TradingAgentsGraph(analyst_values, config=copy.deepcopy(base_config), debug=True)
 
+    # Warm the price and fundamentals stores so the per-ticker runs below read them locally
+    warmup_notices = _warm_prices(base_config, selections["tickers"])
+    warmup_notices += _warm_fundamentals(base_config, selections["tickers"])
+
     def save_message_decorator(obj, func_name):
         func = getattr(obj, func_name)
         @wraps(func)
@@ -1006,6 +1166,15 @@ def run_analysis():
                     message_buffer.add_message(account_notice[0], account_notice[1])
                     account_notice_delivered = True
 
+                if run_index == 1:
+                    for notice_type, notice in warmup_notices:
+                        message_buffer.add_message(notice_type, notice)
+                    if skipped_dates:
+                        message_buffer.add_message(
+                            "System",
+                            f"已跳过 {len(skipped_dates)} 个非交易日: {', '.join(skipped_dates)}",
+                        )
+
                 if current_account_state is not None:
                     message_buffer.add_message("System", "延续全局账户状态。")
                 else:
@@ -1285,23 +1454,7 @@ def run_analysis():
                         file_exists = trade_log_file.exists()
                         
                         with open(trade_log_file, "a", newline="") as f:
-                            fieldnames = [
-                                "timestamp",
-                                "ticker",
-                                "date",
-                                "action",
-                                "quantity",
-                                "reference_price",
-                                "trade_value",
-                                "cash_before",
-                                "cash_after",
-                                "position_before",
-                                "position_after",
-                                "avg_cost_before",
-                                "avg_cost_after",
-                                "notes"
-                            ]
-                            writer = csv.DictWriter(f, fieldnames=fieldnames)
+                            writer = csv.DictWriter(f, fieldnames=TRADE_HISTORY_FIELDS)
                             
                             if not file_exists:
                                 writer.writeheader()
@@ -1359,6 +1512,15 @@ def run_analysis():
                     f"Completed analysis for {analysis_date} (decision: {decision_msg})",
                 )
 
+                cache_stats = graph.get_llm_cache_stats()
+                if cache_stats:
+                    message_buffer.add_message("System", _format_llm_cache_stats(cache_stats))
+                prompt_cache_stats = graph.get_prompt_cache_stats()
+                if prompt_cache_stats["reported_calls"]:
+                    message_buffer.add_message("System", _format_prompt_cache_stats(prompt_cache_stats))
+                if graph.config.get("debate_history_compaction", False):
+                    message_buffer.add_message("System", _format_compaction_report(compaction_report(final_state)))
+
                 for section in message_buffer.report_sections.keys():
                     if section in final_state:
                         message_buffer.update_report_section(section, final_state[section])
@@ -1470,30 +1632,15 @@ def run_analysis():
                 if trade_signals:
                     try:
                         from tradingagents.graph.performance_calculator import backtest
-                        from tradingagents.agents.utils.core_stock_tools import get_stock_data
-                        import pandas as pd
-                        from io import StringIO
+                        from tradingagents.dataflows.market_data import get_price_frame
                         
                         lookback_days = base_config.get("backtest_lookback_days", 30)
-                        analysis_dt = datetime.datetime.strptime(
-                            analysis_date, "%Y-%m-%d"
-                        ).date()
-                        start_bt = (
-                            analysis_dt - datetime.timedelta(days=lookback_days)
-                        ).isoformat()
-                        end_bt = analysis_dt.isoformat()
-                        
-                        price_data_str = get_stock_data.invoke({
-                            "symbol": ticker,
-                            "start_date": start_bt,
-                            "end_date": end_bt,
-                        })
+                        start_bt = window_start(analysis_date, lookback_days)
+                        end_bt = analysis_date
                         
-                        price_data = pd.read_csv(StringIO(price_data_str), comment="#")
-                        price_data.columns = price_data.columns.str.strip().str.lower()
+                        price_data = get_price_frame(ticker, start_bt, end_bt)
                         
-                        required_cols = {"date", "close"}
-                        if required_cols.issubset(price_data.columns):
+                        if not price_data.empty:
                             returns_losses, summary = backtest(trade_signals, price_data)
                             
                             if summary and "total_return" in summary:
@@ -1511,10 +1658,150 @@ def run_analysis():
                 time.sleep(30)
             
 
+def run_batch_analysis():
+    """Run all selected tickers concurrently per trading day against one shared account.
+
+    Every ticker of a day starts from the same account snapshot; their proposed
+    trades are reconciled in a fixed order (sells first, then buys in ticker
+    list order) before the account file is committed once per day.
+    """
+    import csv
+
+    selections = get_user_selections()
+    base_config = _config_from_selections(selections)
+    analyst_values = [analyst.value for analyst in selections["analysts"]]
+    tickers = selections["tickers"]
+
+    date_range, skipped_dates = _schedule_dates(base_config, selections)
+    if not date_range:
+        console.print("[yellow]所选日期范围内没有交易日，无需运行。[/yellow]")
+        return
+    if skipped_dates:
+        console.print(f"[dim]已跳过 {len(skipped_dates)} 个非交易日: {', '.join(skipped_dates)}[/dim]")
+
+    results_root = Path(base_config["results_dir"])
+    results_root.mkdir(parents=True, exist_ok=True)
+    account_file = results_root / "account_state.json"
+    account_state, account_notice = _load_account_state(account_file)
+    if account_notice:
+        console.print(account_notice[1])
+
+    graph = TradingAgentsGraph(analyst_values, config=copy.deepcopy(base_config))
+    if account_state is None:
+        account_state = graph.propagator.create_initial_state(tickers[0], date_range[0])["account_state"]
+
+    for notice_type, notice in _warm_prices(base_config, tickers) + _warm_fundamentals(base_config, tickers):
+        console.print(f"[red]{notice}[/red]" if notice_type == "Error" else notice)
+
+    runner = BatchRunner(graph)
+    priorities = {ticker: rank for rank, ticker in enumerate(tickers)}
+    reflection_manager = DelayedReflectionManager()
+
+    for analysis_date in date_range:
+        # 先处理历史待反思项，让当天的运行用上最新的经验
+        try:
+            reflection_stats = reflection_manager.process_pending_reflections(
+                graph=graph,
+                current_date=analysis_date,
+                lookforward_days=base_config.get("reflection_lookforward_days", 5),
+                min_age_days=base_config.get("reflection_min_age_days", 5)
+            )
+            if reflection_stats["processed"] > 0:
+                console.print(
+                    f"✓ 完成 {reflection_stats['processed']} 个历史决策的反思学习 "
+                    f"(成功: {reflection_stats.get('successful_decisions', 0)}, "
+                    f"失败: {reflection_stats.get('failed_decisions', 0)}, "
+                    f"平均收益: {reflection_stats.get('avg_return', 0.0):+.2%})"
+                )
+        except Exception as exc:
+            console.print(f"[yellow]处理历史反思时出错: {exc}[/yellow]")
+
+        with console.status(
+            f"[bold green]Analyzing {len(tickers)} tickers on {analysis_date} "
+            f"({runner.max_workers} at a time)..."
+        ):
+            batch = runner.run(tickers, analysis_date, account_state, priorities)
+
+        table = Table(title=f"Reconciled trades for {analysis_date}", box=box.SIMPLE_HEAD)
+        for column in ("Ticker", "Action", "Requested", "Filled", "Price", "Status", "Cash after"):
+            table.add_column(column)
+        for fill in batch["fills"]:
+            table.add_row(
+                fill["ticker"],
+                fill["action"],
+                str(fill["requested_quantity"]),
+                str(fill["quantity"]),
+                f"{fill['reference_price']:.2f}",
+                fill["status"],
+                f"{fill['cash_after']:,.2f}",
+            )
+        console.print(table)
+
+        for ticker, run in batch["runs"].items():
+            if run["error"]:
+                console.print(f"[red]{ticker} 运行失败: {run['error']}[/red]")
+                continue
+            final_state = run["final_state"]
+            report_dir = results_root / ticker / analysis_date / "reports"
+            report_dir.mkdir(parents=True, exist_ok=True)
+            for section in message_buffer.report_sections:
+                if final_state.get(section):
+                    with open(report_dir / f"{section}.md", "w") as f:
+                        f.write(final_state[section])
+            if final_state.get("final_trade_decision"):
+                reflection_manager.save_pending_reflection(
+                    ticker=ticker,
+                    decision_date=analysis_date,
+                    final_state=final_state,
+                    trade_signals=final_state.get("trade_signals", []),
+                    account_state=batch["account_state"],
+                )
+
+        trade_log_file = results_root / "trade_history.csv"
+        file_exists = trade_log_file.exists()
+        with open(trade_log_file, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=TRADE_HISTORY_FIELDS)
+            if not file_exists:
+                writer.writeheader()
+            for fill in batch["fills"]:
+                notes = (batch["runs"][fill["ticker"]]["final_state"] or {}).get("final_trade_decision", "")
+                writer.writerow(
+                    {
+                        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "date": analysis_date,
+                        "notes": f"[{fill['status']}] {notes}"[:200],
+                        **{field: fill[field] for field in TRADE_HISTORY_FIELDS if field in fill},
+                    }
+                )
+
+        cache_stats = graph.get_llm_cache_stats()
+        if cache_stats:
+            console.print(_format_llm_cache_stats(cache_stats))
+        prompt_cache_stats = graph.get_prompt_cache_stats()
+        if prompt_cache_stats["reported_calls"]:
+            console.print(_format_prompt_cache_stats(prompt_cache_stats))
+        if graph.config.get("debate_history_compaction", False):
+            for ticker, run in batch["runs"].items():
+                if run["final_state"]:
+                    console.print(f"{ticker} {_format_compaction_report(compaction_report(run['final_state']))}")
+
+        account_state = batch["account_state"]
+        save_account_state(str(account_file), account_state)
+        console.print(
+            f"全局账户状态已保存到 {account_file} (现金 {account_state.get('cash_balance', 0.0):,.2f})"
+        )
+
+
 @app.command()
 def analyze():
     run_analysis()
 
 
+@app.command()
+def batch():
+    """Analyze all tickers concurrently per trading day against one shared account."""
+    run_batch_analysis()
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+异步图执行吞吐基准
+
+用固定延迟的假模型（每次调用 LLM_LATENCY 秒）和假数据源（每次调用 TOOL_LATENCY 秒）
+搭建完整交易图（4 个分析师各调用一次工具），对比：
+  - 同步 graph.invoke 逐个运行
+  - 同一事件循环上 graph.ainvoke 在不同并发上限下运行
+输出每种方式的 runs/hour，不访问网络也不调用真实模型：
+    python tests/benchmarks/bench_async_runs.py
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.market_data import to_price_frame
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+LLM_LATENCY = 0.2
+TOOL_LATENCY = 0.3
+RUNS = 16
+CONCURRENCY = [1, 4, 16]
+TRADE_DATE = "2024-06-03"
+
+# 每个分析师首次调用的工具及参数
+TOOL_ARGS = {
+    "get_stock_data": {"symbol": "BENCH", "start_date": "2024-05-01", "end_date": TRADE_DATE},
+    "get_news": {"ticker": "BENCH", "start_date": "2024-05-27", "end_date": TRADE_DATE},
+    "get_fundamentals": {"ticker": "BENCH", "curr_date": TRADE_DATE},
+}
+
+
+def _response(payload, tools):
+    messages = payload.to_messages() if hasattr(payload, "to_messages") else []
+    if tools and not any(isinstance(m, ToolMessage) for m in messages):
+        name = tools[0].name
+        return AIMessage(content="", tool_calls=[{"name": name, "args": TOOL_ARGS[name], "id": f"call_{name}"}])
+    return AIMessage(content="Analysis complete. FINAL TRANSACTION PROPOSAL: **HOLD**")
+
+
+def _fake_llm(tools=None):
+    def respond(payload):
+        time.sleep(LLM_LATENCY)
+        return _response(payload, tools)
+
+    async def arespond(payload):
+        await asyncio.sleep(LLM_LATENCY)
+        return _response(payload, tools)
+
+    llm = RunnableLambda(respond, afunc=arespond)
+    llm.bind_tools = _fake_llm
+    return llm
+
+
+class _Memory:
+    def get_memories(self, situation, n_matches=2):
+        return []
+
+
+def _slow(value):
+    def vendor(*args, **kwargs):
+        time.sleep(TOOL_LATENCY)
+        return value
+    return vendor
+
+
+def _install_fake_vendors():
+    frame = to_price_frame(pd.DataFrame({"Date": [pd.Timestamp(TRADE_DATE)], "Close": [100.0]}))
+    for method, value in (
+        ("get_price_frame", frame),
+        ("get_news", "no news"),
+        ("get_fundamentals", "no fundamentals"),
+    ):
+        interface.VENDOR_METHODS[method]["bench"] = _slow(value)
+
+
+def _build_graph():
+    tool_nodes = TradingAgentsGraph._create_tool_nodes(None)
+    llm = _fake_llm()
+    memory = _Memory()
+    setup = GraphSetup(llm, llm, tool_nodes, memory, memory, memory, memory, memory, ConditionalLogic(), {})
+    return setup.setup_graph(["market", "social", "news", "fundamentals"])
+
+
+def _runs_per_hour(elapsed):
+    return RUNS / elapsed * 3600
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="ta_bench_")
+    set_config(
+        {
+            "data_cache_dir": tmp_dir,
+            "vendor_cache_enabled": False,
+            "vendor_async_max_workers": 32,
+            "tool_vendors": {"get_stock_data": "bench", "get_news": "bench", "get_fundamentals": "bench"},
+        }
+    )
+    _install_fake_vendors()
+    graph = _build_graph()
+    propagator = Propagator()
+    states = [propagator.create_initial_state(f"T{i:02d}", TRADE_DATE) for i in range(RUNS)]
+    args = propagator.get_graph_args()
+
+    print(f"{RUNS} runs, LLM {LLM_LATENCY}s/call, tool {TOOL_LATENCY}s/call")
+    print(f"{'mode':<22}{'seconds':>10}{'runs/hour':>12}{'speed-up':>10}")
+
+    start = time.perf_counter()
+    for state in states:
+        graph.invoke(state, **args)
+    baseline = time.perf_counter() - start
+    print(f"{'sync invoke':<22}{baseline:>10.1f}{_runs_per_hour(baseline):>12.0f}{1.0:>9.1f}x")
+
+    for limit in CONCURRENCY:
+        async def run_all():
+            semaphore = asyncio.Semaphore(limit)
+
+            async def run(state):
+                async with semaphore:
+                    return await graph.ainvoke(state, **args)
+
+            return await asyncio.gather(*(run(state) for state in states))
+
+        start = time.perf_counter()
+        asyncio.run(run_all())
+        elapsed = time.perf_counter() - start
+        label = f"async, {limit} in flight"
+        print(f"{label:<22}{elapsed:>10.1f}{_runs_per_hour(elapsed):>12.0f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+指标窗口提取性能基准
+
+对比旧实现（iterrows 构建全量 日期->值 字典 + 逐日循环）与向量化实现
+（按日期索引的 Series + searchsorted 切片 + 单次格式化）在 30/90/365 天
+回看窗口下的单次调用耗时。
+
+使用合成价格数据写入临时价格库，不访问网络：
+    python tests/benchmarks/bench_indicator_window.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.price_store import get_price_store
+from tradingagents.dataflows.stockstats_utils import get_indicator_frame
+from tradingagents.dataflows.y_finance import get_stock_stats_indicators_window
+
+SYMBOL = "BENCH"
+CURR_DATE = "2025-03-14"
+INDICATORS = ["close_50_sma", "rsi", "macd", "boll_ub"]
+LOOK_BACKS = [30, 90, 365]
+REPEATS = 20
+
+
+def _seed_price_store():
+    """生成约15年的合成日线并写入临时价格库"""
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=15 * 252)
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    bars = pd.DataFrame(
+        {
+            "Date": dates,
+            "Open": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 5_000_000, len(dates)),
+        }
+    )
+    store = get_price_store()
+    store.put(SYMBOL, bars)
+    store._meta[SYMBOL]["checked"] = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+
+def _legacy_window(indicator, look_back_days):
+    """旧实现：iterrows 构建字典后逐日查找"""
+    df = get_indicator_frame(SYMBOL, indicator)
+    result_dict = {}
+    for _, row in df.iterrows():
+        value = row[indicator]
+        result_dict[str(row["Date"])] = "N/A" if pd.isna(value) else str(value)
+
+    curr_dt = pd.Timestamp(CURR_DATE).to_pydatetime()
+    before = curr_dt - relativedelta(days=look_back_days)
+    ind_string = ""
+    while curr_dt >= before:
+        date_str = curr_dt.strftime("%Y-%m-%d")
+        value = result_dict.get(date_str, "N/A: Not a trading day (weekend or holiday)")
+        ind_string += f"{date_str}: {value}\n"
+        curr_dt -= relativedelta(days=1)
+    return ind_string
+
+
+def _time_per_call(func, *args):
+    func(*args)  # 预热（填充帧缓存）
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="ta_bench_")
+    set_config(
+        {
+            "data_cache_dir": tmp_dir,
+            "price_store_dir": str(Path(tmp_dir) / "price_store"),
+            "data_vendors": {"technical_indicators": "yfinance"},
+        }
+    )
+    _seed_price_store()
+
+    print(f"{'indicator':<14}{'look-back':>10}{'legacy ms':>12}{'vectorized ms':>16}{'speed-up':>10}")
+    for indicator in INDICATORS:
+        for look_back in LOOK_BACKS:
+            new_output = get_stock_stats_indicators_window(SYMBOL, indicator, CURR_DATE, look_back)
+            assert _legacy_window(indicator, look_back) in new_output, "output mismatch"
+
+            legacy_ms = _time_per_call(_legacy_window, indicator, look_back)
+            new_ms = _time_per_call(
+                get_stock_stats_indicators_window, SYMBOL, indicator, CURR_DATE, look_back
+            )
+            print(
+                f"{indicator:<14}{look_back:>10}{legacy_ms:>12.2f}{new_ms:>16.2f}{legacy_ms / new_ms:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
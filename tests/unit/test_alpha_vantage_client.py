@@ -0,0 +1,43 @@
+"""
+测试 Alpha Vantage 客户端限速
+验证令牌桶排队等待、每日额度跨进程持久化以及额度用尽后的限流错误
+"""
+
+import time
+
+import pytest
+
+from tradingagents.dataflows.alpha_vantage_common import (
+    AlphaVantageClient,
+    AlphaVantageRateLimitError,
+    TokenBucket,
+)
+
+
+def test_token_bucket_makes_callers_wait():
+    """测试令牌用完后调用方等待补充而不是失败"""
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 每 0.1 秒补充一个令牌
+
+    assert bucket.acquire(max_wait=1) == 0
+    assert bucket.acquire(max_wait=1) == 0
+    start = time.monotonic()
+    waited = bucket.acquire(max_wait=1)
+    assert waited > 0
+    assert time.monotonic() - start >= 0.05
+
+
+def test_daily_usage_persists_across_clients(tmp_path, monkeypatch):
+    """测试每日调用计数写入磁盘，新客户端能读取剩余额度"""
+    usage_path = str(tmp_path / "usage.json")
+    client = AlphaVantageClient(calls_per_minute=600, calls_per_day=2, usage_path=usage_path)
+    monkeypatch.setattr(client.session, "get", lambda *args, **kwargs: "ok")
+
+    client.get({"function": "OVERVIEW"})
+
+    restarted = AlphaVantageClient(calls_per_minute=600, calls_per_day=2, usage_path=usage_path)
+    monkeypatch.setattr(restarted.session, "get", lambda *args, **kwargs: "ok")
+    assert restarted.usage()["remaining_today"] == 1
+
+    restarted.get({"function": "OVERVIEW"})
+    with pytest.raises(AlphaVantageRateLimitError):
+        restarted.get({"function": "OVERVIEW"})
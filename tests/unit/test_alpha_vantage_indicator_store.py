@@ -0,0 +1,54 @@
+"""
+测试 Alpha Vantage 指标全量序列本地存储
+验证同一序列只下载一次，不同回看窗口和共享函数的指标都通过切片返回
+"""
+
+import pytest
+
+from tradingagents.dataflows import alpha_vantage_indicator
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import price_store
+
+MACD_CSV = (
+    "time,MACD_Hist,MACD,MACD_Signal\r\n"
+    "2024-01-05,0.1000,1.5000,1.4000\r\n"
+    "2024-01-04,0.2000,1.6000,1.4000\r\n"
+    "2024-01-03,0.3000,1.7000,1.4000\r\n"
+)
+
+
+@pytest.fixture
+def calls(tmp_path, monkeypatch):
+    config = dataflow_config.get_config()
+    config["price_store_dir"] = str(tmp_path / "price_store")
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(price_store, "_indicator_stores", {})
+
+    made = []
+
+    def fake_request(function_name, params):
+        made.append(function_name)
+        return MACD_CSV
+
+    monkeypatch.setattr(alpha_vantage_indicator, "_make_api_request", fake_request)
+    return made
+
+
+def test_series_fetched_once_and_sliced(calls):
+    """测试 macd 与 macds 共用一次 MACD 下载，且输出保留原始数值字符串"""
+    first = alpha_vantage_indicator.get_indicator("AAPL", "macd", "2024-01-05", 1)
+    second = alpha_vantage_indicator.get_indicator("AAPL", "macds", "2024-01-04", 10)
+
+    assert calls == ["MACD"]
+    assert "2024-01-04: 1.6000\n2024-01-05: 1.5000\n" in first
+    assert "2024-01-03: 1.4000\n2024-01-04: 1.4000\n" in second
+    assert "2024-01-05" not in second.split("\n\n")[1]
+
+
+def test_table_reuses_stored_series(calls):
+    """测试多指标表格也从本地序列切片，不再重复请求"""
+    alpha_vantage_indicator.get_indicator("AAPL", "macd", "2024-01-05", 5)
+    table = alpha_vantage_indicator.get_indicator("AAPL", ["macd", "macdh"], "2024-01-05", 5)
+
+    assert calls == ["MACD"]
+    assert "| 2024-01-05 | 1.5 | 0.1 |" in table
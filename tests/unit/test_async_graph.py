@@ -0,0 +1,156 @@
+"""
+测试异步执行路径
+验证节点在同步/异步图中共享同一段逻辑、数据工具的异步实现走数据源路由，以及多个图在同一事件循环上并发运行
+"""
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents.utils.agent_utils import get_news
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import interface, vendor_health
+from tradingagents.dataflows.vendor_health import VendorHealthRegistry
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import GraphSetup
+
+
+class _Recorder:
+    """同时实现 invoke/ainvoke 的假模型，记录每次调用走的是哪条路径"""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+
+    def invoke(self, payload):
+        self.calls.append("sync")
+        if payload == self.fail_on:
+            raise RuntimeError("model down")
+        time.sleep(self.delay)
+        return AIMessage(content=f"answer to {payload}")
+
+    async def ainvoke(self, payload):
+        self.calls.append("async")
+        if payload == self.fail_on:
+            raise RuntimeError("model down")
+        await asyncio.sleep(self.delay)
+        return AIMessage(content=f"answer to {payload}")
+
+
+def _two_step_node(model):
+    def node(state):
+        first = yield model, state["question"]
+        try:
+            second = yield model, "follow-up"
+        except RuntimeError as e:
+            return {"answer": f"failed: {e}"}
+        return {"answer": first.content + " / " + second.content}
+
+    return llm_node(node)
+
+
+def test_llm_node_runs_same_logic_sync_and_async():
+    """测试同一节点同步调用 invoke、异步调用 ainvoke，结果一致；模型异常抛回节点内处理"""
+    model = _Recorder()
+    node = _two_step_node(model)
+
+    assert node.invoke({"question": "q"}) == {"answer": "answer to q / answer to follow-up"}
+    assert asyncio.run(node.ainvoke({"question": "q"})) == {"answer": "answer to q / answer to follow-up"}
+    assert model.calls == ["sync", "sync", "async", "async"]
+
+    failing = _two_step_node(_Recorder(fail_on="follow-up"))
+    assert failing.invoke({"question": "q"}) == {"answer": "failed: model down"}
+    assert asyncio.run(failing.ainvoke({"question": "q"})) == {"answer": "failed: model down"}
+
+
+def test_vendor_tool_awaits_router_on_vendor_pool(monkeypatch):
+    """测试数据工具的 ainvoke 在共享数据源线程池中经路由调用数据源"""
+    config = dataflow_config.get_config()
+    config.update({"vendor_cache_enabled": False, "tool_vendors": {"get_news": "fake"}})
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+
+    threads = []
+
+    def fake(ticker, start_date, end_date):
+        threads.append(threading.current_thread().name)
+        return f"news for {ticker} {start_date}..{end_date}"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_news", {"fake": fake})
+
+    result = asyncio.run(
+        get_news.ainvoke({"ticker": "AAPL", "start_date": "2024-01-01", "end_date": "2024-01-05"})
+    )
+
+    assert result == "news for AAPL 2024-01-01..2024-01-05"
+    assert threads and threads[0].startswith("vendor-async")
+
+
+class _Memory:
+    def get_memories(self, situation, n_matches=2):
+        return []
+
+
+def _fake_llm(delay, in_flight=None):
+    """不调用工具、每次调用耗时 delay 秒的假模型；传入 in_flight 时记录同时进行的异步调用数"""
+
+    def respond(payload):
+        time.sleep(delay)
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **HOLD**")
+
+    async def arespond(payload):
+        if in_flight is not None:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            if in_flight is not None:
+                in_flight["now"] -= 1
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **HOLD**")
+
+    llm = RunnableLambda(respond, afunc=arespond)
+    llm.bind_tools = lambda tools: llm
+    return llm
+
+
+def test_full_graph_runs_overlap_on_one_loop(monkeypatch):
+    """测试完整交易图的多次运行在同一事件循环上并发，各次运行的模型调用同时进行"""
+    config = dataflow_config.get_config()
+    config.update({"vendor_cache_enabled": False, "tool_vendors": {"get_stock_data": "fake"}})
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+    monkeypatch.setitem(
+        interface.VENDOR_METHODS,
+        "get_price_frame",
+        {"fake": lambda symbol, start, end: pd.DataFrame({"date": [pd.Timestamp(end)], "close": [10.0]})},
+    )
+
+    in_flight = {"now": 0, "max": 0}
+    llm = _fake_llm(0.05, in_flight)
+    memory = _Memory()
+    tools = {"market": RunnableLambda(lambda state: {})}  # 假模型从不调用工具
+    setup = GraphSetup(llm, llm, tools, memory, memory, memory, memory, memory, ConditionalLogic(), {})
+    graph = setup.setup_graph(["market"])
+    propagator = Propagator()
+
+    async def run_all(count):
+        states = [propagator.create_initial_state(f"T{i}", "2024-01-05") for i in range(count)]
+        return await asyncio.gather(*(graph.ainvoke(state, **propagator.get_graph_args()) for state in states))
+
+    single = asyncio.run(run_all(1))
+    assert in_flight["max"] == 1
+
+    finals = asyncio.run(run_all(4))
+
+    assert single[0]["processed_trade_decision"] == "HOLD"
+    assert [final["company_of_interest"] for final in finals] == ["T0", "T1", "T2", "T3"]
+    assert all(final["risk_debate_state"]["reference_price"] == 10.0 for final in finals)
+    assert in_flight["max"] == 4  # 4 次运行的模型调用在同一事件循环上同时进行
@@ -0,0 +1,89 @@
+"""
+测试多标的批量运行器
+验证各标的并发决策、按确定顺序对共享现金和持仓撮合，结果与运行完成顺序无关
+"""
+
+import asyncio
+import random
+
+from tradingagents.graph.batch_runner import BatchRunner, reconcile_trades
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def _account(cash, positions=None):
+    return {
+        "cash_balance": cash,
+        "positions": positions or {},
+        "max_allocation_pct": 0.5,
+        "min_cash_reserve": 1000.0,
+    }
+
+
+def test_reconcile_sells_first_then_buys_by_priority():
+    """测试先卖出释放现金，再按优先级买入；现金不足时后续买入被削减"""
+    account = _account(2000.0, {"OLD": {"shares": 10, "avg_cost": 50.0}})
+    proposals = [
+        {"ticker": "BBB", "action": "BUY", "quantity": 20, "reference_price": 100.0},
+        {"ticker": "AAA", "action": "BUY", "quantity": 20, "reference_price": 100.0},
+        {"ticker": "OLD", "action": "SELL", "quantity": 10, "reference_price": 200.0},
+        {"ticker": "CCC", "action": "HOLD", "quantity": 0, "reference_price": 10.0},
+    ]
+
+    committed, fills = reconcile_trades(account, proposals, priorities={"AAA": 0, "BBB": 1})
+
+    assert [(f["ticker"], f["quantity"], f["status"]) for f in fills] == [
+        ("OLD", 10, "filled"),   # 卖出所得 2000，现金变为 4000
+        ("AAA", 15, "clipped"),  # (4000 - 1000) * 0.5 // 100
+        ("BBB", 7, "clipped"),   # (2500 - 1000) * 0.5 // 100
+        ("CCC", 0, "hold"),
+    ]
+    assert committed["cash_balance"] == 1800.0
+    assert committed["positions"] == {
+        "AAA": {"shares": 15, "avg_cost": 100.0},
+        "BBB": {"shares": 7, "avg_cost": 100.0},
+    }
+    assert account["cash_balance"] == 2000.0  # 输入账户不被修改
+
+
+def _fake_graph(max_runs):
+    """只替换 apropagate 的交易图：每个标的随机耗时后建议买入 10 股，并记录同时进行的运行数"""
+    graph = TradingAgentsGraph.__new__(TradingAgentsGraph)
+    graph.config = {"async_max_concurrent_runs": max_runs}
+    seen_accounts = []
+    in_flight = {"now": 0, "max": 0}
+
+    async def apropagate(ticker, trade_date, account_state=None):
+        seen_accounts.append(account_state)
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            await asyncio.sleep(0.1 + random.random() * 0.05)
+        finally:
+            in_flight["now"] -= 1
+        if ticker == "BAD":
+            raise RuntimeError("vendor down")
+        trade = {"action": "BUY", "quantity": 10, "reference_price": 100.0}
+        return {"company_of_interest": ticker, "recommended_trade": trade}, "BUY"
+
+    graph.apropagate = apropagate
+    return graph, seen_accounts, in_flight
+
+
+def test_batch_runs_concurrently_and_commits_deterministically():
+    """测试批量运行并发执行、每个标的看到同一账户快照，撮合结果不受完成顺序影响"""
+    tickers = ["MSFT", "AAPL", "BAD", "NVDA", "AMZN"]
+    outcomes = []
+    for _ in range(3):
+        graph, seen_accounts, in_flight = _fake_graph(max_runs=5)
+        batch = BatchRunner(graph).run(tickers, "2024-01-05", _account(3000.0))
+        outcomes.append((batch["account_state"], [(f["ticker"], f["quantity"]) for f in batch["fills"]]))
+
+        assert in_flight["max"] == 5  # 5 个标的的运行同时进行
+        assert all(seen == _account(3000.0) for seen in seen_accounts)
+        assert batch["runs"]["BAD"]["error"] == "vendor down"
+
+    account, fills = outcomes[0]
+    assert all(outcome == outcomes[0] for outcome in outcomes)
+    # 按输入顺序撮合：(3000-1000)*0.5//100=10, (2000-1000)*0.5//100=5, 然后 2, 1
+    assert fills == [("MSFT", 10), ("AAPL", 5), ("NVDA", 2), ("AMZN", 1)]
+    assert account["cash_balance"] == 1200.0
@@ -0,0 +1,128 @@
+"""
+测试辩论历史滚动压缩
+验证超出预算时较早发言折叠进增量摘要、最近一轮保留原文、state 中完整历史不变以及节省 token 统计
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator
+from tradingagents.agents.utils.debate_compaction import (
+    DebateHistoryCompactor,
+    compaction_report,
+)
+
+
+class _Memory:
+    def get_memories(self, situation, n_matches=2):
+        return []
+
+
+def _state(investment_debate_state=None, risk_debate_state=None):
+    return {
+        "company_of_interest": "AAPL",
+        "trade_date": "2024-01-02",
+        "market_report": "market",
+        "sentiment_report": "sentiment",
+        "news_report": "news",
+        "fundamentals_report": "fundamentals",
+        "trader_investment_plan": "Buy 10 AAPL",
+        "investment_debate_state": investment_debate_state or {"history": "", "current_response": "", "count": 0},
+        "risk_debate_state": risk_debate_state or {"history": "", "count": 0},
+    }
+
+
+def _debater():
+    """每次发言返回约 500 token 的带编号论点，并记录收到的消息"""
+    sent = []
+
+    def speak(messages):
+        sent.append(messages)
+        return AIMessage(content=f"point {len(sent)} " + "x" * 2000)
+
+    return RunnableLambda(speak), sent
+
+
+def _summarizer():
+    calls = []
+
+    def summarize(messages):
+        calls.append(messages[-1]["content"])
+        return AIMessage(content=f"summary v{len(calls)}")
+
+    return RunnableLambda(summarize), calls
+
+
+def _history_section(messages):
+    content = messages[-1]["content"]
+    return content.split("**Debate History:**\n", 1)[1].split("\n\n---\n\n", 1)[0]
+
+
+def test_disabled_by_default_sends_full_history():
+    """测试未开启压缩时提示词包含完整历史，压缩字段以默认值传递"""
+    llm, sent = _debater()
+    bull = create_bull_researcher(llm, _Memory())
+    bear = create_bear_researcher(llm, _Memory())
+
+    state = _state()
+    for node in (bull, bear, bull):
+        state["investment_debate_state"] = node.invoke(state)["investment_debate_state"]
+
+    assert "point 1" in _history_section(sent[-1]) and "point 2" in _history_section(sent[-1])
+    assert state["investment_debate_state"]["history_summary"] == ""
+    assert compaction_report(state)["total"]["tokens_saved"] == 0
+
+
+def test_compaction_keeps_last_turn_and_folds_older_turns_incrementally():
+    """测试超出预算后只保留最近一轮原文，摘要增量更新，完整历史仍写入 state"""
+    llm, sent = _debater()
+    summarizer, summary_calls = _summarizer()
+    compactor = DebateHistoryCompactor(summarizer, token_budget=800)
+    bull = create_bull_researcher(llm, _Memory(), compactor=compactor)
+    bear = create_bear_researcher(llm, _Memory(), compactor=compactor)
+
+    state = _state()
+    for node in (bull, bear, bull, bear, bull):
+        state["investment_debate_state"] = node.invoke(state)["investment_debate_state"]
+
+    # 第 3 次发言时历史（2 轮，约 1000 token）首次超出预算
+    assert "point 1" not in _history_section(sent[2]) and "point 2" in _history_section(sent[2])
+    assert "summary v1" in _history_section(sent[2])
+    # 之后每次只把新增的那一轮交给摘要模型
+    assert len(summary_calls) == 3
+    assert "point 1" in summary_calls[0] and "point 1" not in summary_calls[1] and "point 2" in summary_calls[1]
+    assert "summary v2" in summary_calls[2]
+    last_prompt = _history_section(sent[-1])
+    assert "point 4" in last_prompt and "point 3" not in last_prompt
+
+    debate = state["investment_debate_state"]
+    assert all(f"point {i}" in debate["history"] for i in range(1, 6))
+    report = compaction_report(state)
+    assert report["invest"]["tokens_saved"] > 1000
+    assert report["invest"]["tokens_spent"] > 0
+    assert report["total"]["net_tokens_saved"] == report["invest"]["tokens_saved"] - report["invest"]["tokens_spent"]
+
+
+def test_risk_debate_compaction_in_async_path():
+    """测试风险辩论（换行拼接的历史）按最近发言者定位最后一轮，异步路径同样生效"""
+    llm, sent = _debater()
+    summarizer, summary_calls = _summarizer()
+    risky = create_risky_debator(llm, compactor=DebateHistoryCompactor(summarizer, token_budget=300))
+    safe_turn = "Safe Analyst: trim the position " + "y" * 800
+    risk_state = {
+        "history": "\nRisky Analyst: go all in " + "z" * 800 + "\n" + safe_turn,
+        "latest_speaker": "Safe",
+        "current_safe_response": safe_turn,
+        "count": 2,
+    }
+
+    result = asyncio.run(risky.ainvoke(_state(risk_debate_state=risk_state)))["risk_debate_state"]
+
+    prompt = sent[0][-1]["content"]
+    assert "go all in" not in prompt and safe_turn in prompt and "summary v1" in prompt
+    assert result["summarized_chars"] == len(risk_state["history"]) - len(safe_turn)
+    assert result["compaction_tokens_saved"] > 0
@@ -0,0 +1,42 @@
+"""
+测试 Finnhub 本地 JSON 数据集缓存
+验证区间查询与原线性扫描一致（内存与 SQLite 两种后端）以及基于哈希的去重
+"""
+
+import json
+
+import pytest
+
+from tradingagents.dataflows.finnhub_store import FinnhubDataCache, dedupe_entries
+
+DATA = {
+    "2024-01-05": [{"id": 1, "change": -10}],
+    "2024-01-02": [{"id": 2, "change": 5}],
+    "2024-01-03": [],
+    "2024-01-09": [{"id": 1, "change": -10}, {"id": 3, "change": 7}],
+    "2023-12-29": [{"id": 4, "change": 1}],
+}
+
+
+def _legacy_range(data, start_date, end_date):
+    return {k: v for k, v in data.items() if start_date <= k <= end_date and len(v) > 0}
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_range_matches_linear_scan(tmp_path, backend):
+    """测试区间结果（包括文件中的键顺序）与原实现一致"""
+    path = tmp_path / "AAPL_data_formatted.json"
+    path.write_text(json.dumps(DATA))
+    cache = FinnhubDataCache(backend=backend, sqlite_path=str(tmp_path / "finnhub.sqlite"))
+
+    for start, end in [("2024-01-01", "2024-01-09"), ("2024-01-03", "2024-01-04"), ("2023-01-01", "2025-01-01")]:
+        result = cache.get_range(str(path), start, end)
+        expected = _legacy_range(DATA, start, end)
+        assert result == expected
+        assert list(result) == list(expected)
+
+
+def test_dedupe_entries():
+    """测试重复条目只输出一次且保持原顺序"""
+    entries = list(dedupe_entries(_legacy_range(DATA, "2024-01-01", "2024-01-31")))
+    assert [e["id"] for e in entries] == [1, 2, 3]
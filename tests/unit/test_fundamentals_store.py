@@ -0,0 +1,70 @@
+"""
+测试 yfinance 财报按财期存储
+验证下一次披露前跨交易日复用、到期后用新的 Ticker 重新拉取以及批量预取报告
+"""
+
+import pandas as pd
+
+from tradingagents.dataflows import fundamentals_store
+from tradingagents.dataflows.fundamentals_store import FundamentalsStore
+
+
+class _FakeTicker:
+    loads = []
+    created = 0
+
+    def __init__(self, symbol, session=None):
+        self.symbol = symbol
+        _FakeTicker.created += 1
+
+    @property
+    def quarterly_balance_sheet(self):
+        _FakeTicker.loads.append((self.symbol, "quarterly_balance_sheet"))
+        return pd.DataFrame(
+            {pd.Timestamp("2024-03-31"): [1.0], pd.Timestamp("2023-12-31"): [2.0]},
+            index=["Total Assets"],
+        )
+
+    def __getattr__(self, name):
+        _FakeTicker.loads.append((self.symbol, name))
+        if name == "insider_transactions":
+            raise RuntimeError("blocked")
+        return pd.DataFrame()
+
+
+def test_reused_until_next_filing(tmp_path, monkeypatch):
+    """测试下一次披露日之前不再请求，披露日之后重新拉取"""
+    _FakeTicker.loads = []
+    _FakeTicker.created = 0
+    monkeypatch.setattr(fundamentals_store.yf, "Ticker", _FakeTicker)
+    store = FundamentalsStore(str(tmp_path))
+
+    store.get("aapl", "balance_sheet", "quarterly")
+    entry = store._meta["AAPL-balance_sheet-quarterly"]
+    assert entry["fiscal_period"] == "2024-03-31"
+    assert entry["next_filing_due"] == "2024-08-14"  # 期末 + 一个季度 + 45 天
+
+    # 模拟第二天：披露日未到则直接复用
+    entry["checked"] = "2024-07-01"
+    monkeypatch.setattr(store, "_is_fresh", lambda e, today: FundamentalsStore._is_fresh(store, e, "2024-07-02"))
+    store.get("AAPL", "balance_sheet", "quarterly")
+    assert len(_FakeTicker.loads) == 1
+
+    # 披露日之后重新拉取
+    monkeypatch.setattr(store, "_is_fresh", lambda e, today: FundamentalsStore._is_fresh(store, e, "2024-08-15"))
+    store.get("AAPL", "balance_sheet", "quarterly")
+    assert len(_FakeTicker.loads) == 2
+    # 每次重新拉取都新建 Ticker，避免 yfinance 实例内缓存的旧报表被复用
+    assert _FakeTicker.created == 2
+
+
+def test_prefetch_reports_failures(tmp_path, monkeypatch):
+    """测试批量预取返回每个报表的状态"""
+    monkeypatch.setattr(fundamentals_store.yf, "Ticker", _FakeTicker)
+    store = FundamentalsStore(str(tmp_path))
+
+    report = store.prefetch(["MSFT"], max_workers=4)
+
+    assert report["MSFT"]["balance_sheet/quarterly"] == "ok"
+    assert report["MSFT"]["insider_transactions"] == "blocked"
+    assert len(report["MSFT"]) == 7
@@ -0,0 +1,61 @@
+"""
+测试 Google News 抓取器
+验证结果页磁盘缓存避免重复抓取，以及主机礼貌预算对请求间隔的控制
+"""
+
+import time
+
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import googlenews_utils
+from tradingagents.dataflows.googlenews_utils import HostBudget
+
+PAGE = """
+<div class="SoaBEf"><a href="https://example.com/{n}"></a>
+<div class="MBeuO">Headline {n}</div><div class="GI74Re">Snippet</div>
+<div class="LfVVr">1 day ago</div><div class="NUnG9d"><span>Reuters</span></div></div>
+{next}
+"""
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, html):
+        self.content = html.encode()
+
+
+def test_pages_are_cached_on_disk(tmp_path, monkeypatch):
+    """测试同一 (query, 起止日期, 页码) 第二次直接读磁盘缓存"""
+    config = dataflow_config.get_config()
+    config["google_news_cache_dir"] = str(tmp_path)
+    monkeypatch.setattr(dataflow_config, "_config", config)
+
+    urls = []
+
+    def fake_request(url, headers):
+        urls.append(url)
+        page = len(urls) - 1
+        next_link = '<a id="pnnext" href="#">Next</a>' if page == 0 else ""
+        return _Response(PAGE.format(n=page, next=next_link))
+
+    monkeypatch.setattr(googlenews_utils, "make_request", fake_request)
+
+    first = googlenews_utils.getNewsData("AAPL", "2024-01-01", "2024-01-07")
+    second = googlenews_utils.getNewsData("AAPL", "2024-01-01", "2024-01-07")
+
+    assert [r["title"] for r in first] == ["Headline 0", "Headline 1"]
+    assert second == first
+    assert len(urls) == 2
+
+
+def test_host_budget_spaces_requests():
+    """测试同一主机的请求启动时间至少间隔 min_interval"""
+    budget = HostBudget(max_concurrency=4, min_interval=0.05, jitter=0.0)
+    starts = []
+    for _ in range(3):
+        with budget:
+            starts.append(time.monotonic())
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
@@ -0,0 +1,60 @@
+"""
+测试对冲（hedged）路由模式
+验证主数据源超时后启动备用数据源并由先返回者胜出，以及总截止时间
+"""
+
+import time
+
+import pytest
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import interface, vendor_health
+from tradingagents.dataflows.vendor_health import VendorHealthRegistry
+
+
+@pytest.fixture
+def hedged_config(monkeypatch):
+    config = dataflow_config.get_config()
+    config.update(
+        {
+            "vendor_routing_mode": "hedged",
+            "vendor_hedge_delay_seconds": 0.05,
+            "vendor_deadlines": {"get_stock_data": 1.0},
+            "vendor_cache_enabled": False,
+            "tool_vendors": {"get_stock_data": "slow"},
+        }
+    )
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+    return config
+
+
+def _slow(symbol, start_date, end_date):
+    time.sleep(0.5)
+    return "slow"
+
+
+def _fast(symbol, start_date, end_date):
+    return "fast"
+
+
+def test_hedge_wins_when_primary_is_slow(hedged_config, monkeypatch):
+    """测试主数据源迟迟不返回时备用数据源并行启动并胜出"""
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_stock_data", {"slow": _slow, "fast": _fast})
+    before = interface.get_routing_stats()
+
+    result = interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01")
+
+    after = interface.get_routing_stats()
+    assert result == "fast"
+    assert after["hedged"] == before["hedged"] + 1
+    assert after["hedge_wins"] == before["hedge_wins"] + 1
+
+
+def test_deadline_exceeded(hedged_config, monkeypatch):
+    """测试所有数据源都超过截止时间时抛出错误"""
+    hedged_config["vendor_deadlines"] = {"get_stock_data": 0.2}
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_stock_data", {"slow": _slow})
+
+    with pytest.raises(RuntimeError, match="Deadline"):
+        interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01")
@@ -0,0 +1,62 @@
+"""
+测试多指标对齐表
+验证一次请求返回按交易日对齐的多列指标表
+"""
+
+import pandas as pd
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import y_finance
+from tradingagents.dataflows.stockstats_utils import _wrap_price_frame
+from tradingagents.dataflows.utils import normalize_indicator_list
+
+
+def _wrapped_frame(n=60):
+    dates = pd.bdate_range("2024-01-01", periods=n)
+    close = pd.Series(range(100, 100 + n), dtype=float)
+    return _wrap_price_frame(
+        pd.DataFrame(
+            {
+                "Date": dates,
+                "Open": close,
+                "High": close + 1,
+                "Low": close - 1,
+                "Close": close,
+                "Volume": 1000,
+            }
+        )
+    )
+
+
+def test_normalize_indicator_list():
+    """测试逗号分隔字符串与列表的归一化和去重"""
+    assert normalize_indicator_list("RSI, macd,rsi") == ["rsi", "macd"]
+    assert normalize_indicator_list(["close_50_sma", " macd "]) == ["close_50_sma", "macd"]
+
+
+def test_multi_indicator_table_is_aligned(monkeypatch):
+    """测试多个指标共享同一帧，输出只包含交易日且每行列数一致"""
+    config = dataflow_config.get_config()
+    config["trading_window_unit"] = "calendar"
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    frame = _wrapped_frame()
+
+    def fake_indicator_frame(symbol, indicator):
+        frame[indicator]
+        return frame
+
+    monkeypatch.setattr(y_finance, "get_indicator_frame", fake_indicator_frame)
+
+    result = y_finance.get_stock_stats_indicators_window(
+        "AAPL", ["rsi", "close_10_ema"], "2024-03-01", 14
+    )
+
+    lines = result.splitlines()
+    header = next(line for line in lines if line.startswith("| Date"))
+    rows = [line for line in lines if line.startswith("| 2024-")]
+
+    assert header == "| Date | rsi | close_10_ema |"
+    assert rows[0].startswith("| 2024-03-01 ")  # 最新交易日在前
+    assert len(rows) == 11  # 2024-02-16 至 2024-03-01 的交易日，周末不出现
+    assert all(row.count("|") == 4 for row in rows)
+    assert "- rsi: RSI" in result
@@ -0,0 +1,110 @@
+"""
+测试 LLM 响应精确匹配缓存
+验证相同模型配置与消息命中缓存、易变字段不影响命中、按节点绕过、命中率统计以及按大小淘汰
+"""
+
+from typing import TypedDict
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.graph.llm_cache import LLMResponseCache, get_llm_cache
+
+
+def _model(cache, responses=("first", "second", "third", "fourth")):
+    return FakeListChatModel(responses=list(responses), cache=cache)
+
+
+def test_identical_calls_hit_and_parameters_split_keys(tmp_path):
+    """测试相同消息第二次直接命中；绑定不同工具参数时键不同"""
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"))
+    model = _model(cache)
+
+    assert model.invoke("analyze AAPL").content == "first"
+    assert model.invoke("analyze AAPL").content == "first"
+    assert model.invoke("analyze MSFT").content == "second"
+    assert model.bind(tools=[{"name": "get_news"}]).invoke("analyze AAPL").content == "third"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 3)
+    assert stats["hit_rate"] == 0.25
+
+    # 重新打开同一文件，响应依然可用
+    reopened = _model(LLMResponseCache(str(tmp_path / "llm.sqlite")))
+    assert reopened.invoke("analyze AAPL").content == "first"
+
+
+def test_volatile_fields_are_ignored(tmp_path):
+    """测试工具输出中的抓取时间戳、响应元数据不影响命中"""
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"))
+    model = _model(cache)
+
+    def conversation(retrieved_at, metadata):
+        return [
+            HumanMessage(content="AAPL"),
+            AIMessage(content="", tool_calls=[{"name": "get_stock_data", "args": {}, "id": "call_1"}],
+                      response_metadata=metadata),
+            ToolMessage(content=f"# Data retrieved on: {retrieved_at}\n\nDate,Close\n2024-01-02,10.0",
+                        tool_call_id="call_1"),
+        ]
+
+    assert model.invoke(conversation("2025-01-01 10:00:00", {"id": "a"})).content == "first"
+    assert model.invoke(conversation("2025-03-09 17:45:12", {"id": "b"})).content == "first"
+    assert cache.stats()["hits"] == 1
+
+
+class _State(TypedDict):
+    answers: list
+
+
+def test_bypass_nodes_and_per_node_hit_rate(tmp_path):
+    """测试绕过节点每次都调用模型，其他节点命中缓存，统计按节点区分"""
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"), bypass_nodes=["Risk Judge"])
+    model = _model(cache, responses=[f"r{i}" for i in range(10)])
+
+    def ask(state):
+        return {"answers": state["answers"] + [model.invoke("same question").content]}
+
+    workflow = StateGraph(_State)
+    workflow.add_node("Trader", ask)
+    workflow.add_node("Risk Judge", ask)
+    workflow.add_edge(START, "Trader")
+    workflow.add_edge("Trader", "Risk Judge")
+    workflow.add_edge("Risk Judge", END)
+    graph = workflow.compile()
+
+    first = graph.invoke({"answers": []})["answers"]
+    second = graph.invoke({"answers": []})["answers"]
+
+    assert first == ["r0", "r1"]
+    assert second == ["r0", "r2"]  # Trader 命中，Risk Judge 绕过
+    by_node = cache.stats()["by_node"]
+    assert by_node["Trader"] == {"hits": 1, "misses": 1, "bypassed": 0, "hit_rate": 0.5}
+    assert by_node["Risk Judge"]["bypassed"] == 2
+
+
+def test_size_based_eviction_drops_least_recently_used(tmp_path):
+    """测试超过大小上限时淘汰最久未使用的条目"""
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"), max_bytes=10 ** 9)
+    model = _model(cache, responses=["x" * 2000, "y" * 2000, "z" * 2000, "w" * 2000])
+    model.invoke("a")
+    model.invoke("b")
+    model.invoke("a")  # 刷新 a 的使用时间
+    per_entry = cache.stats()["bytes_stored"] // 2
+
+    cache.max_bytes = int(per_entry * 2.5)
+    model.invoke("c")
+
+    stats = cache.stats()
+    assert stats["evicted"] == 1
+    assert stats["entries"] == 2
+    assert model.invoke("a").content == "x" * 2000  # a 仍在缓存中
+    assert model.invoke("b").content == "w" * 2000  # b 已被淘汰，重新调用模型
+
+
+def test_cache_is_opt_in(tmp_path):
+    """测试默认关闭；开启后同一路径复用同一个缓存实例"""
+    assert get_llm_cache({"llm_cache_enabled": False}) is None
+    config = {"llm_cache_enabled": True, "llm_cache_path": str(tmp_path / "llm.sqlite")}
+    assert get_llm_cache(config) is get_llm_cache(config)
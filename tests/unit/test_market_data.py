@@ -0,0 +1,127 @@
+"""
+测试类型化价格数据接口
+验证各数据源的表格统一为固定结构、工具层文本格式化、按 get_stock_data 配置路由以及工具结束日期包含当天
+"""
+
+import pandas as pd
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import interface, vendor_health
+from tradingagents.dataflows.market_data import (
+    PRICE_FRAME_SCHEMA,
+    format_price_frame,
+    get_price_frame,
+    slice_price_frame,
+    to_price_frame,
+)
+from tradingagents.dataflows.vendor_health import VendorHealthRegistry
+from tradingagents.graph.performance_calculator import backtest
+
+
+def _schema(frame):
+    return {name: str(dtype) for name, dtype in frame.dtypes.items()}
+
+
+def test_vendor_tables_share_one_schema():
+    """测试 yfinance 价格库、本地 CSV 与 Alpha Vantage 三种表格转换后结构一致"""
+    store = pd.DataFrame(
+        {
+            "Date": pd.to_datetime(["2024-01-03", "2024-01-02"]),
+            "Open": [1.0, 2.0], "High": [1.5, 2.5], "Low": [0.5, 1.5],
+            "Close": [1.2, 2.2], "Volume": [100, 200],
+        }
+    )
+    local = pd.DataFrame(
+        {
+            "Date": ["2024-01-02 00:00:00-05:00", "2024-01-03 00:00:00-05:00"],
+            "Open": [2.0, 1.0], "High": [2.5, 1.5], "Low": [1.5, 0.5],
+            "Close": [2.2, 1.2], "Adj Close": [2.1, 1.1], "Volume": [200, 100],
+        }
+    )
+    alpha = pd.DataFrame(
+        {
+            "timestamp": ["2024-01-03", "2024-01-02"],
+            "open": [1.0, 2.0], "high": [1.5, 2.5], "low": [0.5, 1.5], "close": [1.2, 2.2],
+            "adjusted_close": [1.1, 2.1], "volume": [100, 200], "dividend_amount": [0.0, 0.0],
+        }
+    )
+
+    frames = [to_price_frame(table) for table in (store, local, alpha)]
+
+    for frame in frames:
+        assert list(frame.columns) == list(PRICE_FRAME_SCHEMA)
+        assert _schema(frame) == PRICE_FRAME_SCHEMA
+        assert frame["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-02", "2024-01-03"]
+        assert frame["close"].tolist() == [2.2, 1.2]
+
+
+def test_format_price_frame_matches_tool_text():
+    """测试工具层文本：带#头部、收盘价保留两位小数、成交量为整数"""
+    frame = to_price_frame(
+        pd.DataFrame(
+            {
+                "Date": pd.to_datetime(["2024-01-02"]),
+                "Open": [1.234], "High": [1.5], "Low": [1.0], "Close": [1.456], "Volume": [1000],
+            }
+        )
+    )
+
+    text = format_price_frame(frame, "aapl", "2024-01-01", "2024-01-05")
+
+    assert text.startswith("# Stock data for AAPL from 2024-01-01 to 2024-01-05\n# Total records: 1\n")
+    assert text.rstrip().endswith("Date,Open,High,Low,Close,Volume\n2024-01-02,1.23,1.5,1.0,1.46,1000")
+    assert "No data found" in format_price_frame(to_price_frame(None), "AAPL", "2024-01-01", "2024-01-05")
+
+
+def test_price_frame_follows_get_stock_data_vendor(monkeypatch):
+    """测试类型化接口沿用 get_stock_data 的工具级数据源配置，且结果可直接用于回测"""
+    config = dataflow_config.get_config()
+    config.update({"vendor_cache_enabled": False, "tool_vendors": {"get_stock_data": "fake"}})
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+
+    calls = []
+
+    def fake(symbol, start_date, end_date):
+        calls.append((symbol, start_date, end_date))
+        return to_price_frame(
+            pd.DataFrame({"Date": pd.to_datetime(["2024-01-02", "2024-01-03"]), "Close": [10.0, 11.0]})
+        )
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_price_frame", {"fake": fake})
+
+    frame = get_price_frame("AAPL", "2024-01-01", "2024-01-05")
+
+    assert calls == [("AAPL", "2024-01-01", "2024-01-05")]
+    returns, summary = backtest(
+        [{"date": "2024-01-03", "signal": "buy", "quantity": 1}], frame, initial_cash=100
+    )
+    assert returns["price"].tolist() == [11.0]
+    assert summary["final_value"] == 100
+
+
+def test_get_stock_data_tool_end_date_is_inclusive(monkeypatch):
+    """测试 get_stock_data 工具的结束日期包含当天：向类型化接口传入次日，最后一根 K 线不丢失"""
+    from tradingagents.agents.utils.core_stock_tools import get_stock_data
+
+    config = dataflow_config.get_config()
+    config.update({"vendor_cache_enabled": False, "vendor_replay_mode": "off", "tool_vendors": {"get_stock_data": "fake"}})
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+
+    bars = to_price_frame(
+        pd.DataFrame({"Date": pd.to_datetime(["2024-01-04", "2024-01-05", "2024-01-08"]), "Close": [1.0, 2.0, 3.0]})
+    )
+    calls = []
+
+    def fake(symbol, start_date, end_date):
+        calls.append(end_date)
+        return slice_price_frame(bars, start_date, end_date)
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_price_frame", {"fake": fake})
+
+    text = get_stock_data.invoke({"symbol": "AAPL", "start_date": "2024-01-04", "end_date": "2024-01-05"})
+
+    assert calls == ["2024-01-06"]
+    assert "from 2024-01-04 to 2024-01-05" in text and "# Total records: 2" in text
+    assert "2024-01-05," in text and "2024-01-08" not in text
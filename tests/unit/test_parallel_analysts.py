@@ -0,0 +1,92 @@
+"""
+测试分析师并行分支
+验证每个分析师在独立消息通道中完成工具循环，只写回自己的报告字段，且各分支并行执行
+"""
+
+import threading
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+from langgraph.prebuilt import ToolNode
+
+from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.setup import GraphSetup
+
+
+# 工具调用的并发计数；两个分支并行时，两次调用会同时到达屏障
+_in_flight = {"now": 0, "max": 0}
+_in_flight_lock = threading.Lock()
+_both_calls = threading.Barrier(2, timeout=2)
+
+
+@tool
+def lookup(symbol: str) -> str:
+    """Return fake data for a symbol."""
+    with _in_flight_lock:
+        _in_flight["now"] += 1
+        _in_flight["max"] = max(_in_flight["max"], _in_flight["now"])
+    try:
+        _both_calls.wait()
+    except threading.BrokenBarrierError:
+        pass  # 串行执行时等不到另一个调用，交给下面的并发断言报错
+    finally:
+        with _in_flight_lock:
+            _in_flight["now"] -= 1
+    return f"data for {symbol}"
+
+
+def _fake_analyst(report_field, seen):
+    def node(state):
+        messages = state["messages"]
+        seen.append(len(messages))
+        if not any(isinstance(m, ToolMessage) for m in messages):
+            call = {"name": "lookup", "args": {"symbol": state["company_of_interest"]}, "id": f"call_{report_field}"}
+            return {"messages": [AIMessage(content="", tool_calls=[call])]}
+        return {"messages": [AIMessage(content=f"{report_field} done")], report_field: f"{report_field} done"}
+    return node
+
+
+def test_branches_run_in_parallel_with_isolated_messages():
+    """测试两个分析师分支并行运行，报告各自写回，主图消息通道不被分支污染"""
+    setup = GraphSetup(None, None, {}, None, None, None, None, None, ConditionalLogic(), {})
+    seen = []
+
+    workflow = StateGraph(AgentState)
+    for analyst_type, field in (("market", "market_report"), ("news", "news_report")):
+        workflow.add_node(
+            f"{analyst_type.capitalize()} Analyst",
+            setup._build_analyst_branch(analyst_type, _fake_analyst(field, seen), ToolNode([lookup])),
+        )
+        workflow.add_edge(START, f"{analyst_type.capitalize()} Analyst")
+    workflow.add_node("Join", lambda state: {"sender": "join"})
+    workflow.add_edge(["Market Analyst", "News Analyst"], "Join")
+    workflow.add_edge("Join", END)
+    graph = workflow.compile()
+
+    _in_flight.update(now=0, max=0)
+    _both_calls.reset()
+    final = graph.invoke({"messages": [("human", "AAPL")], "company_of_interest": "AAPL"})
+
+    assert final["market_report"] == "market_report done"
+    assert final["news_report"] == "news_report done"
+    assert len(final["messages"]) == 1  # 只有初始消息
+    assert sorted(seen) == [1, 1, 3, 3]  # 每个分支只看到自己的工具往返
+    assert _in_flight["max"] == 2  # 两个分支的工具调用同时进行
+
+
+def test_parallel_mode_wires_fan_out_and_join():
+    """测试并行模式下各分析师从 START 出发，并在 Bull Researcher 前汇合"""
+    setup = GraphSetup(
+        None, None, {"market": ToolNode([lookup]), "news": ToolNode([lookup])}, None, None, None, None, None,
+        ConditionalLogic(), {"analyst_execution_mode": "parallel"},
+    )
+    graph = setup.setup_graph(["market", "news"]).get_graph()
+    edges = {(edge.source, edge.target) for edge in graph.edges}
+
+    assert ("__start__", "Market Analyst") in edges
+    assert ("__start__", "News Analyst") in edges
+    assert ("Market Analyst", "Bull Researcher") in edges
+    assert ("News Analyst", "Bull Researcher") in edges
+    assert "Msg Clear Market" not in graph.nodes
@@ -0,0 +1,142 @@
+"""
+测试持久化价格库
+验证首次全量下载、增量补齐尾部K线、区间切片以及非 yfinance 数据源时跳过预热
+"""
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows import price_store
+from tradingagents.dataflows.price_store import PriceStore
+
+
+def _fake_bars(start, end, close=100.0):
+    idx = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name="Date")
+    n = len(idx)
+    return pd.DataFrame(
+        {
+            "Open": np.full(n, close),
+            "High": np.full(n, close + 1),
+            "Low": np.full(n, close - 1),
+            "Close": np.full(n, close),
+            "Volume": np.full(n, 1000),
+        },
+        index=idx,
+    )
+
+
+def test_incremental_tail_fetch(tmp_path, monkeypatch):
+    """测试第二次只拉取缺失的尾部数据"""
+    calls = []
+
+    def fake_download(symbol, start, end, **kwargs):
+        calls.append((start, end))
+        return _fake_bars(start, end)
+
+    monkeypatch.setattr(price_store.yf, "download", fake_download)
+
+    store = PriceStore(str(tmp_path))
+    today = pd.Timestamp.today().normalize()
+
+    # 模拟一份旧的历史：截止到10天前
+    old_end = today - pd.Timedelta(days=10)
+    store.put("AAPL", _fake_bars(today - pd.DateOffset(years=1), old_end).reset_index())
+    stored_last = store.last_date("AAPL")
+
+    data = store.ensure("AAPL")
+
+    assert len(calls) == 1
+    assert calls[0][0] == stored_last  # 从最后一根已存K线开始补齐
+    assert data["Date"].is_monotonic_increasing
+    assert not data["Date"].duplicated().any()
+
+    # 同一天再次调用不会访问网络
+    store.ensure("AAPL")
+    assert len(calls) == 1
+
+
+def test_readjusted_history_triggers_full_refresh(tmp_path, monkeypatch):
+    """测试上游复权导致重叠K线变化时重新下载全量历史"""
+    calls = []
+
+    def fake_download(symbol, start, end, **kwargs):
+        calls.append((start, end))
+        return _fake_bars(start, end, close=50.0)
+
+    monkeypatch.setattr(price_store.yf, "download", fake_download)
+
+    store = PriceStore(str(tmp_path))
+    today = pd.Timestamp.today().normalize()
+    store.put("MSFT", _fake_bars(today - pd.DateOffset(years=1), today - pd.Timedelta(days=10)).reset_index())
+
+    data = store.ensure("MSFT")
+
+    assert len(calls) == 2
+    assert (data["Close"] == 50.0).all()
+
+
+def test_get_history_slices_inclusive(tmp_path):
+    """测试按日期区间切片（两端包含）"""
+    store = PriceStore(str(tmp_path))
+    bars = _fake_bars("2024-01-01", "2024-02-01").reset_index()
+    store.put("NVDA", bars)
+    store._meta["NVDA"]["checked"] = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+    sliced = store.get_history("NVDA", "2024-01-08", "2024-01-12")
+
+    assert sliced["Date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2024-01-08",
+        "2024-01-09",
+        "2024-01-10",
+        "2024-01-11",
+        "2024-01-12",
+    ]
+
+
+def test_warm_uses_one_bulk_download(tmp_path, monkeypatch):
+    """测试批量预热：新标的一次多标的下载，之后 ensure 只读本地，并报告拉取失败的标的"""
+    calls = []
+
+    def fake_download(symbols, start, end, **kwargs):
+        assert kwargs["timeout"] == price_store.get_config()["http_timeout_seconds"]
+        calls.append(list(symbols) if isinstance(symbols, list) else symbols)
+        frames = {s: _fake_bars(start, end) for s in symbols if s != "BAD"}
+        return pd.concat(frames, axis=1)
+
+    monkeypatch.setattr(price_store.yf, "download", fake_download)
+
+    store = PriceStore(str(tmp_path))
+    report = store.warm(["AAPL", "msft", "BAD"])
+
+    assert calls == [["AAPL", "MSFT", "BAD"]]
+    assert report["AAPL"] == "ok" and report["MSFT"] == "ok"
+    assert report["BAD"] == "no data returned"
+
+    data = store.ensure("MSFT")
+    assert len(calls) == 1
+    assert not data.empty and data["Date"].is_monotonic_increasing
+
+    # 同一天再次预热不会访问网络
+    assert store.warm(["AAPL", "MSFT"]) == {"AAPL": "cached", "MSFT": "cached"}
+    assert len(calls) == 1
+
+
+def test_warm_skipped_when_prices_do_not_come_from_yfinance(tmp_path, monkeypatch):
+    """测试价格与指标数据源都不是 yfinance 时不做预热下载"""
+    from tradingagents.dataflows import config as dataflow_config
+
+    config = dataflow_config.get_config()
+    config.update({
+        "price_store_dir": str(tmp_path),
+        "data_vendors": {"core_stock_apis": "alpha_vantage", "technical_indicators": "alpha_vantage"},
+        "tool_vendors": {},
+    })
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    calls = []
+    monkeypatch.setattr(price_store.yf, "download", lambda *args, **kwargs: calls.append(args))
+
+    assert price_store.warm_price_store(["AAPL"]) == {}
+    assert calls == []
+
+    config["data_vendors"]["technical_indicators"] = "yfinance"  # stockstats 指标读取价格存储
+    assert price_store.price_store_in_use()
@@ -0,0 +1,142 @@
+"""
+测试前缀缓存友好的提示词布局与缓存 token 统计
+验证各节点的系统提示在不同运行间逐字节不变、易变内容全部位于其后，以及按节点读取提供方报告的缓存命中 token
+"""
+
+from typing import TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.agents.managers.research_manager import create_research_manager
+from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator
+from tradingagents.agents.trader.trader import create_trader
+from tradingagents.graph.llm_cache import LLMResponseCache
+from tradingagents.graph.prompt_cache_stats import PromptCacheTracker, cached_token_usage
+
+
+class _Memory:
+    def __init__(self, lesson):
+        self.lesson = lesson
+
+    def get_memories(self, situation, n_matches=2):
+        return [{"recommendation": self.lesson}]
+
+
+def _state(ticker, date):
+    return {
+        "company_of_interest": ticker,
+        "trade_date": date,
+        "market_report": f"{ticker} market report {date}",
+        "sentiment_report": f"{ticker} sentiment",
+        "news_report": f"{ticker} news",
+        "fundamentals_report": f"{ticker} fundamentals",
+        "investment_plan": f"Buy {ticker}",
+        "trader_investment_plan": f"Buy 10 {ticker}",
+        "investment_debate_state": {
+            "history": f"Bear Analyst: avoid {ticker}",
+            "current_response": f"Bear Analyst: avoid {ticker}",
+            "count": 1,
+        },
+        "risk_debate_state": {
+            "history": f"Safe Analyst: trim {ticker}",
+            "current_safe_response": f"Safe Analyst: trim {ticker}",
+            "count": 1,
+        },
+    }
+
+
+def test_system_prompt_is_identical_across_runs():
+    """测试不同标的、日期、记忆下系统提示完全相同，本次运行的值只出现在其后的消息中"""
+    for factory, needs_memory in [
+        (create_bull_researcher, True),
+        (create_research_manager, True),
+        (create_trader, True),
+        (create_risky_debator, False),
+    ]:
+        sent = []
+        llm = RunnableLambda(lambda messages: sent.append(messages) or AIMessage(content="ok"))
+        for ticker, date, lesson in [("AAPL", "2024-01-02", "lesson one"), ("NVDA", "2024-06-03", "lesson two")]:
+            node = factory(llm, _Memory(lesson)) if needs_memory else factory(llm)
+            node.invoke(_state(ticker, date))
+
+        first, second = sent
+        assert first[0]["role"] == "system" and first[0] == second[0]
+        assert "AAPL" not in first[0]["content"] and "lesson one" not in first[0]["content"]
+        assert "AAPL" in first[-1]["content"] and "NVDA" in second[-1]["content"]
+
+
+def test_debate_history_stays_at_the_tail():
+    """测试辩论历史位于最后，下一轮调用的消息以上一轮的内容为前缀（历史只在末尾追加）"""
+    sent = []
+    llm = RunnableLambda(lambda messages: sent.append(messages) or AIMessage(content="ok"))
+    node = create_research_manager(llm, _Memory("lesson"))
+
+    state = _state("AAPL", "2024-01-02")
+    node.invoke(state)
+    debate = state["investment_debate_state"]
+    state["investment_debate_state"] = dict(debate, history=debate["history"] + "\nBull Analyst: buy")
+    node.invoke(state)
+
+    assert sent[1][-1]["content"].startswith(sent[0][-1]["content"])
+
+
+def test_cached_token_usage_sources():
+    """测试从统一 usage 元数据与 OpenAI 兼容原始 token_usage 中读取缓存命中数"""
+    unified = AIMessage(content="", usage_metadata={"input_tokens": 1200, "output_tokens": 10, "total_tokens": 1210,
+                                                    "input_token_details": {"cache_read": 1024}})
+    raw = AIMessage(content="", response_metadata={"token_usage": {"prompt_tokens": 900,
+                                                                   "prompt_tokens_details": {"cached_tokens": 768}}})
+    assert cached_token_usage(unified) == (1200, 1024)
+    assert cached_token_usage(raw) == (900, 768)
+    assert cached_token_usage(AIMessage(content="")) is None
+
+
+class _State(TypedDict):
+    answers: list
+
+
+def _usage_message(content, input_tokens, cached):
+    return AIMessage(content=content, usage_metadata={"input_tokens": input_tokens, "output_tokens": 5,
+                                                      "total_tokens": input_tokens + 5,
+                                                      "input_token_details": {"cache_read": cached}})
+
+
+def test_tracker_aggregates_per_node_and_skips_response_cache_hits(tmp_path):
+    """测试按节点累计输入与缓存 token；命中本地响应缓存的调用不计入 token"""
+    tracker = PromptCacheTracker()
+    model = GenericFakeChatModel(
+        messages=iter([_usage_message("a", 1000, 0), _usage_message("b", 1000, 896), _usage_message("c", 400, 0)]),
+        callbacks=[tracker],
+        cache=LLMResponseCache(str(tmp_path / "llm.sqlite")),
+    )
+
+    def trader(state):
+        return {"answers": state["answers"] + [model.invoke(f"plan {len(state['answers'])}").content]}
+
+    def judge(state):
+        return {"answers": state["answers"] + [model.invoke("judge").content]}
+
+    workflow = StateGraph(_State)
+    workflow.add_node("Trader", trader)
+    workflow.add_node("Risk Judge", judge)
+    workflow.add_edge(START, "Trader")
+    workflow.add_edge("Trader", "Risk Judge")
+    workflow.add_edge("Risk Judge", END)
+    graph = workflow.compile()
+
+    graph.invoke({"answers": []})
+    graph.invoke({"answers": ["warm"]})
+    graph.invoke({"answers": []})  # 与第一次完全相同，两个节点都命中本地响应缓存
+
+    stats = tracker.stats()
+    trader_stats = stats["by_node"]["Trader"]
+    assert (trader_stats["calls"], trader_stats["reported_calls"], trader_stats["response_cache_hits"]) == (3, 2, 1)
+    assert (trader_stats["input_tokens"], trader_stats["cached_tokens"]) == (1400, 0)
+    judge_stats = stats["by_node"]["Risk Judge"]
+    assert (judge_stats["calls"], judge_stats["response_cache_hits"]) == (3, 2)
+    assert judge_stats["cached_ratio"] == 0.896
+    assert (stats["input_tokens"], stats["cached_tokens"]) == (2400, 896)
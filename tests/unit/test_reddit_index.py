@@ -0,0 +1,51 @@
+"""
+测试 Reddit JSONL 日期/股票索引
+验证按日期、按股票提及的 Top-N 结果以及索引复用
+"""
+
+import json
+import os
+
+from tradingagents.dataflows import reddit_utils
+from tradingagents.dataflows.reddit_utils import fetch_top_from_category
+
+DAY = 1704153600  # 2024-01-02 00:00:00 UTC
+
+
+def _write_posts(root, category, name, posts):
+    os.makedirs(os.path.join(root, category), exist_ok=True)
+    with open(os.path.join(root, category, name), "w") as f:
+        for created, title, ups in posts:
+            f.write(json.dumps({"created_utc": created, "title": title, "selftext": "", "url": "u", "ups": ups}) + "\n")
+
+
+def test_company_top_posts_by_ticker(tmp_path):
+    """测试公司新闻只返回提及该股票的帖子，并按点赞数降序截取"""
+    root = str(tmp_path)
+    _write_posts(root, "company_news", "stocks.jsonl", [
+        (DAY, "Apple earnings", 3),
+        (DAY + 60, "AAPL to the moon", 9),
+        (DAY + 120, "Tesla recall", 50),
+        (DAY + 86400, "apple next day", 100),
+    ])
+
+    posts = fetch_top_from_category("company_news", "2024-01-02", 10, "AAPL", data_path=root)
+
+    assert [p["title"] for p in posts] == ["AAPL to the moon", "Apple earnings"]
+    assert all(p["posted_date"] == "2024-01-02" for p in posts)
+
+
+def test_index_is_reused_until_files_change(tmp_path):
+    """测试同一目录的索引只构建一次，文件变化后重建"""
+    root = str(tmp_path)
+    _write_posts(root, "global_news", "news.jsonl", [(DAY, "Fed holds rates", 5)])
+    path = os.path.join(root, "global_news")
+
+    first = reddit_utils.get_reddit_index(path)
+    assert reddit_utils.get_reddit_index(path) is first
+
+    _write_posts(root, "global_news", "news.jsonl", [(DAY, "Fed holds rates", 5), (DAY, "CPI beats", 8)])
+    os.utime(os.path.join(path, "news.jsonl"), (0, 0))
+
+    posts = fetch_top_from_category("global_news", "2024-01-02", 5, data_path=root)
+    assert [p["title"] for p in posts] == ["CPI beats", "Fed holds rates"]
@@ -0,0 +1,72 @@
+"""
+测试 SimFin 按股票分区的时点（point-in-time）存储
+验证单次 as-of 查询与原全表扫描结果一致，以及批量查询
+"""
+
+import os
+
+import pandas as pd
+
+from tradingagents.dataflows.simfin_store import SimFinStore
+
+
+def _write_balance_csv(data_dir):
+    path = os.path.join(
+        data_dir, "fundamental_data", "simfin_data_all", "balance_sheet",
+        "companies", "us", "us-balance-quarterly.csv",
+    )
+    os.makedirs(os.path.dirname(path))
+    pd.DataFrame(
+        {
+            "Ticker": ["AAPL", "MSFT", "AAPL", "AAPL", "MSFT"],
+            "SimFinId": [1, 2, 1, 1, 2],
+            "Report Date": ["2023-03-31", "2023-03-31", "2023-06-30", "2022-12-31", "2023-06-30"],
+            "Publish Date": ["2023-05-05", "2023-04-28", "2023-08-04", "2023-02-03", "2023-07-28"],
+            "Total Assets": [100.0, 200.0, 110.0, 90.0, 210.0],
+        }
+    ).to_csv(path, sep=";", index=False)
+    return path
+
+
+def _legacy_as_of(path, ticker, curr_date):
+    df = pd.read_csv(path, sep=";")
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    if filtered_df.empty:
+        return None
+    return filtered_df.loc[filtered_df["Publish Date"].idxmax()]
+
+
+def test_as_of_matches_full_scan(tmp_path):
+    """测试 as-of 查询与原先全表过滤的结果逐字一致"""
+    source = _write_balance_csv(str(tmp_path / "data"))
+    store = SimFinStore(str(tmp_path / "data"), str(tmp_path / "store"))
+
+    for curr_date in ["2023-01-01", "2023-02-03", "2023-06-01", "2024-01-01"]:
+        expected = _legacy_as_of(source, "AAPL", curr_date)
+        actual = store.as_of("balance_sheet", "quarterly", "AAPL", curr_date)
+        if expected is None:
+            assert actual is None
+        else:
+            assert str(actual) == str(expected)
+
+    assert store.as_of("balance_sheet", "quarterly", "NVDA", "2024-01-01") is None
+
+
+def test_as_of_batch(tmp_path):
+    """测试批量查询按请求顺序返回，每个请求一行"""
+    _write_balance_csv(str(tmp_path / "data"))
+    store = SimFinStore(str(tmp_path / "data"), str(tmp_path / "store"))
+
+    result = store.as_of_batch(
+        "balance_sheet",
+        "quarterly",
+        [("MSFT", "2023-08-01"), ("AAPL", "2023-01-01"), ("AAPL", "2023-06-01")],
+    )
+
+    assert result["query_ticker"].tolist() == ["MSFT", "AAPL", "AAPL"]
+    assert result["Total Assets"].iloc[0] == 210.0
+    assert pd.isna(result["Total Assets"].iloc[1])
+    assert result["Total Assets"].iloc[2] == 100.0
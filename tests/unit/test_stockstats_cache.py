@@ -0,0 +1,69 @@
+"""
+测试 stockstats 指标帧 LRU 缓存
+验证命中计数、已计算指标列的复用以及按条目数淘汰
+"""
+
+import pandas as pd
+
+from tradingagents.dataflows.stockstats_utils import (
+    StockstatsFrameCache,
+    _wrap_price_frame,
+)
+
+
+def _price_frame(n=60):
+    dates = pd.bdate_range("2024-01-01", periods=n)
+    close = pd.Series(range(100, 100 + n), dtype=float)
+    return pd.DataFrame(
+        {
+            "Date": dates,
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1000,
+        }
+    )
+
+
+def test_cached_frame_reused_across_indicators():
+    """测试同一 key 的第二次请求命中缓存，且保留已计算的指标列"""
+    cache = StockstatsFrameCache(max_entries=4)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _wrap_price_frame(_price_frame())
+
+    key = ("AAPL", "yfinance", "2024-03-22")
+    first = cache.get_indicator_frame(key, "close_10_ema", loader)
+    second = cache.get_indicator_frame(key, "rsi", loader)
+
+    assert len(loads) == 1
+    assert list(first.columns) == ["Date", "close_10_ema"]
+    assert list(second.columns) == ["Date", "rsi"]
+    # 缓存中的共享帧保留两列指标；调用方拿到的是副本，不受之后新增列的影响
+    cached = cache._entries[key]
+    assert {"close_10_ema", "rsi"}.issubset(cached.columns)
+    assert first is not cached and second is not cached
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] > 0
+
+
+def test_lru_eviction_by_entries():
+    """测试超过条目上限时淘汰最久未使用的帧"""
+    cache = StockstatsFrameCache(max_entries=2)
+
+    for symbol in ("AAPL", "MSFT", "NVDA"):
+        cache.get_indicator_frame(
+            (symbol, "yfinance", "2024-03-22"),
+            "close_10_ema",
+            lambda: _wrap_price_frame(_price_frame()),
+        )
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
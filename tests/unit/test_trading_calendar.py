@@ -0,0 +1,96 @@
+"""
+测试离线交易日历
+验证 NYSE 节假日规则、按交易日计算的回看窗口以及指标窗口不再输出非交易日
+"""
+
+import pandas as pd
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import y_finance
+from tradingagents.dataflows.trading_calendar import TradingCalendar, window_end, window_start
+
+
+def test_nyse_holidays_and_sessions():
+    """测试节假日规则（含周末顺延和临时休市）与全年交易日数"""
+    calendar = TradingCalendar("NYSE")
+
+    assert sorted(d.isoformat() for d in calendar.holidays(2022)) == [
+        "2022-01-17", "2022-02-21", "2022-04-15", "2022-05-30", "2022-06-20",
+        "2022-07-04", "2022-09-05", "2022-11-24", "2022-12-26",
+    ]  # 元旦在周六时不补休；六月节、圣诞节顺延到周一
+    assert not calendar.is_session("2025-01-09")  # 卡特国葬日
+    assert not calendar.is_session("2024-03-29")  # 耶稣受难日
+    assert len(calendar.sessions("2024-01-01", "2024-12-31")) == 252
+    assert calendar.sessions_back("2024-07-07", 3) == ["2024-07-02", "2024-07-03", "2024-07-05"]
+    assert calendar.previous_session("2024-07-04") == "2024-07-03"
+    assert calendar.session_after("2024-07-03", 1) == "2024-07-05"
+
+
+def test_windows_follow_configured_unit(monkeypatch):
+    """测试回看/前瞻窗口按配置在交易日与自然日之间切换"""
+    config = dataflow_config.get_config()
+    config["trading_window_unit"] = "sessions"
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    assert window_start("2024-07-08", 3) == "2024-07-02"
+    assert window_end("2024-07-03", 2) == "2024-07-08"
+
+    config["trading_window_unit"] = "calendar"
+    assert window_start("2024-07-08", 3) == "2024-07-05"
+    assert window_end("2024-07-03", 2) == "2024-07-05"
+
+
+def test_indicator_window_lists_sessions_only(monkeypatch):
+    """测试单指标窗口按交易日计数，不再出现 Not a trading day 行"""
+    config = dataflow_config.get_config()
+    config["trading_window_unit"] = "sessions"
+    monkeypatch.setattr(dataflow_config, "_config", config)
+
+    sessions = TradingCalendar().sessions("2024-06-01", "2024-07-10")
+    series = pd.Series(range(len(sessions)), index=sessions, dtype=float)
+    monkeypatch.setattr(y_finance, "_get_stock_stats_series", lambda symbol, indicator: series)
+
+    result = y_finance.get_stock_stats_indicators_window("AAPL", "rsi", "2024-07-08", 5)
+
+    rows = [line for line in result.splitlines() if line.startswith("2024-")]
+    assert [row[:10] for row in rows] == [
+        "2024-07-08", "2024-07-05", "2024-07-03", "2024-07-02", "2024-07-01", "2024-06-28",
+    ]
+    assert "Not a trading day" not in result
+
+
+def test_delayed_reflection_waits_for_full_session_window(monkeypatch, tmp_path):
+    """测试前瞻窗口按交易日未走完时不反思，走完后读满 lookforward_days 个交易日且不晚于当前日期"""
+    from tradingagents.dataflows import market_data
+    from tradingagents.graph.delayed_reflection import DelayedReflectionManager
+
+    config = dataflow_config.get_config()
+    config["trading_window_unit"] = "sessions"
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    requested, served = [], []
+
+    def fake_price_frame(ticker, start, end):
+        # 与真实实现一致：end 不含当天
+        requested.append((start, end))
+        dates = [d.strftime("%Y-%m-%d") for d in pd.bdate_range(start, end, inclusive="left")]
+        served.append(dates)
+        return pd.DataFrame({"date": dates, "close": [10.0 + i for i in range(len(dates))]})
+
+    monkeypatch.setattr(market_data, "get_price_frame", fake_price_frame)
+
+    class _Graph:
+        def reflect_and_remember(self, returns_losses):
+            pass
+
+    manager = DelayedReflectionManager(str(tmp_path / "pending.json"))
+    signals = [{"date": "2024-07-05", "signal": "BUY", "quantity": 1, "reference_price": 10.0}]
+    manager.save_pending_reflection("AAPL", "2024-07-05", {}, signals, {})
+
+    # 周五决策，下周三已满 5 个自然日，但 5 个交易日的窗口要到下周五才结束
+    stats = manager.process_pending_reflections(_Graph(), "2024-07-10", lookforward_days=5, min_age_days=5)
+    assert (stats["processed"], stats["skipped"], requested) == (0, 1, [])
+
+    stats = manager.process_pending_reflections(_Graph(), "2024-07-12", lookforward_days=5, min_age_days=5)
+    assert stats["processed"] == 1
+    assert requested == [("2024-07-05", "2024-07-13")]
+    # 决策日之后读满 lookforward_days 个交易日（最后一个是窗口末日 7/12）
+    assert served[0][1:] == ["2024-07-08", "2024-07-09", "2024-07-10", "2024-07-11", "2024-07-12"]
@@ -0,0 +1,100 @@
+"""
+测试数据源响应缓存
+验证命中复用、当日/历史请求的 TTL 选择、并发相同请求的合并以及错误与空结果的缓存策略
+"""
+
+import threading
+import time
+
+from tradingagents.dataflows.vendor_cache import VendorResponseCache
+
+
+def _fake_stock(symbol, start_date, end_date):
+    _fake_stock.calls += 1
+    return f"{symbol} {start_date} {end_date}"
+
+
+def test_hit_after_first_call(tmp_path):
+    """测试同一请求（位置参数或关键字参数）第二次直接命中缓存"""
+    _fake_stock.calls = 0
+    cache = VendorResponseCache(str(tmp_path / "cache.sqlite"))
+
+    first = cache.call("get_stock_data", "core_stock_apis", "yfinance", _fake_stock, ("AAPL", "2024-01-01", "2024-02-01"), {})
+    second = cache.call(
+        "get_stock_data", "core_stock_apis", "yfinance", _fake_stock, ("AAPL",),
+        {"start_date": "2024-01-01", "end_date": "2024-02-01"},
+    )
+
+    assert first == second
+    assert _fake_stock.calls == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes_stored"] > 0
+
+
+def test_ttl_live_vs_historical(tmp_path):
+    """测试包含今天的请求使用短 TTL，纯历史请求使用长 TTL"""
+    cache = VendorResponseCache(str(tmp_path / "cache.sqlite"))
+    today = time.strftime("%Y-%m-%d")
+
+    historical = cache.ttl_for("core_stock_apis", {"start_date": "2024-01-01", "end_date": "2024-02-01"})
+    live = cache.ttl_for("core_stock_apis", {"start_date": "2024-01-01", "end_date": today})
+
+    assert historical > live
+
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path):
+    """测试并发的相同请求只调用一次数据源"""
+    cache = VendorResponseCache(str(tmp_path / "cache.sqlite"))
+    calls = []
+    release = threading.Event()
+
+    def slow_news(ticker, curr_date):
+        calls.append(ticker)
+        release.wait(5)
+        return f"news for {ticker}"
+
+    results = []
+
+    def worker():
+        results.append(cache.call("get_news", "news_data", "google", slow_news, ("AAPL", "2024-01-05"), {}))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == ["AAPL"]
+    assert results == ["news for AAPL"] * 4
+    assert cache.stats()["coalesced"] == 3
+
+
+def test_error_strings_are_not_cached_and_no_data_expires_quickly(tmp_path):
+    """测试数据源错误文本不缓存，“No data found” 类空结果只按短 TTL 缓存"""
+    cache = VendorResponseCache(str(tmp_path / "cache.sqlite"), negative_ttl=60)
+    answers = {
+        "AAPL": ["Error retrieving balance sheet for AAPL: timed out", "balance sheet"],
+        "ZZZZ": ["No balance sheet data found for symbol 'ZZZZ'"],
+    }
+    calls = []
+
+    def balance_sheet(ticker, freq, curr_date):
+        calls.append(ticker)
+        return answers[ticker][min(calls.count(ticker), len(answers[ticker])) - 1]
+
+    args = ("quarterly", "2024-01-02")
+    assert cache.call("get_balance_sheet", "fundamental_data", "yfinance", balance_sheet, ("AAPL",) + args, {}).startswith("Error")
+    assert cache.call("get_balance_sheet", "fundamental_data", "yfinance", balance_sheet, ("AAPL",) + args, {}) == "balance sheet"
+    assert calls == ["AAPL", "AAPL"]
+
+    cache.call("get_balance_sheet", "fundamental_data", "yfinance", balance_sheet, ("ZZZZ",) + args, {})
+    cache.call("get_balance_sheet", "fundamental_data", "yfinance", balance_sheet, ("ZZZZ",) + args, {})
+    assert calls.count("ZZZZ") == 1
+    created, expires = cache._conn.execute(
+        "SELECT created, expires FROM responses WHERE key LIKE '%ZZZZ%'"
+    ).fetchone()
+    assert expires - created == 60
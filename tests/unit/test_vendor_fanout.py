@@ -0,0 +1,148 @@
+"""
+测试数据源并发扇出
+验证多实现数据源与多数据源配置并发执行、按声明顺序合并结果、单实现超时、超时数据源只记一次健康度结果以及线程池占满时的排队取消
+"""
+
+import threading
+import time
+
+import pytest
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import interface, vendor_health
+from tradingagents.dataflows.vendor_health import VendorHealthRegistry
+
+
+@pytest.fixture
+def fanout_config(monkeypatch):
+    config = dataflow_config.get_config()
+    config.update(
+        {
+            "vendor_cache_enabled": False,
+            "vendor_routing_mode": "sequential",
+            "vendor_fanout_parallel": True,
+            "vendor_fanout_max_workers": 4,
+            "vendor_fanout_timeouts": {"get_news": 0.5},
+        }
+    )
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+    return config
+
+
+def _sleeper(label, delay):
+    def impl(ticker, start_date, end_date):
+        time.sleep(delay)
+        return label
+    impl.__name__ = f"impl_{label}"
+    return impl
+
+
+def _meeting(label, barrier, in_flight, lock):
+    """在屏障处等待其余实现的假实现，并记录同时进行的调用数"""
+    def impl(ticker, start_date, end_date):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass  # 串行执行时等不到其他实现，交给并发断言报错
+        finally:
+            with lock:
+                in_flight["now"] -= 1
+        return label
+    impl.__name__ = f"impl_{label}"
+    return impl
+
+
+def test_implementations_run_concurrently_in_stable_order(fanout_config, monkeypatch):
+    """测试同一数据源的多个实现并发运行，结果仍按声明顺序拼接"""
+    fanout_config["tool_vendors"] = {"get_news": "local"}
+    barrier = threading.Barrier(3, timeout=2)
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    monkeypatch.setitem(
+        interface.VENDOR_METHODS,
+        "get_news",
+        {"local": [_meeting(label, barrier, in_flight, lock) for label in ("finnhub", "reddit", "google")]},
+    )
+
+    result = interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-05")
+
+    assert in_flight["max"] == 3  # 三个实现同时进行
+    assert result == "finnhub\nreddit\ngoogle"
+
+
+def test_slow_implementation_times_out(fanout_config, monkeypatch):
+    """测试超过单实现超时的实现被放弃，其余结果照常返回"""
+    fanout_config["tool_vendors"] = {"get_news": "local"}
+    monkeypatch.setitem(
+        interface.VENDOR_METHODS,
+        "get_news",
+        {"local": [_sleeper("finnhub", 0.0), _sleeper("google", 2.0)]},
+    )
+
+    started = time.monotonic()
+    result = interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-05")
+
+    assert time.monotonic() - started < 1.5
+    assert result == "finnhub"
+
+
+def test_multi_vendor_config_merges_in_config_order(fanout_config, monkeypatch):
+    """测试逗号分隔的多数据源配置并发收集，按配置顺序合并"""
+    fanout_config["tool_vendors"] = {"get_news": "slow,fast"}
+    monkeypatch.setitem(
+        interface.VENDOR_METHODS,
+        "get_news",
+        {"slow": _sleeper("slow", 0.2), "fast": _sleeper("fast", 0.0)},
+    )
+
+    assert interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-05") == "slow\nfast"
+
+
+def test_timed_out_vendor_records_one_health_outcome(fanout_config, monkeypatch):
+    """测试多数据源扇出中超时的数据源只记一次失败，被放弃的线程稍后返回时不再记录成功"""
+    fanout_config["tool_vendors"] = {"get_news": "slow,fast"}
+    release = threading.Event()
+
+    def slow(ticker, start_date, end_date):
+        release.wait(5)
+        return "late"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_news", {"slow": slow, "fast": _sleeper("fast", 0.0)})
+
+    try:
+        assert interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-05") == "fast"
+    finally:
+        release.set()
+    time.sleep(0.3)  # 等被放弃的线程返回
+
+    state = vendor_health.get_vendor_health()["slow"]["get_news"]
+    assert (state["calls"], state["error_rate"]) == (1, 1.0)
+
+
+def test_saturated_pool_cancels_calls_that_never_start(fanout_config):
+    """测试被放弃的调用仍占着线程时，排队中的调用到期后被取消而不是无限等待"""
+    fanout_config["vendor_fanout_max_workers"] = 1
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append("hung")
+        release.wait(5)
+        return "late"
+
+    def queued():
+        calls.append("queued")
+        return "queued"
+
+    try:
+        outcomes = interface._fan_out([hung, queued], 0.2, "fanout-test")
+    finally:
+        release.set()
+
+    assert calls == ["hung"]
+    assert [ok for ok, _ in outcomes] == [False, False]
+    assert "never started" in str(outcomes[1][1])
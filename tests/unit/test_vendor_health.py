@@ -0,0 +1,131 @@
+"""
+测试数据源健康度跟踪与熔断器
+验证限流立即熔断、冷却后半开探测、路由跳过熔断中的数据源，以及参数错误和响应缓存命中不计入健康度
+"""
+
+import pytest
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import interface, vendor_cache, vendor_health
+from tradingagents.dataflows.alpha_vantage_common import AlphaVantageRateLimitError
+from tradingagents.dataflows.utils import VendorInputError
+from tradingagents.dataflows.vendor_cache import VendorResponseCache
+from tradingagents.dataflows.vendor_health import VendorHealthRegistry
+
+
+def test_breaker_opens_and_half_opens(monkeypatch):
+    """测试连续失败熔断，冷却结束后只放行一次探测，探测成功后恢复"""
+    clock = [1000.0]
+    monkeypatch.setattr(vendor_health.time, "monotonic", lambda: clock[0])
+    registry = VendorHealthRegistry(failure_threshold=2, cooldown=30.0)
+
+    registry.record_failure("alpha_vantage", "get_news", 0.5)
+    assert registry.allow("alpha_vantage", "get_news")
+    registry.record_failure("alpha_vantage", "get_news", 0.5)
+    assert not registry.allow("alpha_vantage", "get_news")
+
+    clock[0] += 31
+    assert registry.allow("alpha_vantage", "get_news")  # 半开探测
+    assert not registry.allow("alpha_vantage", "get_news")
+    registry.record_success("alpha_vantage", "get_news", 0.2)
+
+    state = registry.snapshot()["alpha_vantage"]["get_news"]
+    assert state["state"] == "closed"
+    assert state["error_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+
+def test_router_skips_rate_limited_vendor(monkeypatch):
+    """测试限流后下一次调用不再请求该数据源"""
+    config = dataflow_config.get_config()
+    config.update({"vendor_cache_enabled": False, "vendor_routing_mode": "sequential",
+                   "tool_vendors": {"get_news": "alpha_vantage"}})
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+
+    calls = []
+
+    def limited(ticker, start_date, end_date):
+        calls.append("alpha_vantage")
+        raise AlphaVantageRateLimitError("rate limit")
+
+    def fallback(ticker, start_date, end_date):
+        calls.append("google")
+        return "news"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_news", {"alpha_vantage": limited, "google": fallback})
+
+    assert interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-07") == "news"
+    assert interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-07") == "news"
+    assert calls == ["alpha_vantage", "google", "google"]
+    assert vendor_health.get_vendor_health()["alpha_vantage"]["get_news"]["state"] == "open"
+
+
+def test_input_errors_are_raised_without_hurting_health(monkeypatch):
+    """测试参数错误（VendorInputError）直接抛给调用方且不计入健康度，数据源返回内容解析失败的 ValueError 仍计入并回退"""
+    config = dataflow_config.get_config()
+    config.update({"vendor_cache_enabled": False, "vendor_routing_mode": "sequential",
+                   "tool_vendors": {"get_indicators": "alpha_vantage"}})
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry(failure_threshold=1))
+
+    calls = []
+
+    def bad_input(symbol, indicator, curr_date, look_back_days):
+        calls.append("alpha_vantage")
+        raise VendorInputError(f"Indicator {indicator} is not supported.")
+
+    def fallback(symbol, indicator, curr_date, look_back_days):
+        calls.append("yfinance")
+        return "values"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_indicators", {"alpha_vantage": bad_input, "yfinance": fallback})
+
+    with pytest.raises(VendorInputError):
+        interface.route_to_vendor("get_indicators", "AAPL", "nope", "2024-01-05", 5)
+    assert calls == ["alpha_vantage"]
+    state = vendor_health.get_vendor_health()["alpha_vantage"]["get_indicators"]
+    assert (state["state"], state["consecutive_failures"], state["error_rate"]) == ("closed", 0, 0.0)
+
+    def error_body(symbol, indicator, curr_date, look_back_days):
+        # 错误响应体（{"Error Message": ...}）被当成表格解析时抛出的普通 ValueError
+        calls.append("alpha_vantage")
+        raise ValueError("Price table has no date column: ['index', '{']")
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_indicators", {"alpha_vantage": error_body, "yfinance": fallback})
+    assert interface.route_to_vendor("get_indicators", "AAPL", "rsi", "2024-01-05", 5) == "values"
+    assert vendor_health.get_vendor_health()["alpha_vantage"]["get_indicators"]["state"] == "open"
+
+
+def test_cache_hits_do_not_feed_health(monkeypatch, tmp_path):
+    """测试响应缓存命中不计入健康度：不拉低延迟均值，也不能替半开探测关闭熔断器"""
+    config = dataflow_config.get_config()
+    config.update({"vendor_cache_enabled": True, "vendor_cache_skip_vendors": [],
+                   "vendor_routing_mode": "sequential", "tool_vendors": {"get_news": "google"}})
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_cache, "_cache", VendorResponseCache(str(tmp_path / "cache.sqlite")))
+    clock = [1000.0]
+    monkeypatch.setattr(vendor_health.time, "monotonic", lambda: clock[0])
+    registry = VendorHealthRegistry(failure_threshold=1, cooldown=30.0)
+    monkeypatch.setattr(vendor_health, "_registry", registry)
+
+    calls = []
+
+    def google(ticker, start_date, end_date):
+        calls.append("google")
+        return "news"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_news", {"google": google})
+
+    assert interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-07") == "news"
+    before = dict(registry.snapshot()["google"]["get_news"])
+    assert interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-07") == "news"
+    assert calls == ["google"]
+    assert registry.snapshot()["google"]["get_news"] == before
+
+    # 熔断后进入半开，探测请求被缓存应答：熔断器保持半开，探测名额释放给下一次真实请求
+    registry.record_failure("google", "get_news", 0.5)
+    clock[0] += 31
+    assert interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-07") == "news"
+    assert calls == ["google"]
+    assert registry.snapshot()["google"]["get_news"]["state"] == "half_open"
+    assert registry.allow("google", "get_news")
@@ -0,0 +1,71 @@
+"""
+测试数据源调用录制/回放
+验证录制模式写入压缩归档，回放模式不访问数据源且未录制的调用直接报错
+"""
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import config as dataflow_config
+from tradingagents.dataflows import interface, vendor_health, vendor_replay
+from tradingagents.dataflows.vendor_health import VendorHealthRegistry
+from tradingagents.dataflows.vendor_replay import VendorReplayMissError
+
+
+@pytest.fixture
+def replay_config(tmp_path, monkeypatch):
+    config = dataflow_config.get_config()
+    config.update(
+        {
+            "vendor_cache_enabled": False,
+            "vendor_replay_path": str(tmp_path / "recording.sqlite"),
+            "tool_vendors": {"get_stock_data": "fake", "get_price_frame": "fake"},
+        }
+    )
+    monkeypatch.setattr(dataflow_config, "_config", config)
+    monkeypatch.setattr(vendor_health, "_registry", VendorHealthRegistry())
+    monkeypatch.setattr(vendor_replay, "_recordings", {})
+    return config
+
+
+def test_record_then_replay_offline(replay_config, monkeypatch):
+    """测试录制后回放得到相同结果（含 DataFrame），且回放时不调用数据源"""
+    calls = []
+
+    def fake_text(symbol, start_date, end_date):
+        calls.append(symbol)
+        return f"prices for {symbol} {start_date}..{end_date}"
+
+    def fake_frame(symbol, start_date, end_date):
+        calls.append(symbol)
+        return pd.DataFrame({"date": pd.to_datetime([start_date]), "close": [1.5]})
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_stock_data", {"fake": fake_text})
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_price_frame", {"fake": fake_frame})
+
+    replay_config["vendor_replay_mode"] = "record"
+    text = interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-02", "2024-01-05")
+    frame = interface.route_to_vendor("get_price_frame", "AAPL", "2024-01-02", "2024-01-05")
+    assert len(calls) == 2
+
+    replay_config["vendor_replay_mode"] = "replay"
+    assert interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-02", "2024-01-05") == text
+    pd.testing.assert_frame_equal(
+        interface.route_to_vendor("get_price_frame", " AAPL ", "2024-01-02", "2024-01-05"), frame
+    )
+    assert len(calls) == 2
+
+    stats = vendor_replay.get_vendor_replay_stats()
+    assert stats["entries"] == 2 and stats["replayed"] == 2
+
+
+def test_replay_miss_fails_loudly(replay_config, monkeypatch):
+    """测试回放模式下未录制的调用抛出 VendorReplayMissError，不回退到真实数据源"""
+    def live(symbol, start_date, end_date):
+        raise AssertionError("replay mode must not call vendors")
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_stock_data", {"fake": live})
+    replay_config["vendor_replay_mode"] = "replay"
+
+    with pytest.raises(VendorReplayMissError, match="get_stock_data"):
+        interface.route_to_vendor("get_stock_data", "MSFT", "2024-01-02", "2024-01-05")
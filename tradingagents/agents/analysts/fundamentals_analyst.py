@@ -3,6 +3,7 @@ import time
 import json
 from tradingagents.agents.utils.agent_utils import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement, get_earning_call_transcripts, get_insider_sentiment, get_insider_transactions
 from tradingagents.dataflows.config import get_config
+from tradingagents.agents.utils.async_utils import llm_node
 
 
 def create_fundamentals_analyst(llm):
@@ -246,7 +247,11 @@ Write a detailed fundamental analysis report containing:
                     " will help where you left off. Execute what you can to make progress."
                     " If you or any other assistant has the FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** or deliverable,"
                     " prefix your response with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** so the team knows to stop."
-                    " You have access to the following tools: {tool_names}.\n{system_message}"
+                    " You have access to the following tools: {tool_names}.\n{system_message}",
+                ),
+                # 本次运行的日期与代码放在静态指令之后，保证系统提示前缀跨运行不变
+                (
+                    "system",
                     "For your reference, the current date is {current_date}. The company's stock symbol we want to look at is {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
@@ -260,7 +265,7 @@ Write a detailed fundamental analysis report containing:
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -272,4 +277,4 @@ Write a detailed fundamental analysis report containing:
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    return llm_node(fundamentals_analyst_node)
@@ -3,6 +3,7 @@ import time
 import json
 from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators
 from tradingagents.dataflows.config import get_config
+from tradingagents.agents.utils.async_utils import llm_node
 
 
 def create_market_analyst(llm):
@@ -26,7 +27,7 @@ Core Question: "Is this technical signal truly reliable in this market context?"
 
 ### Step 1: Data Collection
 - Call get_stock_data to retrieve historical price data
-- Call get_indicators to compute 8 key technical indicators
+- Call get_indicators ONCE with the full list of up to 8 selected indicators; it returns one aligned table
 
 ### Step 2: Technical Signal Analysis
 Your task is to select the most relevant indicators to diagnose market conditions. Choose up to 8 indicators that provide complementary, non-redundant insights.
@@ -166,7 +167,7 @@ Write a detailed and nuanced technical analysis report containing:
 - Briefly explain why indicators suit the given market context
 - Use exact indicator names as provided above
 - Ensure you call get_stock_data first to retrieve required data
-- Then use get_indicators with specific indicator names
+- Then call get_indicators a single time, passing all selected indicator names as a list (e.g. ["close_50_sma", "macd", "rsi"])
 
 **Remember: You are not a calculator; you are a thinker.**
 - Rules are guidelines, not laws
@@ -184,7 +185,11 @@ Write a detailed and nuanced technical analysis report containing:
                     " will help where you left off. Execute what you can to make progress."
                     " If you or any other assistant has the FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** or deliverable,"
                     " prefix your response with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** so the team knows to stop."
-                    " You have access to the following tools: {tool_names}.\n{system_message}"
+                    " You have access to the following tools: {tool_names}.\n{system_message}",
+                ),
+                # 本次运行的日期与代码放在静态指令之后，保证系统提示前缀跨运行不变
+                (
+                    "system",
                     "For your reference, the current date is {current_date}. The company's stock symbol ticker we want to look at is {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
@@ -198,7 +203,7 @@ Write a detailed and nuanced technical analysis report containing:
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -210,4 +215,4 @@ Write a detailed and nuanced technical analysis report containing:
             "market_report": report,
         }
 
-    return market_analyst_node
+    return llm_node(market_analyst_node)
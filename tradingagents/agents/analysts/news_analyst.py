@@ -3,6 +3,7 @@ import time
 import json
 from tradingagents.agents.utils.agent_utils import get_news, get_global_news
 from tradingagents.dataflows.config import get_config
+from tradingagents.agents.utils.async_utils import llm_node
 
 
 def create_news_analyst(llm):
@@ -211,7 +212,11 @@ Write a detailed news and sentiment analysis report containing:
                     " will help where you left off. Execute what you can to make progress."
                     " If you or any other assistant has the FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** or deliverable,"
                     " prefix your response with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** so the team knows to stop."
-                    " You have access to the following tools: {tool_names}.\n{system_message}"
+                    " You have access to the following tools: {tool_names}.\n{system_message}",
+                ),
+                # 本次运行的日期与代码放在静态指令之后，保证系统提示前缀跨运行不变
+                (
+                    "system",
                     "For your reference, the current date is {current_date}. We are looking at the company's symbol {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
@@ -224,7 +229,7 @@ Write a detailed news and sentiment analysis report containing:
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -236,4 +241,4 @@ Write a detailed news and sentiment analysis report containing:
             "news_report": report,
         }
 
-    return news_analyst_node
+    return llm_node(news_analyst_node)
@@ -3,6 +3,7 @@ import time
 import json
 from tradingagents.agents.utils.agent_utils import get_news
 from tradingagents.dataflows.config import get_config
+from tradingagents.agents.utils.async_utils import llm_node
 
 
 def create_social_media_analyst(llm):
@@ -17,7 +18,7 @@ def create_social_media_analyst(llm):
 
         system_message = (
             "You are a social media and company specific news researcher/analyst tasked with analyzing social media posts, recent company news, and public sentiment for a specific company over the past week. You will be given a company's name your objective is to write a comprehensive long report detailing your analysis, insights, and implications for traders and investors on this company's current state after looking at social media and what people are saying about that company, analyzing sentiment data of what people feel each day about the company, and looking at recent company news. Use the get_news(query, start_date, end_date) tool to search for company-specific news and social media discussions. Try to look at all sources possible from social media to sentiment to news. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."
-            + """ Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read.""",
+            + """ Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."""
         )
 
         prompt = ChatPromptTemplate.from_messages(
@@ -30,7 +31,11 @@ def create_social_media_analyst(llm):
                     " will help where you left off. Execute what you can to make progress."
                     " If you or any other assistant has the FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** or deliverable,"
                     " prefix your response with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** so the team knows to stop."
-                    " You have access to the following tools: {tool_names}.\n{system_message}"
+                    " You have access to the following tools: {tool_names}.\n{system_message}",
+                ),
+                # 本次运行的日期与代码放在静态指令之后，保证系统提示前缀跨运行不变
+                (
+                    "system",
                     "For your reference, the current date is {current_date}. The current company's stock symbol ticker we want to analyze is {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
@@ -45,7 +50,7 @@ def create_social_media_analyst(llm):
         chain = prompt | llm.bind_tools(tools)
 
         try:
-            result = chain.invoke(state["messages"])
+            result = yield chain, state["messages"]
         except Exception as e:
             print(f"Error invoking chain in social_media_analyst: {str(e)}")
             return {
@@ -63,4 +68,4 @@ def create_social_media_analyst(llm):
             "sentiment_report": report,
         }
 
-    return social_media_analyst_node
+    return llm_node(social_media_analyst_node)
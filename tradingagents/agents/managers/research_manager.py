@@ -1,8 +1,25 @@
 import time
 import json
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.agents.utils.debate_compaction import DebateHistoryCompactor
+from tradingagents.agents.utils.prompt_layout import layered_messages
 
 
-def create_research_manager(llm, memory):
+RESEARCH_MANAGER_INSTRUCTIONS = """As the portfolio manager and debate facilitator, your role is to critically evaluate this round of debate and make a definitive decision: align with the bear analyst, the bull analyst, or choose Hold only if it is strongly justified based on the arguments presented.
+
+Summarize the key points from both sides concisely, focusing on the most compelling evidence or reasoning. Your recommendation—Buy, Sell, or Hold—must be clear and actionable. Avoid defaulting to Hold simply because both sides have valid points; commit to a stance grounded in the debate's strongest arguments.
+
+Additionally, develop a detailed investment plan for the trader. This should include:
+
+Your Recommendation: A decisive stance supported by the most convincing arguments.
+Rationale: An explanation of why these arguments lead to your conclusion.
+Strategic Actions: Concrete steps for implementing the recommendation.
+Take into account your past mistakes on similar situations, provided after these instructions together with the debate history. Use these insights to refine your decision-making and ensure you are learning and improving. Present your analysis conversationally, as if speaking naturally, without special formatting."""
+
+
+def create_research_manager(llm, memory, compactor=None):
+    compactor = compactor or DebateHistoryCompactor()
+
     def research_manager_node(state) -> dict:
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
@@ -19,24 +36,20 @@ def create_research_manager(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""As the portfolio manager and debate facilitator, your role is to critically evaluate this round of debate and make a definitive decision: align with the bear analyst, the bull analyst, or choose Hold only if it is strongly justified based on the arguments presented.
-
-Summarize the key points from both sides concisely, focusing on the most compelling evidence or reasoning. Your recommendation—Buy, Sell, or Hold—must be clear and actionable. Avoid defaulting to Hold simply because both sides have valid points; commit to a stance grounded in the debate's strongest arguments.
-
-Additionally, develop a detailed investment plan for the trader. This should include:
-
-Your Recommendation: A decisive stance supported by the most convincing arguments.
-Rationale: An explanation of why these arguments lead to your conclusion.
-Strategic Actions: Concrete steps for implementing the recommendation.
-Take into account your past mistakes on similar situations. Use these insights to refine your decision-making and ensure you are learning and improving. Present your analysis conversationally, as if speaking naturally, without special formatting. 
-
-Here are your past reflections on mistakes:
-\"{past_memory_str}\"
+        # 开启压缩时，较早的发言折叠进摘要，只保留最近一轮原文
+        prompt_history, compaction = yield from compactor.history_for_prompt(
+            investment_debate_state, investment_debate_state.get("current_response", "")
+        )
 
-Here is the debate:
-Debate History:
-{history}"""
-        response = llm.invoke(prompt)
+        # 静态指令在前，本次运行的记忆与辩论历史在后，便于服务端复用前缀缓存
+        messages = layered_messages(
+            RESEARCH_MANAGER_INSTRUCTIONS,
+            [
+                ("Past Reflections on Mistakes", past_memory_str),
+                ("Debate History", prompt_history),
+            ],
+        )
+        response = yield llm, messages
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -45,6 +58,7 @@ Debate History:
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": response.content,
             "count": investment_debate_state["count"],
+            **compaction,
         }
 
         return {
@@ -52,4 +66,4 @@ Debate History:
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    return llm_node(research_manager_node)
@@ -1,15 +1,52 @@
 import json
 import re
 from datetime import datetime, timedelta
-from io import StringIO
 from typing import Any, Dict
 
-import pandas as pd
+from tradingagents.dataflows.market_data import get_price_frame
+from tradingagents.agents.utils.account import apply_trade
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.agents.utils.debate_compaction import DebateHistoryCompactor, latest_risk_turn
+from tradingagents.agents.utils.prompt_layout import layered_messages
 
-from tradingagents.dataflows.interface import route_to_vendor
 
+RISK_MANAGER_INSTRUCTIONS = """As the Risk Management Judge and Debate Facilitator, your goal is to evaluate the debate between three risk analysts—Risky, Neutral, and Safe/Conservative—and determine the best course of action for the trader. Your decision must result in a clear recommendation: Buy, Sell, or Hold. Choose Hold only if strongly justified by specific arguments, not as a fallback when all sides seem valid. Strive for clarity and decisiveness.
+
+The account snapshot, the trader's original plan, lessons from past mistakes and the analysts' debate history are provided after these instructions.
+
+Guidelines for Decision-Making:
+1. **Summarize Key Arguments**: Extract the strongest points from each analyst, focusing on relevance to the context.
+2. **Provide Rationale**: Support your recommendation with direct quotes and counterarguments from the debate.
+3. **Refine the Trader's Plan**: Start with the trader's original plan and adjust it based on the analysts' insights.
+4. **Learn from Past Mistakes**: Use the lessons from past mistakes to address prior misjudgments and improve the decision you are making now to make sure you don't make a wrong BUY/SELL/HOLD call that loses money.
+
+CRITICAL ACCOUNT VALIDATION RULES:
+- **For HOLD decisions**: quantity MUST be 0 (no shares should be traded when holding)
+- **For SELL decisions**: quantity CANNOT exceed the current holdings of the ticker shown in the account snapshot. If the current position is 0, you CANNOT choose SELL.
+- **For BUY decisions**: quantity must be feasible given the allocation budget in the account snapshot
+- Always check the account snapshot to ensure your recommendation is compatible with current positions
+
+Deliverables:
+- A clear and actionable recommendation: Buy, Sell, or Hold.
+- Detailed reasoning anchored in the debate and past reflections.
+- Ensure your final position sizing recommendation respects the account constraints in the snapshot.
+
+Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes.
+
+When you deliver the final answer, end with a JSON object inside a fenced code block (```json ... ```). The JSON must have the following keys:
+- `decision`: one of BUY, SELL, or HOLD (uppercase).
+- `quantity`: integer number of shares to trade that respects the account snapshot and trader plan.
+  * If decision is HOLD: set quantity to 0
+  * If decision is SELL: set quantity ≤ the max SELL quantity in the account snapshot (current position)
+  * If decision is BUY: set quantity ≤ the max BUY quantity in the account snapshot (max affordable)
+- `updated_plan`: concise summary (<200 tokens) of the revised trading plan.
+- `notes`: any additional execution considerations.
+"""
+
+
+def create_risk_manager(llm, memory, compactor=None):
+    compactor = compactor or DebateHistoryCompactor()
 
-def create_risk_manager(llm, memory):
     def risk_manager_node(state) -> dict:
 
         company_name = state["company_of_interest"]
@@ -63,19 +100,9 @@ def create_risk_manager(llm, memory):
             if trade_date_str:
                 trade_date = datetime.strptime(trade_date_str, "%Y-%m-%d").date()
                 start_date = (trade_date - timedelta(days=10)).isoformat()
-                price_data = route_to_vendor(
-                    "get_stock_data",
-                    company_name,
-                    start_date,
-                    trade_date_str,
-                )
-                if isinstance(price_data, (list, tuple)):
-                    price_data = price_data[0]
-                price_df = pd.read_csv(StringIO(price_data), comment="#")
-                price_df.columns = price_df.columns.str.strip().str.lower()
-                price_df = price_df.sort_values("date")
-                if not price_df.empty and "close" in price_df.columns:
-                    latest_price = _safe_float(price_df.iloc[-1]["close"], 0.0)
+                price_df = get_price_frame(company_name, start_date, trade_date_str)
+                if not price_df.empty:
+                    latest_price = _safe_float(price_df["close"].iloc[-1], 0.0)
         except Exception as e:
             # 获取失败时记录错误但继续
             latest_price = 0.0
@@ -111,52 +138,27 @@ def create_risk_manager(llm, memory):
             f"Allocation budget ({allocation_pct * 100:.1f}%): ${allocation_budget:,.2f}\n"
             f"Minimum cash reserve: ${min_cash_reserve:,.2f}\n"
             f"Latest close price: {'$' + format(latest_price, '.2f') if latest_price > 0 else 'Unavailable'}\n"
+            f"Max SELL quantity (current position): {current_position}\n"
+            f"Max BUY quantity (max affordable): {int(allocation_budget // latest_price) if latest_price > 0 else 0}\n"
         )
 
-        prompt = f"""As the Risk Management Judge and Debate Facilitator, your goal is to evaluate the debate between three risk analysts—Risky, Neutral, and Safe/Conservative—and determine the best course of action for the trader. Your decision must result in a clear recommendation: Buy, Sell, or Hold. Choose Hold only if strongly justified by specific arguments, not as a fallback when all sides seem valid. Strive for clarity and decisiveness.
-
-Guidelines for Decision-Making:
-1. **Summarize Key Arguments**: Extract the strongest points from each analyst, focusing on relevance to the context.
-2. **Provide Rationale**: Support your recommendation with direct quotes and counterarguments from the debate.
-3. **Refine the Trader's Plan**: Start with the trader's original plan, **{trader_plan}**, and adjust it based on the analysts' insights.
-4. **Learn from Past Mistakes**: Use lessons from **{past_memory_str}** to address prior misjudgments and improve the decision you are making now to make sure you don't make a wrong BUY/SELL/HOLD call that loses money.
-
-CRITICAL ACCOUNT VALIDATION RULES:
-- **For HOLD decisions**: quantity MUST be 0 (no shares should be traded when holding)
-- **For SELL decisions**: quantity CANNOT exceed current holdings ({current_position} shares). If current_position = 0, you CANNOT choose SELL.
-- **For BUY decisions**: quantity must be feasible given available cash (${allocation_budget:,.2f})
-- Always check account_snapshot below to ensure your recommendation is compatible with current positions
-
-Deliverables:
-- A clear and actionable recommendation: Buy, Sell, or Hold.
-- Detailed reasoning anchored in the debate and past reflections.
-- Ensure your final position sizing recommendation respects the account constraints below.
-
----
-
-**Account Snapshot (for position sizing):**
-{account_snapshot}
-
----
-
-**Analysts Debate History:**  
-{history}
-
----
-
-Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes.
+        # 开启压缩时，较早的发言折叠进摘要，只保留最近一轮原文
+        prompt_history, compaction = yield from compactor.history_for_prompt(
+            risk_debate_state, latest_risk_turn(risk_debate_state)
+        )
 
-When you deliver the final answer, end with a JSON object inside a fenced code block (```json ... ```). The JSON must have the following keys:
-- `decision`: one of BUY, SELL, or HOLD (uppercase).
-- `quantity`: integer number of shares to trade that respects the account snapshot and trader plan.
-  * If decision is HOLD: set quantity to 0
-  * If decision is SELL: set quantity ≤ {current_position} (current position)
-  * If decision is BUY: set quantity ≤ {int(allocation_budget // latest_price) if latest_price > 0 else 0} (max affordable)
-- `updated_plan`: concise summary (<200 tokens) of the revised trading plan.
-- `notes`: any additional execution considerations.
-"""
+        # 静态指令在前，本次运行的账户、计划、记忆与辩论历史在后，便于服务端复用前缀缓存
+        messages = layered_messages(
+            RISK_MANAGER_INSTRUCTIONS,
+            [
+                ("Account Snapshot (for position sizing)", account_snapshot),
+                ("Trader's Original Plan", trader_plan),
+                ("Lessons From Past Mistakes", past_memory_str),
+                ("Analysts Debate History", prompt_history),
+            ],
+        )
 
-        response = llm.invoke(prompt)
+        response = yield llm, messages
 
         response_text = response.content if hasattr(response, "content") else str(response)
 
@@ -288,53 +290,13 @@ When you deliver the final answer, end with a JSON object inside a fenced code b
             "count": risk_debate_state["count"],
             "recommended_quantity": final_quantity,
             "reference_price": latest_price,
+            **compaction,
         }
 
         # 更新账户状态：模拟交易执行，更新现金和持仓
-        updated_positions = dict(positions)  # 深拷贝持仓字典
-        updated_cash = cash_balance
-        
-        if action == "BUY" and final_quantity > 0 and latest_price > 0:
-            # 买入：扣除现金，增加持仓
-            trade_cost = final_quantity * latest_price
-            updated_cash -= trade_cost
-            
-            if company_name in updated_positions:
-                # 已有持仓：更新平均成本
-                old_shares = updated_positions[company_name].get("shares", 0)
-                old_cost = updated_positions[company_name].get("avg_cost", 0.0)
-                new_shares = old_shares + final_quantity
-                new_avg_cost = ((old_shares * old_cost) + trade_cost) / new_shares if new_shares > 0 else latest_price
-                updated_positions[company_name] = {
-                    "shares": new_shares,
-                    "avg_cost": round(new_avg_cost, 2)
-                }
-            else:
-                # 新建持仓
-                updated_positions[company_name] = {
-                    "shares": final_quantity,
-                    "avg_cost": round(latest_price, 2)
-                }
-        
-        elif action == "SELL" and final_quantity > 0 and latest_price > 0:
-            # 卖出：增加现金，减少持仓
-            trade_proceeds = final_quantity * latest_price
-            updated_cash += trade_proceeds
-            
-            if company_name in updated_positions:
-                old_shares = updated_positions[company_name].get("shares", 0)
-                new_shares = max(old_shares - final_quantity, 0)
-                
-                if new_shares > 0:
-                    # 部分卖出：保留持仓
-                    updated_positions[company_name]["shares"] = new_shares
-                else:
-                    # 全部卖出：删除持仓
-                    del updated_positions[company_name]
-        
-        # 更新账户状态
-        updated_account_state["cash_balance"] = round(updated_cash, 2)
-        updated_account_state["positions"] = updated_positions
+        updated_account_state = apply_trade(
+            updated_account_state, company_name, action, final_quantity, latest_price
+        )
 
         return {
             "risk_debate_state": new_risk_debate_state,
@@ -344,4 +306,4 @@ When you deliver the final answer, end with a JSON object inside a fenced code b
             "processed_trade_decision": action,
         }
 
-    return risk_manager_node
+    return llm_node(risk_manager_node)
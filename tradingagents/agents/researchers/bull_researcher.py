@@ -2,28 +2,12 @@ from langchain_core.messages import AIMessage
 import time
 import json
 from tradingagents.agents.utils.debate_separator import DEBATE_RESPONSE_SEPARATOR
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.agents.utils.debate_compaction import DebateHistoryCompactor
+from tradingagents.agents.utils.prompt_layout import layered_messages
 
 
-def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
-        investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
-        bull_history = investment_debate_state.get("bull_history", "")
-
-        current_response = investment_debate_state.get("current_response", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
-
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
-
-        prompt = f"""🎯 YOUR ROLE: Bull Analyst (Optimistic Case Builder)
+BULL_INSTRUCTIONS = """🎯 YOUR ROLE: Bull Analyst (Optimistic Case Builder)
 You are responsible for evaluating MODEL 5: Assumption Chain Strength
 
 Your task: Build a strong, evidence-based BULLISH case emphasizing growth potential, competitive advantages, and positive indicators. Engage directly with the bear argument using data-backed counterarguments.
@@ -168,7 +152,48 @@ Provide comprehensive bull argument containing:
 - Include assumption breakdown so readers can judge themselves
 - Certainty is clarity, not confidence"""
 
-        response = llm.invoke(prompt)
+
+def create_bull_researcher(llm, memory, compactor=None):
+    compactor = compactor or DebateHistoryCompactor()
+
+    def bull_node(state) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bull_history = investment_debate_state.get("bull_history", "")
+
+        current_response = investment_debate_state.get("current_response", "")
+        market_research_report = state["market_report"]
+        sentiment_report = state["sentiment_report"]
+        news_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
+
+        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+        past_memories = memory.get_memories(curr_situation, n_matches=2)
+
+        past_memory_str = ""
+        for i, rec in enumerate(past_memories, 1):
+            past_memory_str += rec["recommendation"] + "\n\n"
+
+        # 开启压缩时，较早的发言折叠进摘要，只保留最近一轮原文
+        prompt_history, compaction = yield from compactor.history_for_prompt(
+            investment_debate_state, current_response
+        )
+
+        # 静态指令在前，本次运行的报告、记忆与辩论内容在后，便于服务端复用前缀缓存
+        messages = layered_messages(
+            BULL_INSTRUCTIONS,
+            [
+                ("Market Research Report", market_research_report),
+                ("Social Media Sentiment Report", sentiment_report),
+                ("Latest World Affairs News", news_report),
+                ("Company Fundamentals Report", fundamentals_report),
+                ("Reflections From Similar Past Situations", past_memory_str),
+                ("Debate History", prompt_history),
+                ("Last Bear Argument", current_response),
+            ],
+        )
+
+        response = yield llm, messages
 
         argument = f"Bull Analyst: {response.content}"
 
@@ -178,8 +203,9 @@ Provide comprehensive bull argument containing:
             "bear_history": investment_debate_state.get("bear_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            **compaction,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    return llm_node(bull_node)
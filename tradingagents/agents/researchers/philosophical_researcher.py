@@ -20,6 +20,7 @@ from tradingagents.agents.utils.researcher_worldview import (
     WorldviewReflector,
 )
 from tradingagents.agents.utils.debate_separator import DEBATE_RESPONSE_SEPARATOR
+from tradingagents.agents.utils.debate_compaction import carry_compaction
 
 
 class PhilosophicalResearcher:
@@ -156,6 +157,8 @@ class PhilosophicalResearcher:
             f"{'bear' if self.role == 'bull' else 'bull'}_history": investment_debate_state.get(f"{'bear' if self.role == 'bull' else 'bull'}_history", ""),
             "current_response": formatted_argument,
             "count": investment_debate_state["count"] + 1,
+            # 本节点不压缩自己的提示词，但要把压缩状态传给后续节点
+            **carry_compaction(investment_debate_state),
         }
         
         # === Step 8: Save decision log ===
@@ -1,8 +1,20 @@
 import time
 import json
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.agents.utils.debate_compaction import DebateHistoryCompactor, latest_risk_turn
+from tradingagents.agents.utils.prompt_layout import layered_messages
 
 
-def create_risky_debator(llm):
+RISKY_INSTRUCTIONS = """As the Risky Risk Analyst, your role is to actively champion high-reward, high-risk opportunities, emphasizing bold strategies and competitive advantages. When evaluating the trader's decision or plan, focus intently on the potential upside, growth potential, and innovative benefits—even when these come with elevated risk. Use the provided market data and sentiment analysis to strengthen your arguments and challenge the opposing views. Specifically, respond directly to each point made by the conservative and neutral analysts, countering with data-driven rebuttals and persuasive reasoning. Highlight where their caution might miss critical opportunities or where their assumptions may be overly conservative.
+
+Your task is to create a compelling case for the trader's decision by questioning and critiquing the conservative and neutral stances to demonstrate why your high-reward perspective offers the best path forward. The trader's decision, the market research, social media sentiment, world affairs and company fundamentals reports, the conversation history and the last arguments from the conservative and neutral analysts are provided after these instructions; incorporate insights from them into your arguments. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+
+Engage actively by addressing any specific concerns raised, refuting the weaknesses in their logic, and asserting the benefits of risk-taking to outpace market norms. Maintain a focus on debating and persuading, not just presenting data. Challenge each counterpoint to underscore why a high-risk approach is optimal. Output conversationally as if you are speaking without any special formatting."""
+
+
+def create_risky_debator(llm, compactor=None):
+    compactor = compactor or DebateHistoryCompactor()
+
     def risky_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -18,21 +30,27 @@ def create_risky_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""As the Risky Risk Analyst, your role is to actively champion high-reward, high-risk opportunities, emphasizing bold strategies and competitive advantages. When evaluating the trader's decision or plan, focus intently on the potential upside, growth potential, and innovative benefits—even when these come with elevated risk. Use the provided market data and sentiment analysis to strengthen your arguments and challenge the opposing views. Specifically, respond directly to each point made by the conservative and neutral analysts, countering with data-driven rebuttals and persuasive reasoning. Highlight where their caution might miss critical opportunities or where their assumptions may be overly conservative. Here is the trader's decision:
-
-{trader_decision}
-
-Your task is to create a compelling case for the trader's decision by questioning and critiquing the conservative and neutral stances to demonstrate why your high-reward perspective offers the best path forward. Incorporate insights from the following sources into your arguments:
+        # 开启压缩时，较早的发言折叠进摘要，只保留最近一轮原文
+        prompt_history, compaction = yield from compactor.history_for_prompt(
+            risk_debate_state, latest_risk_turn(risk_debate_state)
+        )
 
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here are the last arguments from the conservative analyst: {current_safe_response} Here are the last arguments from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
-
-Engage actively by addressing any specific concerns raised, refuting the weaknesses in their logic, and asserting the benefits of risk-taking to outpace market norms. Maintain a focus on debating and persuading, not just presenting data. Challenge each counterpoint to underscore why a high-risk approach is optimal. Output conversationally as if you are speaking without any special formatting."""
+        # 静态指令在前，本次运行的交易计划、报告与辩论内容在后，便于服务端复用前缀缓存
+        messages = layered_messages(
+            RISKY_INSTRUCTIONS,
+            [
+                ("Market Research Report", market_research_report),
+                ("Social Media Sentiment Report", sentiment_report),
+                ("Latest World Affairs Report", news_report),
+                ("Company Fundamentals Report", fundamentals_report),
+                ("Trader's Decision", trader_decision),
+                ("Conversation History", prompt_history),
+                ("Last Conservative Analyst Argument", current_safe_response),
+                ("Last Neutral Analyst Argument", current_neutral_response),
+            ],
+        )
 
-        response = llm.invoke(prompt)
+        response = yield llm, messages
 
         argument = f"Risky Analyst: {response.content}"
 
@@ -48,8 +66,9 @@ Engage actively by addressing any specific concerns raised, refuting the weaknes
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **compaction,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    return llm_node(risky_node)
@@ -1,9 +1,21 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.agents.utils.debate_compaction import DebateHistoryCompactor, latest_risk_turn
+from tradingagents.agents.utils.prompt_layout import layered_messages
 
 
-def create_safe_debator(llm):
+SAFE_INSTRUCTIONS = """As the Safe/Conservative Risk Analyst, your primary objective is to protect assets, minimize volatility, and ensure steady, reliable growth. You prioritize stability, security, and risk mitigation, carefully assessing potential losses, economic downturns, and market volatility. When evaluating the trader's decision or plan, critically examine high-risk elements, pointing out where the decision may expose the firm to undue risk and where more cautious alternatives could secure long-term gains.
+
+Your task is to actively counter the arguments of the Risky and Neutral Analysts, highlighting where their views may overlook potential threats or fail to prioritize sustainability. Respond directly to their points. The trader's decision, the market research, social media sentiment, world affairs and company fundamentals reports, the conversation history and the last responses from the risky and neutral analysts are provided after these instructions; draw from them to build a convincing case for a low-risk approach adjustment to the trader's decision. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+
+Engage by questioning their optimism and emphasizing the potential downsides they may have overlooked. Address each of their counterpoints to showcase why a conservative stance is ultimately the safest path for the firm's assets. Focus on debating and critiquing their arguments to demonstrate the strength of a low-risk strategy over their approaches. Output conversationally as if you are speaking without any special formatting."""
+
+
+def create_safe_debator(llm, compactor=None):
+    compactor = compactor or DebateHistoryCompactor()
+
     def safe_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -19,21 +31,27 @@ def create_safe_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""As the Safe/Conservative Risk Analyst, your primary objective is to protect assets, minimize volatility, and ensure steady, reliable growth. You prioritize stability, security, and risk mitigation, carefully assessing potential losses, economic downturns, and market volatility. When evaluating the trader's decision or plan, critically examine high-risk elements, pointing out where the decision may expose the firm to undue risk and where more cautious alternatives could secure long-term gains. Here is the trader's decision:
-
-{trader_decision}
-
-Your task is to actively counter the arguments of the Risky and Neutral Analysts, highlighting where their views may overlook potential threats or fail to prioritize sustainability. Respond directly to their points, drawing from the following data sources to build a convincing case for a low-risk approach adjustment to the trader's decision:
+        # 开启压缩时，较早的发言折叠进摘要，只保留最近一轮原文
+        prompt_history, compaction = yield from compactor.history_for_prompt(
+            risk_debate_state, latest_risk_turn(risk_debate_state)
+        )
 
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
-
-Engage by questioning their optimism and emphasizing the potential downsides they may have overlooked. Address each of their counterpoints to showcase why a conservative stance is ultimately the safest path for the firm's assets. Focus on debating and critiquing their arguments to demonstrate the strength of a low-risk strategy over their approaches. Output conversationally as if you are speaking without any special formatting."""
+        # 静态指令在前，本次运行的交易计划、报告与辩论内容在后，便于服务端复用前缀缓存
+        messages = layered_messages(
+            SAFE_INSTRUCTIONS,
+            [
+                ("Market Research Report", market_research_report),
+                ("Social Media Sentiment Report", sentiment_report),
+                ("Latest World Affairs Report", news_report),
+                ("Company Fundamentals Report", fundamentals_report),
+                ("Trader's Decision", trader_decision),
+                ("Conversation History", prompt_history),
+                ("Last Risky Analyst Response", current_risky_response),
+                ("Last Neutral Analyst Response", current_neutral_response),
+            ],
+        )
 
-        response = llm.invoke(prompt)
+        response = yield llm, messages
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -51,8 +69,9 @@ Engage by questioning their optimism and emphasizing the potential downsides the
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **compaction,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    return llm_node(safe_node)
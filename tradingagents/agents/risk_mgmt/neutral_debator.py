@@ -1,8 +1,20 @@
 import time
 import json
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.agents.utils.debate_compaction import DebateHistoryCompactor, latest_risk_turn
+from tradingagents.agents.utils.prompt_layout import layered_messages
 
 
-def create_neutral_debator(llm):
+NEUTRAL_INSTRUCTIONS = """As the Neutral Risk Analyst, your role is to provide a balanced perspective, weighing both the potential benefits and risks of the trader's decision or plan. You prioritize a well-rounded approach, evaluating the upsides and downsides while factoring in broader market trends, potential economic shifts, and diversification strategies.
+
+Your task is to challenge both the Risky and Safe Analysts, pointing out where each perspective may be overly optimistic or overly cautious. The trader's decision, the market research, social media sentiment, world affairs and company fundamentals reports, the conversation history and the last responses from the risky and safe analysts are provided after these instructions; use insights from them to support a moderate, sustainable strategy to adjust the trader's decision. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+
+Engage actively by analyzing both sides critically, addressing weaknesses in the risky and conservative arguments to advocate for a more balanced approach. Challenge each of their points to illustrate why a moderate risk strategy might offer the best of both worlds, providing growth potential while safeguarding against extreme volatility. Focus on debating rather than simply presenting data, aiming to show that a balanced view can lead to the most reliable outcomes. Output conversationally as if you are speaking without any special formatting."""
+
+
+def create_neutral_debator(llm, compactor=None):
+    compactor = compactor or DebateHistoryCompactor()
+
     def neutral_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -18,21 +30,27 @@ def create_neutral_debator(llm):
 
         trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""As the Neutral Risk Analyst, your role is to provide a balanced perspective, weighing both the potential benefits and risks of the trader's decision or plan. You prioritize a well-rounded approach, evaluating the upsides and downsides while factoring in broader market trends, potential economic shifts, and diversification strategies.Here is the trader's decision:
-
-{trader_decision}
-
-Your task is to challenge both the Risky and Safe Analysts, pointing out where each perspective may be overly optimistic or overly cautious. Use insights from the following data sources to support a moderate, sustainable strategy to adjust the trader's decision:
+        # 开启压缩时，较早的发言折叠进摘要，只保留最近一轮原文
+        prompt_history, compaction = yield from compactor.history_for_prompt(
+            risk_debate_state, latest_risk_turn(risk_debate_state)
+        )
 
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the safe analyst: {current_safe_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
-
-Engage actively by analyzing both sides critically, addressing weaknesses in the risky and conservative arguments to advocate for a more balanced approach. Challenge each of their points to illustrate why a moderate risk strategy might offer the best of both worlds, providing growth potential while safeguarding against extreme volatility. Focus on debating rather than simply presenting data, aiming to show that a balanced view can lead to the most reliable outcomes. Output conversationally as if you are speaking without any special formatting."""
+        # 静态指令在前，本次运行的交易计划、报告与辩论内容在后，便于服务端复用前缀缓存
+        messages = layered_messages(
+            NEUTRAL_INSTRUCTIONS,
+            [
+                ("Market Research Report", market_research_report),
+                ("Social Media Sentiment Report", sentiment_report),
+                ("Latest World Affairs Report", news_report),
+                ("Company Fundamentals Report", fundamentals_report),
+                ("Trader's Decision", trader_decision),
+                ("Conversation History", prompt_history),
+                ("Last Risky Analyst Response", current_risky_response),
+                ("Last Safe Analyst Response", current_safe_response),
+            ],
+        )
 
-        response = llm.invoke(prompt)
+        response = yield llm, messages
 
         argument = f"Neutral Analyst: {response.content}"
 
@@ -48,8 +66,9 @@ Engage actively by analyzing both sides critically, addressing weaknesses in the
             "current_safe_response": risk_debate_state.get("current_safe_response", ""),
             "current_neutral_response": argument,
             "count": risk_debate_state["count"] + 1,
+            **compaction,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    return llm_node(neutral_node)
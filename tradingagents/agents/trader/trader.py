@@ -1,6 +1,13 @@
 import functools
 import time
 import json
+from tradingagents.agents.utils.async_utils import llm_node
+from tradingagents.agents.utils.prompt_layout import layered_messages
+
+
+TRADER_INSTRUCTIONS = """You are a trading agent analyzing market data to make investment decisions. Based on your analysis, provide a specific recommendation to buy, sell, or hold. End with a firm decision and always conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation. Do not forget to utilize lessons from past decisions to learn from your mistakes.
+
+After these instructions you will find reflections from similar situations you traded in and the lessons learned, followed by an investment plan that a team of analysts tailored for the company from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision, and leverage these insights to make an informed and strategic decision."""
 
 
 def create_trader(llm, memory):
@@ -22,20 +29,16 @@ def create_trader(llm, memory):
         else:
             past_memory_str = "No past memories found."
 
-        context = {
-            "role": "user",
-            "content": f"Based on a comprehensive analysis by a team of analysts, here is an investment plan tailored for {company_name}. This plan incorporates insights from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision.\n\nProposed Investment Plan: {investment_plan}\n\nLeverage these insights to make an informed and strategic decision.",
-        }
-
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are a trading agent analyzing market data to make investment decisions. Based on your analysis, provide a specific recommendation to buy, sell, or hold. End with a firm decision and always conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation. Do not forget to utilize lessons from past decisions to learn from your mistakes. Here is some reflections from similar situatiosn you traded in and the lessons learned: {past_memory_str}""",
-            },
-            context,
-        ]
+        # 静态指令在前，本次运行的记忆与投资计划在后，便于服务端复用前缀缓存
+        messages = layered_messages(
+            TRADER_INSTRUCTIONS,
+            [
+                ("Reflections From Similar Past Situations", past_memory_str),
+                (f"Proposed Investment Plan for {company_name}", investment_plan),
+            ],
+        )
 
-        result = llm.invoke(messages)
+        result = yield llm, messages
 
         return {
             "messages": [result],
@@ -43,4 +46,4 @@ def create_trader(llm, memory):
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    return llm_node(functools.partial(trader_node, name="Trader"))
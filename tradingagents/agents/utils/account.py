@@ -0,0 +1,63 @@
+from typing import Any, Dict
+
+
+def apply_trade(
+    account_state: Dict[str, Any],
+    ticker: str,
+    action: str,
+    quantity: int,
+    price: float,
+) -> Dict[str, Any]:
+    """按成交价模拟执行一笔交易，返回更新后的账户状态（不修改传入的账户）。
+
+    BUY 扣减现金并按加权平均更新持仓成本；SELL 增加现金并减少持仓，清仓时删除该持仓；
+    HOLD、数量或价格非正时账户只做规范化拷贝。
+    """
+    positions = account_state.get("positions", {})
+    if not isinstance(positions, dict):
+        positions = {}
+    updated_positions = {name: dict(pos) for name, pos in positions.items()}
+    try:
+        updated_cash = float(account_state.get("cash_balance"))
+    except (TypeError, ValueError):
+        updated_cash = 0.0
+
+    if action == "BUY" and quantity > 0 and price > 0:
+        # 买入：扣除现金，增加持仓
+        trade_cost = quantity * price
+        updated_cash -= trade_cost
+
+        if ticker in updated_positions:
+            # 已有持仓：更新平均成本
+            old_shares = updated_positions[ticker].get("shares", 0)
+            old_cost = updated_positions[ticker].get("avg_cost", 0.0)
+            new_shares = old_shares + quantity
+            new_avg_cost = ((old_shares * old_cost) + trade_cost) / new_shares if new_shares > 0 else price
+            updated_positions[ticker] = {
+                "shares": new_shares,
+                "avg_cost": round(new_avg_cost, 2)
+            }
+        else:
+            # 新建持仓
+            updated_positions[ticker] = {
+                "shares": quantity,
+                "avg_cost": round(price, 2)
+            }
+
+    elif action == "SELL" and quantity > 0 and price > 0:
+        # 卖出：增加现金，减少持仓
+        updated_cash += quantity * price
+
+        if ticker in updated_positions:
+            new_shares = max(updated_positions[ticker].get("shares", 0) - quantity, 0)
+            if new_shares > 0:
+                # 部分卖出：保留持仓
+                updated_positions[ticker]["shares"] = new_shares
+            else:
+                # 全部卖出：删除持仓
+                del updated_positions[ticker]
+
+    updated_account_state = dict(account_state)
+    updated_account_state["cash_balance"] = round(updated_cash, 2)
+    updated_account_state["positions"] = updated_positions
+    return updated_account_state
@@ -19,6 +19,11 @@ class InvestDebateState(TypedDict):
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    # 辩论历史压缩（debate_history_compaction）状态
+    history_summary: Annotated[str, "Rolling summary of turns folded out of prompts"]
+    summarized_chars: Annotated[int, "Length of the history prefix covered by the summary"]
+    compaction_tokens_saved: Annotated[int, "Estimated prompt tokens saved by compaction"]
+    compaction_tokens_spent: Annotated[int, "Tokens spent on summarization calls"]
 
 
 # Risk management team state
@@ -47,6 +52,11 @@ class RiskDebateState(TypedDict):
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
     recommended_quantity: Annotated[int, "Quantity the judge recommends trading"]
     reference_price: Annotated[float, "Reference price used for position sizing"]
+    # 辩论历史压缩（debate_history_compaction）状态
+    history_summary: Annotated[str, "Rolling summary of turns folded out of prompts"]
+    summarized_chars: Annotated[int, "Length of the history prefix covered by the summary"]
+    compaction_tokens_saved: Annotated[int, "Estimated prompt tokens saved by compaction"]
+    compaction_tokens_spent: Annotated[int, "Tokens spent on summarization calls"]
 
 
 class AccountState(TypedDict, total=False):
@@ -0,0 +1,67 @@
+import asyncio
+
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.dataflows.interface import arun_vendor_io
+
+
+def _advance(steps, response=None, error=None):
+    """推进一步节点逻辑；返回 (是否结束, 下一次模型请求 或 节点输出)"""
+    try:
+        if error is not None:
+            request = steps.throw(error)
+        else:
+            request = steps.send(response)
+    except StopIteration as done:
+        return True, done.value
+    return False, request
+
+
+def llm_node(step):
+    """把生成器形式的节点包装成同时支持 invoke 与 ainvoke 的 LangGraph 节点。
+
+    ``step(state)`` 在需要调用模型时 ``yield (runnable, input)``，拿到响应后继续执行，
+    最后 ``return`` 节点的状态更新；模型异常会抛回生成器，节点内的 try/except 照常生效。
+    同步图中用 ``runnable.invoke``；异步图中用 ``await runnable.ainvoke``，
+    两次模型调用之间的阻塞逻辑（记忆检索、取价等）放到线程中执行，不阻塞事件循环。
+    """
+
+    def node(state):
+        steps = step(state)
+        finished, value = _advance(steps)
+        while not finished:
+            runnable, payload = value
+            try:
+                response = runnable.invoke(payload)
+            except Exception as e:
+                finished, value = _advance(steps, error=e)
+                continue
+            finished, value = _advance(steps, response)
+        return value
+
+    async def anode(state):
+        steps = step(state)
+        finished, value = await asyncio.to_thread(_advance, steps)
+        while not finished:
+            runnable, payload = value
+            try:
+                response = await runnable.ainvoke(payload)
+            except Exception as e:
+                finished, value = await asyncio.to_thread(_advance, steps, None, e)
+                continue
+            finished, value = await asyncio.to_thread(_advance, steps, response)
+        return value
+
+    name = getattr(step, "__name__", None) or getattr(getattr(step, "func", None), "__name__", "llm_node")
+    return RunnableLambda(node, afunc=anode, name=name)
+
+
+def async_vendor_tool(vendor_tool):
+    """为数据工具补上异步实现：在共享的有界数据源线程池中执行原同步函数"""
+    func = vendor_tool.func
+
+    async def coroutine(*args, **kwargs):
+        return await arun_vendor_io(func, *args, **kwargs)
+
+    vendor_tool.coroutine = coroutine
+    return vendor_tool
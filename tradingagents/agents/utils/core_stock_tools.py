@@ -1,13 +1,16 @@
 from langchain_core.tools import tool
+from tradingagents.agents.utils.async_utils import async_vendor_tool
+from datetime import datetime, timedelta
 from typing import Annotated
-from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.market_data import get_price_frame, format_price_frame
 
 
+@async_vendor_tool
 @tool
 def get_stock_data(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
-    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format, inclusive"],
 ) -> str:
     """
     Retrieve stock price data (OHLCV) for a given ticker symbol.
@@ -15,8 +18,11 @@ def get_stock_data(
     Args:
         symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
         start_date (str): Start date in yyyy-mm-dd format
-        end_date (str): End date in yyyy-mm-dd format
+        end_date (str): End date in yyyy-mm-dd format; the bar of end_date itself is included
     Returns:
         str: A formatted dataframe containing the stock price data for the specified ticker symbol in the specified date range.
     """
-    return route_to_vendor("get_stock_data", symbol, start_date, end_date)
+    # get_price_frame treats its end as exclusive; the tool's end_date is inclusive
+    exclusive_end = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    frame = get_price_frame(symbol, start_date, exclusive_end)
+    return format_price_frame(frame, symbol, start_date, end_date)
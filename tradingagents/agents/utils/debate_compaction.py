@@ -0,0 +1,136 @@
+"""
+辩论历史滚动压缩
+完整的辩论历史（history）每轮都会整体贴进后续发言者与裁判的提示词，提示词长度随轮数增长。
+开启压缩后，提示词中只保留最近一轮原文，更早的发言折叠进一份增量维护的摘要，
+并以每个提示词的辩论历史 token 预算决定何时折叠；state 中的 history 原文保持不变，供报告与反思使用
+"""
+
+from typing import Any, Dict, Generator, Optional, Tuple
+
+from tradingagents.agents.utils.prompt_layout import layered_messages
+
+# 粗略的字符/token 换算，仅用于预算判断与节省量估算
+CHARS_PER_TOKEN = 4
+
+# 压缩状态随辩论状态一起传递；所有返回新辩论状态的节点都要带上这些字段
+COMPACTION_DEFAULTS = {
+    "history_summary": "",
+    "summarized_chars": 0,
+    "compaction_tokens_saved": 0,
+    "compaction_tokens_spent": 0,
+}
+
+SUMMARIZER_INSTRUCTIONS = """You maintain a running summary of a multi-party investment debate so that later speakers do not need to read the whole transcript.
+
+You will receive the current summary (possibly empty) and the debate turns that happened since it was written. Produce an updated summary that replaces the current one:
+- Keep every speaker's core position, the concrete numbers, probabilities, price levels and data points they relied on, and the specific objections they raised.
+- Keep track of which arguments were rebutted and which remain unanswered.
+- Attribute each point to its speaker (e.g. Bull Analyst, Bear Analyst, Risky Analyst, Safe Analyst, Neutral Analyst).
+- Do not add opinions, conclusions or information that is not in the debate.
+- Stay within the word limit given with the input. Output only the summary text."""
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """按字符数估算 token 数"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def carry_compaction(debate_state: Dict[str, Any]) -> Dict[str, Any]:
+    """取出辩论状态中的压缩字段（缺失时取默认值），用于拼进节点返回的新辩论状态"""
+    return {field: debate_state.get(field, default) for field, default in COMPACTION_DEFAULTS.items()}
+
+
+def _render(summary: str, pending: str, last_turn: str) -> str:
+    parts = [f"[Summary of earlier turns]\n{summary.strip()}"]
+    if pending.strip():
+        parts.append(f"[Later turns]\n{pending.strip()}")
+    if last_turn.strip():
+        parts.append(f"[Most recent turn, verbatim]\n{last_turn.strip()}")
+    return "\n\n".join(parts)
+
+
+class DebateHistoryCompactor:
+    """按 token 预算为提示词提供（可能经过压缩的）辩论历史。
+
+    ``token_budget`` 为 None 时不压缩，直接返回完整历史；否则完整历史超出预算时，
+    把最近一轮之前尚未折叠的发言交给 ``llm`` 并入摘要（摘要只增量更新，不重读已折叠的部分），
+    已有摘要加上新发言仍在预算内时不再调用模型。
+    """
+
+    def __init__(self, llm=None, token_budget: Optional[int] = None):
+        self.llm = llm
+        self.token_budget = token_budget if llm is not None else None
+
+    def history_for_prompt(
+        self, debate_state: Dict[str, Any], last_turn: str = ""
+    ) -> Generator[Any, Any, Tuple[str, Dict[str, Any]]]:
+        """生成器：需要更新摘要时 ``yield (llm, messages)``（配合 ``llm_node``，节点内用 ``yield from``）。
+
+        ``last_turn`` 为历史末尾的最近一轮发言，始终原文保留。
+
+        Returns:
+            (写入提示词的历史文本, 需要并入新辩论状态的压缩字段)
+        """
+        compaction = carry_compaction(debate_state)
+        history = debate_state.get("history", "") or ""
+        if self.token_budget is None or estimate_tokens(history) <= self.token_budget:
+            return history, compaction
+
+        # 最近一轮原文保留；无法在历史末尾定位时整段参与折叠
+        tail_start = len(history) - len(last_turn) if last_turn and history.endswith(last_turn) else len(history)
+        done = min(int(compaction["summarized_chars"] or 0), tail_start)
+        summary = compaction["history_summary"] or ""
+        pending = history[done:tail_start]
+        tail = history[tail_start:]
+        if not summary and not pending.strip():
+            # 只有最近一轮，没有可折叠的内容
+            return history, compaction
+
+        rendered = _render(summary, pending, tail)
+        if pending.strip() and (not summary or estimate_tokens(rendered) > self.token_budget):
+            max_words = max(self.token_budget * 3 // 8, 50)  # 约为预算的一半 token
+            messages = layered_messages(
+                SUMMARIZER_INSTRUCTIONS,
+                [
+                    ("Word Limit", str(max_words)),
+                    ("Current Summary", summary),
+                    ("New Debate Turns", pending),
+                ],
+            )
+            response = yield self.llm, messages
+            summary = response.content if hasattr(response, "content") else str(response)
+            usage = getattr(response, "usage_metadata", None) or {}
+            spent = usage.get("total_tokens") or (
+                sum(estimate_tokens(m["content"]) for m in messages) + estimate_tokens(summary)
+            )
+            compaction["compaction_tokens_spent"] += int(spent)
+            compaction["history_summary"] = summary
+            compaction["summarized_chars"] = tail_start
+            rendered = _render(summary, "", tail)
+
+        compaction["compaction_tokens_saved"] += estimate_tokens(history) - estimate_tokens(rendered)
+        return rendered, compaction
+
+
+def latest_risk_turn(risk_debate_state: Dict[str, Any]) -> str:
+    """风险辩论中最近一位发言者的原文（位于 history 末尾）"""
+    speaker = (risk_debate_state.get("latest_speaker") or "").lower()
+    return risk_debate_state.get(f"current_{speaker}_response", "") if speaker else ""
+
+
+def compaction_report(final_state: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """汇总一次运行中两场辩论的压缩效果：提示词中省下的 token、摘要调用花费的 token 与净节省"""
+    report = {}
+    for name, key in (("invest", "investment_debate_state"), ("risk", "risk_debate_state")):
+        debate_state = final_state.get(key) or {}
+        saved = int(debate_state.get("compaction_tokens_saved", 0) or 0)
+        spent = int(debate_state.get("compaction_tokens_spent", 0) or 0)
+        report[name] = {"tokens_saved": saved, "tokens_spent": spent, "net_tokens_saved": saved - spent}
+    report["total"] = {
+        field: sum(report[name][field] for name in ("invest", "risk"))
+        for field in ("tokens_saved", "tokens_spent", "net_tokens_saved")
+    }
+    return report
+
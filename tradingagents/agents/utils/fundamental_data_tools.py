@@ -1,8 +1,10 @@
 from langchain_core.tools import tool
+from tradingagents.agents.utils.async_utils import async_vendor_tool
 from typing import Annotated
 from tradingagents.dataflows.interface import route_to_vendor
 
 
+@async_vendor_tool
 @tool
 def get_fundamentals(
     ticker: Annotated[str, "ticker symbol"],
@@ -20,6 +22,7 @@ def get_fundamentals(
     return route_to_vendor("get_fundamentals", ticker, curr_date)
 
 
+@async_vendor_tool
 @tool
 def get_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
@@ -39,6 +42,7 @@ def get_balance_sheet(
     return route_to_vendor("get_balance_sheet", ticker, freq, curr_date)
 
 
+@async_vendor_tool
 @tool
 def get_cashflow(
     ticker: Annotated[str, "ticker symbol"],
@@ -58,6 +62,7 @@ def get_cashflow(
     return route_to_vendor("get_cashflow", ticker, freq, curr_date)
 
 
+@async_vendor_tool
 @tool
 def get_income_statement(
     ticker: Annotated[str, "ticker symbol"],
@@ -77,6 +82,7 @@ def get_income_statement(
     return route_to_vendor("get_income_statement", ticker, freq, curr_date)
 
 
+@async_vendor_tool
 @tool
 def get_earning_call_transcripts(
     ticker: Annotated[str, "ticker symbol"],
@@ -1,7 +1,9 @@
 from langchain_core.tools import tool
+from tradingagents.agents.utils.async_utils import async_vendor_tool
 from typing import Annotated
 from tradingagents.dataflows.interface import route_to_vendor
 
+@async_vendor_tool
 @tool
 def get_news(
     ticker: Annotated[str, "Ticker symbol"],
@@ -20,6 +22,7 @@ def get_news(
     """
     return route_to_vendor("get_news", ticker, start_date, end_date)
 
+@async_vendor_tool
 @tool
 def get_global_news(
     curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -38,6 +41,7 @@ def get_global_news(
     """
     return route_to_vendor("get_global_news", curr_date, look_back_days, limit)
 
+@async_vendor_tool
 @tool
 def get_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
@@ -54,6 +58,7 @@ def get_insider_sentiment(
     """
     return route_to_vendor("get_insider_sentiment", ticker, curr_date)
 
+@async_vendor_tool
 @tool
 def get_insider_transactions(
     ticker: Annotated[str, "ticker symbol"],
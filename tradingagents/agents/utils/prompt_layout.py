@@ -0,0 +1,31 @@
+"""
+提示词布局
+OpenAI 兼容服务、Ollama 等按请求前缀复用 KV 缓存：静态指令必须逐字节不变地放在最前面，
+本次运行的易变内容（日期、代码、记忆、报告、辩论历史）统一放在其后
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def format_sections(sections: Iterable[Tuple[str, Optional[str]]]) -> str:
+    """把 (标题, 内容) 列表渲染成带标题的文本块；内容为空时写明 N/A，保证各节始终出现、顺序固定"""
+    blocks = []
+    for title, body in sections:
+        body = body.strip() if isinstance(body, str) else body
+        blocks.append(f"**{title}:**\n{body if body else 'N/A'}")
+    return "\n\n---\n\n".join(blocks)
+
+
+def layered_messages(
+    instructions: str, sections: Iterable[Tuple[str, Optional[str]]]
+) -> List[Dict[str, str]]:
+    """按“静态指令 → 易变上下文”组装一次模型调用的消息。
+
+    ``instructions`` 不得包含任何本次运行的值，作为 system 消息构成跨运行、跨标的不变的前缀；
+    ``sections`` 应按从最稳定到最易变的顺序排列（报告 → 记忆 → 交易计划 → 辩论历史 → 最新发言），
+    辩论历史只在末尾追加，同一节点下一轮调用时可复用的前缀因此会一直延伸到上一轮的历史末尾。
+    """
+    return [
+        {"role": "system", "content": instructions},
+        {"role": "user", "content": format_sections(sections)},
+    ]
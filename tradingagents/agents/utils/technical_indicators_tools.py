@@ -1,23 +1,26 @@
 from langchain_core.tools import tool
-from typing import Annotated
+from tradingagents.agents.utils.async_utils import async_vendor_tool
+from typing import Annotated, List
 from tradingagents.dataflows.interface import route_to_vendor
 
+@async_vendor_tool
 @tool
 def get_indicators(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to get the analysis and report of"],
+    indicators: Annotated[List[str], "technical indicators to get the analysis and report of, requested together in one call"],
     curr_date: Annotated[str, "The current trading date you are trading on, YYYY-mm-dd"],
-    look_back_days: Annotated[int, "how many days to look back"] = 30,
+    look_back_days: Annotated[int, "how many trading days (exchange sessions) to look back"] = 30,
 ) -> str:
     """
     Retrieve technical indicators for a given ticker symbol.
+    All requested indicators are returned together as one date-aligned table.
     Uses the configured technical_indicators vendor.
     Args:
         symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
-        indicator (str): Technical indicator to get the analysis and report of
+        indicators (List[str]): Technical indicators to get the analysis and report of, e.g. ["close_50_sma", "macd", "rsi"]
         curr_date (str): The current trading date you are trading on, YYYY-mm-dd
-        look_back_days (int): How many days to look back, default is 30
+        look_back_days (int): How many trading days (exchange sessions) to look back, default is 30
     Returns:
-        str: A formatted dataframe containing the technical indicators for the specified ticker symbol and indicator.
+        str: A formatted dataframe containing the technical indicators for the specified ticker symbol and indicators.
     """
-    return route_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days)
\ No newline at end of file
+    return route_to_vendor("get_indicators", symbol, indicators, curr_date, look_back_days)
\ No newline at end of file
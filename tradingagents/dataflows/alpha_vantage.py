@@ -1,5 +1,5 @@
 # Import functions from specialized modules
-from .alpha_vantage_stock import get_stock
+from .alpha_vantage_stock import get_stock_frame
 from .alpha_vantage_indicator import get_indicator
 from .alpha_vantage_fundamentals import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement, get_earning_call_transcripts
 from .alpha_vantage_news import get_news, get_insider_transactions
\ No newline at end of file
@@ -1,9 +1,13 @@
 import os
+import time
+import threading
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 import json
-from datetime import datetime
-from io import StringIO
+from datetime import datetime, timezone
+from typing import Optional
+from .config import get_config
+from .utils import VendorInputError
 
 API_BASE_URL = "https://www.alphavantage.co/query"
 
@@ -29,16 +33,179 @@ def format_datetime_for_api(date_input) -> str:
                 dt = datetime.strptime(date_input, "%Y-%m-%d %H:%M")
                 return dt.strftime("%Y%m%dT%H%M")
             except ValueError:
-                raise ValueError(f"Unsupported date format: {date_input}")
+                raise VendorInputError(f"Unsupported date format: {date_input}")
     elif isinstance(date_input, datetime):
         return date_input.strftime("%Y%m%dT%H%M")
     else:
-        raise ValueError(f"Date must be string or datetime object, got {type(date_input)}")
+        raise VendorInputError(f"Date must be string or datetime object, got {type(date_input)}")
 
 class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute`` tokens per minute."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> float:
+        """Take one token, sleeping until one is available. Returns the time waited.
+
+        Raises ``TimeoutError`` when the wait would exceed ``max_wait`` seconds.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            if waited + delay > max_wait:
+                raise TimeoutError(f"token bucket wait of {waited + delay:.1f}s exceeds {max_wait}s")
+            time.sleep(delay)
+            waited += delay
+
+
+class AlphaVantageClient:
+    """Process-wide Alpha Vantage client.
+
+    Requests share one pooled ``requests.Session`` (keep-alive). A token bucket
+    sized to the plan's calls per minute makes callers queue instead of being
+    refused by the server, and a daily call counter persisted in
+    ``usage_path`` survives restarts so a batch knows its remaining budget.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: float,
+        calls_per_day: Optional[int],
+        usage_path: str,
+        timeout: float = 30,
+        max_wait: float = 120,
+        pool_size: int = 8,
+    ):
+        self.bucket = TokenBucket(calls_per_minute)
+        self.calls_per_day = calls_per_day
+        self.usage_path = usage_path
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._usage = self._load_usage()
+        self.waited_seconds = 0.0
+
+    def get(self, params: dict) -> requests.Response:
+        """Send one query after reserving a per-day and a per-minute slot."""
+        with self._lock:
+            self._roll_day()
+            if self.calls_per_day is not None and self._usage["calls"] >= self.calls_per_day:
+                raise AlphaVantageRateLimitError(
+                    f"Alpha Vantage daily budget of {self.calls_per_day} calls is used up"
+                )
+            self._usage["calls"] += 1
+            self._save_usage()
+
+        try:
+            waited = self.bucket.acquire(self.max_wait)
+        except TimeoutError as e:
+            with self._lock:
+                self._usage["calls"] -= 1
+                self._save_usage()
+            raise AlphaVantageRateLimitError(f"Alpha Vantage per-minute budget: {e}")
+        if waited:
+            with self._lock:
+                self.waited_seconds += waited
+
+        return self.session.get(API_BASE_URL, params=params, timeout=self.timeout)
+
+    def mark_daily_exhausted(self) -> None:
+        """The server refused for the day: stop sending until the date rolls over."""
+        if self.calls_per_day is None:
+            return
+        with self._lock:
+            self._roll_day()
+            self._usage["calls"] = max(self._usage["calls"], self.calls_per_day)
+            self._save_usage()
+
+    def usage(self) -> dict:
+        with self._lock:
+            self._roll_day()
+            remaining = None
+            if self.calls_per_day is not None:
+                remaining = max(0, self.calls_per_day - self._usage["calls"])
+            return {
+                "date": self._usage["date"],
+                "calls_today": self._usage["calls"],
+                "remaining_today": remaining,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+    # Alpha Vantage resets its daily quota on the UTC date
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if self._usage.get("date") != today:
+            self._usage = {"date": today, "calls": 0}
+
+    def _load_usage(self) -> dict:
+        try:
+            with open(self.usage_path, "r") as f:
+                usage = json.load(f)
+            if usage.get("date") == self._today():
+                return {"date": usage["date"], "calls": int(usage.get("calls", 0))}
+        except (OSError, ValueError):
+            pass
+        return {"date": self._today(), "calls": 0}
+
+    def _save_usage(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.usage_path)), exist_ok=True)
+        tmp_path = self.usage_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._usage, f)
+        os.replace(tmp_path, self.usage_path)
+
+
+_client: Optional[AlphaVantageClient] = None
+_client_lock = threading.Lock()
+
+
+def get_alpha_vantage_client() -> AlphaVantageClient:
+    """Return the process-wide Alpha Vantage client configured from the config."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            config = get_config()
+            _client = AlphaVantageClient(
+                calls_per_minute=config.get("alpha_vantage_calls_per_minute", 5),
+                calls_per_day=config.get("alpha_vantage_calls_per_day", 25),
+                usage_path=config.get("alpha_vantage_usage_path") or os.path.join(
+                    config["data_cache_dir"], "alpha_vantage_usage.json"
+                ),
+                timeout=config.get("http_timeout_seconds", 30),
+                max_wait=config.get("alpha_vantage_max_wait_seconds", 120),
+            )
+        return _client
+
+
+def get_alpha_vantage_usage() -> dict:
+    """Calls made today and the remaining daily budget, e.g. before starting a batch."""
+    return get_alpha_vantage_client().usage()
+
 def _make_api_request(function_name: str, params: dict) -> dict | str:
     """Helper function to make API requests and handle responses.
     
@@ -63,7 +230,8 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
-    response = requests.get(API_BASE_URL, params=api_params)
+    client = get_alpha_vantage_client()
+    response = client.get(api_params)
     response.raise_for_status()
 
     response_text = response.text
@@ -75,48 +243,11 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         if "Information" in response_json:
             info_message = response_json["Information"]
             if "rate limit" in info_message.lower() or "api key" in info_message.lower():
+                if "per day" in info_message.lower() or "daily" in info_message.lower():
+                    client.mark_daily_exhausted()
                 raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
     except json.JSONDecodeError:
         # Response is not JSON (likely CSV data), which is normal
         pass
 
     return response_text
-
-
-
-def _filter_csv_by_date_range(csv_data: str, start_date: str, end_date: str) -> str:
-    """
-    Filter CSV data to include only rows within the specified date range.
-
-    Args:
-        csv_data: CSV string from Alpha Vantage API
-        start_date: Start date in yyyy-mm-dd format
-        end_date: End date in yyyy-mm-dd format
-
-    Returns:
-        Filtered CSV string
-    """
-    if not csv_data or csv_data.strip() == "":
-        return csv_data
-
-    try:
-        # Parse CSV data
-        df = pd.read_csv(StringIO(csv_data))
-
-        # Assume the first column is the date column (timestamp)
-        date_col = df.columns[0]
-        df[date_col] = pd.to_datetime(df[date_col])
-
-        # Filter by date range
-        start_dt = pd.to_datetime(start_date)
-        end_dt = pd.to_datetime(end_date)
-
-        filtered_df = df[(df[date_col] >= start_dt) & (df[date_col] <= end_dt)]
-
-        # Convert back to CSV string
-        return filtered_df.to_csv(index=False)
-
-    except Exception as e:
-        # If filtering fails, return original data with a warning
-        print(f"Warning: Failed to filter CSV data by date range: {e}")
-        return csv_data
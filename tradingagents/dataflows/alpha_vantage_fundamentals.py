@@ -1,4 +1,5 @@
 from .alpha_vantage_common import _make_api_request
+from .utils import VendorInputError
 
 
 def get_fundamentals(ticker: str, curr_date: str = None) -> str:
@@ -89,7 +90,7 @@ def get_earning_call_transcripts(ticker: str, quarter: str = None, curr_date: st
         str: Earnings call transcript data with sentiment analysis
     """
     if not quarter:
-        raise ValueError("quarter parameter is required for earning call transcripts. Format: YYYYQM (e.g., 2024Q1)")
+        raise VendorInputError("quarter parameter is required for earning call transcripts. Format: YYYYQM (e.g., 2024Q1)")
     
     params = {
         "symbol": ticker,
@@ -1,8 +1,56 @@
-from .alpha_vantage_common import _make_api_request
+from typing import List, Union
+from datetime import datetime
+
+import pandas as pd
+
+from .alpha_vantage_common import _make_api_request, AlphaVantageRateLimitError
+from .price_store import get_indicator_series_store
+from .utils import VendorInputError, normalize_indicator_list, format_indicator_table
+from .trading_calendar import window_start
+
+SUPPORTED_INDICATORS = {
+    "close_50_sma": ("50 SMA", "close"),
+    "close_200_sma": ("200 SMA", "close"),
+    "close_10_ema": ("10 EMA", "close"),
+    "macd": ("MACD", "close"),
+    "macds": ("MACD Signal", "close"),
+    "macdh": ("MACD Histogram", "close"),
+    "rsi": ("RSI", "close"),
+    "boll": ("Bollinger Middle", "close"),
+    "boll_ub": ("Bollinger Upper Band", "close"),
+    "boll_lb": ("Bollinger Lower Band", "close"),
+    "atr": ("ATR", None),
+    "vwma": ("VWMA", "close")
+}
+
+INDICATOR_DESCRIPTIONS = {
+    "close_50_sma": "50 SMA: A medium-term trend indicator. Usage: Identify trend direction and serve as dynamic support/resistance. Tips: It lags price; combine with faster indicators for timely signals.",
+    "close_200_sma": "200 SMA: A long-term trend benchmark. Usage: Confirm overall market trend and identify golden/death cross setups. Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries.",
+    "close_10_ema": "10 EMA: A responsive short-term average. Usage: Capture quick shifts in momentum and potential entry points. Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals.",
+    "macd": "MACD: Computes momentum via differences of EMAs. Usage: Look for crossovers and divergence as signals of trend changes. Tips: Confirm with other indicators in low-volatility or sideways markets.",
+    "macds": "MACD Signal: An EMA smoothing of the MACD line. Usage: Use crossovers with the MACD line to trigger trades. Tips: Should be part of a broader strategy to avoid false positives.",
+    "macdh": "MACD Histogram: Shows the gap between the MACD line and its signal. Usage: Visualize momentum strength and spot divergence early. Tips: Can be volatile; complement with additional filters in fast-moving markets.",
+    "rsi": "RSI: Measures momentum to flag overbought/oversold conditions. Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis.",
+    "boll": "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. Usage: Acts as a dynamic benchmark for price movement. Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals.",
+    "boll_ub": "Bollinger Upper Band: Typically 2 standard deviations above the middle line. Usage: Signals potential overbought conditions and breakout zones. Tips: Confirm signals with other tools; prices may ride the band in strong trends.",
+    "boll_lb": "Bollinger Lower Band: Typically 2 standard deviations below the middle line. Usage: Indicates potential oversold conditions. Tips: Use additional analysis to avoid false reversal signals.",
+    "atr": "ATR: Averages true range to measure volatility. Usage: Set stop-loss levels and adjust position sizes based on current market volatility. Tips: It's a reactive measure, so use it as part of a broader risk management strategy.",
+    "vwma": "VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+}
+
+# Map internal indicator names to expected CSV column names from Alpha Vantage
+INDICATOR_COLUMNS = {
+    "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
+    "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
+    "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
+    "close_50_sma": "SMA", "close_200_sma": "SMA"
+}
+
+
 
 def get_indicator(
     symbol: str,
-    indicator: str,
+    indicator: Union[str, List[str]],
     curr_date: str,
     look_back_days: int,
     interval: str = "daily",
@@ -14,7 +62,7 @@ def get_indicator(
 
     Args:
         symbol: ticker symbol of the company
-        indicator: technical indicator to get the analysis and report of
+        indicator: technical indicator (or list of indicators) to get the analysis and report of
         curr_date: The current trading date you are trading on, YYYY-mm-dd
         look_back_days: how many days to look back
         interval: Time interval (daily, weekly, monthly)
@@ -24,46 +72,24 @@ def get_indicator(
     Returns:
         String containing indicator values and description
     """
-    from datetime import datetime
-    from dateutil.relativedelta import relativedelta
-
-    supported_indicators = {
-        "close_50_sma": ("50 SMA", "close"),
-        "close_200_sma": ("200 SMA", "close"),
-        "close_10_ema": ("10 EMA", "close"),
-        "macd": ("MACD", "close"),
-        "macds": ("MACD Signal", "close"),
-        "macdh": ("MACD Histogram", "close"),
-        "rsi": ("RSI", "close"),
-        "boll": ("Bollinger Middle", "close"),
-        "boll_ub": ("Bollinger Upper Band", "close"),
-        "boll_lb": ("Bollinger Lower Band", "close"),
-        "atr": ("ATR", None),
-        "vwma": ("VWMA", "close")
-    }
-
-    indicator_descriptions = {
-        "close_50_sma": "50 SMA: A medium-term trend indicator. Usage: Identify trend direction and serve as dynamic support/resistance. Tips: It lags price; combine with faster indicators for timely signals.",
-        "close_200_sma": "200 SMA: A long-term trend benchmark. Usage: Confirm overall market trend and identify golden/death cross setups. Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries.",
-        "close_10_ema": "10 EMA: A responsive short-term average. Usage: Capture quick shifts in momentum and potential entry points. Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals.",
-        "macd": "MACD: Computes momentum via differences of EMAs. Usage: Look for crossovers and divergence as signals of trend changes. Tips: Confirm with other indicators in low-volatility or sideways markets.",
-        "macds": "MACD Signal: An EMA smoothing of the MACD line. Usage: Use crossovers with the MACD line to trigger trades. Tips: Should be part of a broader strategy to avoid false positives.",
-        "macdh": "MACD Histogram: Shows the gap between the MACD line and its signal. Usage: Visualize momentum strength and spot divergence early. Tips: Can be volatile; complement with additional filters in fast-moving markets.",
-        "rsi": "RSI: Measures momentum to flag overbought/oversold conditions. Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis.",
-        "boll": "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. Usage: Acts as a dynamic benchmark for price movement. Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals.",
-        "boll_ub": "Bollinger Upper Band: Typically 2 standard deviations above the middle line. Usage: Signals potential overbought conditions and breakout zones. Tips: Confirm signals with other tools; prices may ride the band in strong trends.",
-        "boll_lb": "Bollinger Lower Band: Typically 2 standard deviations below the middle line. Usage: Indicates potential oversold conditions. Tips: Use additional analysis to avoid false reversal signals.",
-        "atr": "ATR: Averages true range to measure volatility. Usage: Set stop-loss levels and adjust position sizes based on current market volatility. Tips: It's a reactive measure, so use it as part of a broader risk management strategy.",
-        "vwma": "VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-    }
+    indicators = normalize_indicator_list(indicator)
+    if len(indicators) > 1:
+        # Several indicators are answered with one aligned table
+        return get_indicator_table(
+            symbol, indicators, curr_date, look_back_days, interval, time_period, series_type
+        )
+    if indicators:
+        indicator = indicators[0]
+
+    supported_indicators = SUPPORTED_INDICATORS
+    indicator_descriptions = INDICATOR_DESCRIPTIONS
 
     if indicator not in supported_indicators:
-        raise ValueError(
+        raise VendorInputError(
             f"Indicator {indicator} is not supported. Please choose from: {list(supported_indicators.keys())}"
         )
 
-    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = curr_date_dt - relativedelta(days=look_back_days)
+    before = datetime.strptime(window_start(curr_date, look_back_days), "%Y-%m-%d")
 
     # Get the full data for the period instead of making individual calls
     _, required_series_type = supported_indicators[indicator]
@@ -73,130 +99,27 @@ def get_indicator(
         series_type = required_series_type
 
     try:
-        # Get indicator data for the period
-        if indicator == "close_50_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "50",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_200_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "200",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_10_ema":
-            data = _make_api_request("EMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "10",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macd":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macds":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macdh":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "rsi":
-            data = _make_api_request("RSI", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator in ["boll", "boll_ub", "boll_lb"]:
-            data = _make_api_request("BBANDS", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "20",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "atr":
-            data = _make_api_request("ATR", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "datatype": "csv"
-            })
-        elif indicator == "vwma":
+        if indicator == "vwma":
             # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
             # In a real implementation, this would need to be calculated from OHLCV data
             return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
-        else:
-            return f"Error: Indicator {indicator} not implemented yet."
-
-        # Parse CSV data and extract values for the date range
-        lines = data.strip().split('\n')
-        if len(lines) < 2:
-            return f"Error: No data returned for {indicator}"
-
-        # Parse header and data
-        header = [col.strip() for col in lines[0].split(',')]
-        try:
-            date_col_idx = header.index('time')
-        except ValueError:
-            return f"Error: 'time' column not found in data for {indicator}. Available columns: {header}"
 
-        # Map internal indicator names to expected CSV column names from Alpha Vantage
-        col_name_map = {
-            "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
-            "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
-            "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
-            "close_50_sma": "SMA", "close_200_sma": "SMA"
-        }
-
-        target_col_name = col_name_map.get(indicator)
+        # Full series from the local indicator store, sliced to the window
+        frame = _get_indicator_series(symbol, indicator, interval, time_period, series_type, curr_date)
 
+        target_col_name = INDICATOR_COLUMNS.get(indicator)
         if not target_col_name:
-            # Default to the second column if no specific mapping exists
-            value_col_idx = 1
-        else:
-            try:
-                value_col_idx = header.index(target_col_name)
-            except ValueError:
-                return f"Error: Column '{target_col_name}' not found for indicator '{indicator}'. Available columns: {header}"
-
-        result_data = []
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-            values = line.split(',')
-            if len(values) > value_col_idx:
-                try:
-                    date_str = values[date_col_idx].strip()
-                    # Parse the date
-                    date_dt = datetime.strptime(date_str, "%Y-%m-%d")
-
-                    # Check if date is in our range
-                    if before <= date_dt <= curr_date_dt:
-                        value = values[value_col_idx].strip()
-                        result_data.append((date_dt, value))
-                except (ValueError, IndexError):
-                    continue
+            # Default to the first value column if no specific mapping exists
+            target_col_name = frame.columns[0]
+        elif target_col_name not in frame.columns:
+            return f"Error: Column '{target_col_name}' not found for indicator '{indicator}'. Available columns: {['time'] + list(frame.columns)}"
+
+        window = frame[target_col_name]
+        window = window[(window.index >= before.strftime("%Y-%m-%d")) & (window.index <= curr_date)]
+        result_data = [
+            (datetime.strptime(date_str, "%Y-%m-%d"), value)
+            for date_str, value in window.items()
+        ]
 
         # Sort by date and format output
         result_data.sort(key=lambda x: x[0])
@@ -217,6 +140,130 @@ def get_indicator(
 
         return result_str
 
+    except AlphaVantageRateLimitError:
+        # Let the router fall back to the next vendor
+        raise
     except Exception as e:
         print(f"Error getting Alpha Vantage indicator data for {indicator}: {e}")
         return f"Error retrieving {indicator} data: {str(e)}"
+
+
+def _indicator_request(
+    symbol: str,
+    indicator: str,
+    interval: str,
+    time_period: int,
+    series_type: str,
+) -> tuple:
+    """Return the Alpha Vantage ``(function, params)`` pair that serves ``indicator``."""
+    _, required_series_type = SUPPORTED_INDICATORS[indicator]
+    if required_series_type:
+        series_type = required_series_type
+
+    params = {"symbol": symbol, "interval": interval, "datatype": "csv"}
+    if indicator == "close_50_sma":
+        return "SMA", {**params, "time_period": "50", "series_type": series_type}
+    if indicator == "close_200_sma":
+        return "SMA", {**params, "time_period": "200", "series_type": series_type}
+    if indicator == "close_10_ema":
+        return "EMA", {**params, "time_period": "10", "series_type": series_type}
+    if indicator in ["macd", "macds", "macdh"]:
+        return "MACD", {**params, "series_type": series_type}
+    if indicator == "rsi":
+        return "RSI", {**params, "time_period": str(time_period), "series_type": series_type}
+    if indicator in ["boll", "boll_ub", "boll_lb"]:
+        return "BBANDS", {**params, "time_period": "20", "series_type": series_type}
+    if indicator == "atr":
+        return "ATR", {**params, "time_period": str(time_period)}
+    raise VendorInputError(f"Indicator {indicator} not implemented yet.")
+
+
+def _parse_indicator_csv(data: str) -> pd.DataFrame:
+    """Parse an Alpha Vantage indicator CSV into a frame indexed by ascending yyyy-mm-dd strings.
+
+    Values are kept as the strings Alpha Vantage sent.
+    """
+    lines = [line for line in data.strip().split("\n") if line.strip()]
+    if len(lines) < 2:
+        raise ValueError("No data returned")
+
+    header = [col.strip() for col in lines[0].split(",")]
+    if "time" not in header:
+        raise ValueError(f"'time' column not found in data. Available columns: {header}")
+
+    rows = [[value.strip() for value in line.split(",")] for line in lines[1:]]
+    rows = [row for row in rows if len(row) == len(header)]
+    frame = pd.DataFrame(rows, columns=header).set_index("time")
+    # Keep only well-formed daily rows, like the former per-line strptime filter
+    frame = frame[pd.to_datetime(frame.index, format="%Y-%m-%d", errors="coerce").notna()]
+    return frame[~frame.index.duplicated(keep="first")].sort_index()
+
+
+def _get_indicator_series(
+    symbol: str,
+    indicator: str,
+    interval: str,
+    time_period: int,
+    series_type: str,
+    curr_date: str,
+) -> pd.DataFrame:
+    """Full Alpha Vantage series serving ``indicator``, from the local indicator store.
+
+    The series for a (symbol, function, params) is downloaded once and only
+    refreshed (at most daily) when ``curr_date`` lies past its last row, so
+    indicators sharing a function and repeated look-backs cost no API calls.
+    """
+    function_name, params = _indicator_request(symbol, indicator, interval, time_period, series_type)
+    return get_indicator_series_store().get(
+        symbol,
+        function_name,
+        params,
+        lambda: _parse_indicator_csv(_make_api_request(function_name, params)),
+        needed_through=curr_date,
+    )
+
+
+def get_indicator_table(
+    symbol: str,
+    indicators: List[str],
+    curr_date: str,
+    look_back_days: int,
+    interval: str = "daily",
+    time_period: int = 14,
+    series_type: str = "close",
+) -> str:
+    """
+    Returns several Alpha Vantage indicators over a time window as one aligned table.
+
+    Indicators that share an Alpha Vantage function (MACD and its signal/histogram,
+    the three Bollinger bands) are served from the same stored series.
+    """
+    indicators = normalize_indicator_list(indicators)
+    unsupported = [name for name in indicators if name not in SUPPORTED_INDICATORS]
+    if unsupported or not indicators:
+        raise VendorInputError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(SUPPORTED_INDICATORS.keys())}"
+        )
+
+    before = window_start(curr_date, look_back_days)
+
+    columns = {}
+    for name in indicators:
+        if name == "vwma":
+            # Not offered by Alpha Vantage; the column stays empty (N/A)
+            columns[name] = pd.Series(dtype=float)
+            continue
+
+        try:
+            frame = _get_indicator_series(symbol, name, interval, time_period, series_type, curr_date)
+            series = pd.to_numeric(frame[INDICATOR_COLUMNS.get(name, frame.columns[0])], errors="coerce")
+        except AlphaVantageRateLimitError:
+            # Let the router fall back to the next vendor
+            raise
+        except Exception as e:
+            print(f"Error getting Alpha Vantage indicator data for {name}: {e}")
+            series = pd.Series(dtype=float)
+        columns[name] = series[(series.index >= before) & (series.index <= curr_date)]
+
+    panel = pd.DataFrame(columns)
+    return format_indicator_table(symbol, panel, before, curr_date, INDICATOR_DESCRIPTIONS)
@@ -1,38 +1,33 @@
 from datetime import datetime
-from .alpha_vantage_common import _make_api_request, _filter_csv_by_date_range
+from io import StringIO
 
-def get_stock(
+import pandas as pd
+
+from .alpha_vantage_common import _make_api_request
+from .market_data import empty_price_frame, to_price_frame, slice_price_frame
+
+def get_stock_frame(
     symbol: str,
     start_date: str,
     end_date: str
-) -> str:
+) -> pd.DataFrame:
     """
-    Returns raw daily OHLCV values, adjusted close values, and historical split/dividend events
-    filtered to the specified date range.
+    Typed OHLCV frame (raw, unadjusted close) from TIME_SERIES_DAILY_ADJUSTED.
 
     Args:
         symbol: The name of the equity. For example: symbol=IBM
         start_date: Start date in yyyy-mm-dd format
-        end_date: End date in yyyy-mm-dd format
+        end_date: End date in yyyy-mm-dd format, exclusive
 
     Returns:
-        CSV string containing the daily adjusted time series data filtered to the date range.
+        DataFrame in the schema of ``market_data.PRICE_FRAME_SCHEMA``.
     """
-    # Parse dates to determine the range
     start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    today = datetime.now()
-
-    # Choose outputsize based on whether the requested range is within the latest 100 days
-    # Compact returns latest 100 data points, so check if start_date is recent enough
-    days_from_today_to_start = (today - start_dt).days
-    outputsize = "compact" if days_from_today_to_start < 100 else "full"
-
-    params = {
-        "symbol": symbol,
-        "outputsize": outputsize,
-        "datatype": "csv",
-    }
-
-    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", params)
-
-    return _filter_csv_by_date_range(response, start_date, end_date)
\ No newline at end of file
+    outputsize = "compact" if (datetime.now() - start_dt).days < 100 else "full"
+    response = _make_api_request(
+        "TIME_SERIES_DAILY_ADJUSTED",
+        {"symbol": symbol, "outputsize": outputsize, "datatype": "csv"},
+    )
+    if not response or not response.strip():
+        return empty_price_frame()
+    return slice_price_frame(to_price_frame(pd.read_csv(StringIO(response))), start_date, end_date)
@@ -0,0 +1,191 @@
+import os
+import json
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from .config import get_config
+
+
+class FinnhubDataset:
+    """One ``{ticker}_data_formatted.json`` file kept as a sorted date index.
+
+    Only dates with a non-empty entry list are indexed. ``positions`` remembers
+    each date's position in the source file so range results keep the file's
+    key order.
+    """
+
+    def __init__(self, data: dict):
+        items = [
+            (day, position, value)
+            for position, (day, value) in enumerate(data.items())
+            if len(value) > 0
+        ]
+        items.sort(key=lambda item: item[0])
+        self.days: List[str] = [item[0] for item in items]
+        self.positions: List[int] = [item[1] for item in items]
+        self.values: List[list] = [item[2] for item in items]
+
+    def range(self, start_date: str, end_date: str) -> dict:
+        lo = bisect_left(self.days, start_date)
+        hi = bisect_right(self.days, end_date)
+        hits = sorted(range(lo, hi), key=self.positions.__getitem__)
+        return {self.days[i]: self.values[i] for i in hits}
+
+
+class FinnhubDataCache:
+    """Cached access to the Finnhub JSON datasets on disk.
+
+    ``backend="memory"`` parses every JSON file once per process and keeps an
+    LRU of the parsed, date-indexed datasets. ``backend="sqlite"`` converts each
+    file once into an indexed SQLite table that persists across runs, so later
+    processes answer range queries without touching the JSON at all. Both
+    backends re-read a file when its mtime or size changes.
+    """
+
+    def __init__(self, backend: str = "memory", sqlite_path: Optional[str] = None, max_datasets: int = 64):
+        if backend not in ("memory", "sqlite"):
+            raise ValueError(f"Unsupported Finnhub cache backend: {backend}")
+        if backend == "sqlite" and not sqlite_path:
+            raise ValueError("sqlite_path is required for the sqlite backend")
+        self.backend = backend
+        self.sqlite_path = sqlite_path
+        self.max_datasets = max_datasets
+        self._datasets: "OrderedDict[str, Tuple[tuple, FinnhubDataset]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def get_range(self, data_path: str, start_date: str, end_date: str) -> dict:
+        """Return ``{date: entries}`` for the non-empty dates in ``[start_date, end_date]``."""
+        signature = _file_signature(data_path)
+        if self.backend == "sqlite":
+            return self._sqlite_range(data_path, signature, start_date, end_date)
+        return self._dataset(data_path, signature).range(start_date, end_date)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datasets.clear()
+
+    # ------------------------------------------------------------------ #
+    # memory backend
+    # ------------------------------------------------------------------ #
+    def _dataset(self, data_path: str, signature: tuple) -> FinnhubDataset:
+        with self._lock:
+            cached = self._datasets.get(data_path)
+            if cached is not None and cached[0] == signature:
+                self._datasets.move_to_end(data_path)
+                return cached[1]
+
+            dataset = FinnhubDataset(_load_json(data_path))
+            self._datasets[data_path] = (signature, dataset)
+            self._datasets.move_to_end(data_path)
+            while len(self._datasets) > self.max_datasets:
+                self._datasets.popitem(last=False)
+            return dataset
+
+    # ------------------------------------------------------------------ #
+    # sqlite backend
+    # ------------------------------------------------------------------ #
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.sqlite_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS datasets (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS entries (
+                    path TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_path_day ON entries (path, day);
+                """
+            )
+        return self._conn
+
+    def _sqlite_range(self, data_path: str, signature: tuple, start_date: str, end_date: str) -> dict:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT mtime, size FROM datasets WHERE path = ?", (data_path,)
+            ).fetchone()
+            if row is None or tuple(row) != signature:
+                self._sqlite_ingest(conn, data_path, signature)
+
+            rows = conn.execute(
+                "SELECT day, payload FROM entries WHERE path = ? AND day BETWEEN ? AND ? ORDER BY position",
+                (data_path, start_date, end_date),
+            ).fetchall()
+        return {day: json.loads(payload) for day, payload in rows}
+
+    @staticmethod
+    def _sqlite_ingest(conn: sqlite3.Connection, data_path: str, signature: tuple) -> None:
+        data = _load_json(data_path)
+        with conn:
+            conn.execute("DELETE FROM entries WHERE path = ?", (data_path,))
+            conn.executemany(
+                "INSERT INTO entries (path, day, position, payload) VALUES (?, ?, ?, ?)",
+                (
+                    (data_path, day, position, json.dumps(value))
+                    for position, (day, value) in enumerate(data.items())
+                    if len(value) > 0
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO datasets (path, mtime, size) VALUES (?, ?, ?)",
+                (data_path, *signature),
+            )
+
+
+def dedupe_entries(data: dict) -> Iterable[dict]:
+    """Yield the entries of a ``{date: entries}`` mapping once each, in order.
+
+    Equality is decided on the entry's canonical JSON form, which keeps the
+    lookup O(1) instead of scanning every entry seen so far.
+    """
+    seen = set()
+    for entries in data.values():
+        for entry in entries:
+            key = json.dumps(entry, sort_keys=True, default=str)
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+
+def _file_signature(path: str) -> tuple:
+    stat = os.stat(path)
+    return (stat.st_mtime, stat.st_size)
+
+
+def _load_json(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+_cache: Optional[FinnhubDataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_finnhub_cache() -> FinnhubDataCache:
+    """Return the process-wide Finnhub dataset cache configured from the config."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = get_config()
+            backend = config.get("finnhub_cache_backend", "memory")
+            sqlite_path = config.get("finnhub_sqlite_path") or os.path.join(
+                config["data_cache_dir"], "finnhub.sqlite"
+            )
+            _cache = FinnhubDataCache(
+                backend=backend,
+                sqlite_path=sqlite_path,
+                max_datasets=config.get("finnhub_cache_max_datasets", 64),
+            )
+        return _cache
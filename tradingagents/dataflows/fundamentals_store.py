@@ -0,0 +1,219 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Annotated, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+
+# statement -> {freq: yf.Ticker attribute}; insider transactions have no frequency
+STATEMENT_ATTRIBUTES = {
+    "balance_sheet": {"quarterly": "quarterly_balance_sheet", "annual": "balance_sheet"},
+    "cashflow": {"quarterly": "quarterly_cashflow", "annual": "cashflow"},
+    "income_stmt": {"quarterly": "quarterly_income_stmt", "annual": "income_stmt"},
+    "insider_transactions": {None: "insider_transactions"},
+}
+
+# Months covered by one fiscal period of each frequency
+PERIOD_MONTHS = {"quarterly": 3, "annual": 12}
+
+
+def normalize_freq(statement: str, freq: Optional[str]) -> Optional[str]:
+    """Map a caller's ``freq`` onto the store's keys (anything but quarterly is annual)."""
+    if statement == "insider_transactions":
+        return None
+    return "quarterly" if (freq or "quarterly").lower() == "quarterly" else "annual"
+
+
+class FundamentalsStore:
+    """Persistent yfinance fundamentals keyed by the latest fiscal period.
+
+    Each (ticker, statement, frequency) snapshot remembers the fiscal period
+    it ends with and when the next filing is due (period end + one period +
+    the filing lag). Until then every trade date is served from disk; after
+    that the statement is re-checked at most once per day. Insider
+    transactions are not period based and are refreshed daily.
+    """
+
+    def __init__(self, root_dir: str, filing_lag_days: Optional[Dict[str, int]] = None):
+        self.root_dir = root_dir
+        self.filing_lag_days = {"quarterly": 45, "annual": 90, **(filing_lag_days or {})}
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._meta_path = os.path.join(self.root_dir, "_meta.json")
+        self._meta = self._load_meta()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # public API
+    # ------------------------------------------------------------------ #
+    def get(
+        self,
+        ticker: Annotated[str, "ticker symbol of the company"],
+        statement: Annotated[str, "balance_sheet / cashflow / income_stmt / insider_transactions"],
+        freq: Annotated[Optional[str], "annual / quarterly"] = None,
+    ) -> Tuple[pd.DataFrame, str]:
+        """Return ``(statement frame, retrieval timestamp)``, fetching only when stale."""
+        ticker = ticker.upper()
+        freq = normalize_freq(statement, freq)
+        key = self._key(ticker, statement, freq)
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        with self._lock_for(key):
+            data = self._read(key)
+            entry = self._meta.get(key)
+            if data is not None and entry and self._is_fresh(entry, today):
+                return data, entry["fetched_at"]
+
+            data = self._fetch(ticker, statement, freq)
+            entry = self._write(key, data, statement, freq, today)
+            return data, entry["fetched_at"]
+
+    def prefetch(
+        self,
+        tickers: Annotated[Iterable[str], "ticker universe of the batch"],
+        statements: Annotated[Optional[Iterable[str]], "statement types, default all"] = None,
+        freqs: Annotated[Iterable[str], "frequencies to load"] = ("quarterly", "annual"),
+        max_workers: int = 8,
+    ) -> Dict[str, Dict[str, str]]:
+        """Load every statement type for every ticker concurrently.
+
+        Returns ``{ticker: {"statement/freq": "ok" | error message}}``.
+        """
+        statements = list(statements or STATEMENT_ATTRIBUTES)
+        tasks = []
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            for statement in statements:
+                for freq in ([None] if statement == "insider_transactions" else freqs):
+                    tasks.append((ticker, statement, freq))
+
+        def load(task):
+            ticker, statement, freq = task
+            try:
+                self.get(ticker, statement, freq)
+                return "ok"
+            except Exception as e:
+                return str(e)
+
+        report: Dict[str, Dict[str, str]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for (ticker, statement, freq), status in zip(tasks, executor.map(load, tasks)):
+                label = statement if freq is None else f"{statement}/{freq}"
+                report.setdefault(ticker, {})[label] = status
+        return report
+
+    # ------------------------------------------------------------------ #
+    # internals
+    # ------------------------------------------------------------------ #
+    def _is_fresh(self, entry: dict, today: str) -> bool:
+        if entry.get("checked") == today:
+            return True
+        due = entry.get("next_filing_due")
+        return due is not None and today < due
+
+    def _fetch(self, ticker: str, statement: str, freq: Optional[str]) -> pd.DataFrame:
+        # A fresh Ticker per refresh: yf.Ticker memoizes its statements, so a
+        # reused instance would keep serving the first download forever
+        data = getattr(yf.Ticker(ticker), STATEMENT_ATTRIBUTES[statement][freq])
+        if data is None:
+            return pd.DataFrame()
+        return data
+
+    def _next_filing_due(self, data: pd.DataFrame, statement: str, freq: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        if freq is None or data.empty:
+            return None, None
+        periods = pd.to_datetime(pd.Index(data.columns), errors="coerce").dropna()
+        if periods.empty:
+            return None, None
+        fiscal_period = periods.max()
+        due = (
+            fiscal_period
+            + pd.DateOffset(months=PERIOD_MONTHS[freq])
+            + pd.Timedelta(days=self.filing_lag_days[freq])
+        )
+        return fiscal_period.strftime("%Y-%m-%d"), due.strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _key(ticker: str, statement: str, freq: Optional[str]) -> str:
+        return f"{ticker}-{statement}" if freq is None else f"{ticker}-{statement}-{freq}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, f"{key}.pkl")
+
+    def _read(self, key: str) -> Optional[pd.DataFrame]:
+        if key in self._frames:
+            return self._frames[key]
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        data = pd.read_pickle(path)
+        self._frames[key] = data
+        return data
+
+    def _write(self, key: str, data: pd.DataFrame, statement: str, freq: Optional[str], today: str) -> dict:
+        path = self._path(key)
+        data.to_pickle(path + ".tmp")
+        os.replace(path + ".tmp", path)
+        self._frames[key] = data
+
+        fiscal_period, due = self._next_filing_due(data, statement, freq)
+        entry = {
+            "fetched_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "checked": today,
+            "fiscal_period": fiscal_period,
+            "next_filing_due": due,
+        }
+        with self._guard:
+            self._meta[key] = entry
+            tmp_path = self._meta_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._meta, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self._meta_path)
+        return entry
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _load_meta(self) -> dict:
+        if not os.path.exists(self._meta_path):
+            return {}
+        try:
+            with open(self._meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+
+_stores: Dict[str, FundamentalsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_fundamentals_store() -> FundamentalsStore:
+    """Return the process-wide fundamentals store for the configured directory."""
+    config = get_config()
+    root_dir = config.get("fundamentals_store_dir") or os.path.join(
+        config["data_cache_dir"], "fundamentals_store"
+    )
+    with _stores_lock:
+        if root_dir not in _stores:
+            _stores[root_dir] = FundamentalsStore(root_dir, config.get("fundamentals_filing_lag_days"))
+        return _stores[root_dir]
+
+
+def prefetch_fundamentals(
+    tickers: Annotated[Iterable[str], "ticker universe of the batch"],
+    statements: Annotated[Optional[Iterable[str]], "statement types, default all"] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Dict[str, str]]:
+    """Warm the fundamentals store for a ticker list before a batch run."""
+    if max_workers is None:
+        max_workers = get_config().get("fundamentals_prefetch_workers", 8)
+    return get_fundamentals_store().prefetch(tickers, statements, max_workers=max_workers)
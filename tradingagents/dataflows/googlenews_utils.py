@@ -1,9 +1,14 @@
+import os
 import json
+import hashlib
+import threading
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
+from urllib.parse import urlparse
 import time
 import random
+from .config import get_config
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -13,6 +18,54 @@ from tenacity import (
 )
 
 
+class HostBudget:
+    """Politeness budget for one host, shared by every thread and ticker.
+
+    At most ``max_concurrency`` requests are in flight and consecutive request
+    starts are spaced by ``min_interval`` seconds plus a random jitter, so
+    different queries can overlap without hammering the host.
+    """
+
+    def __init__(self, max_concurrency: int, min_interval: float, jitter: float):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self._slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval + random.uniform(0, self.jitter)
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._slots.release()
+        return False
+
+
+_host_budgets = {}
+_host_budgets_lock = threading.Lock()
+
+
+def get_host_budget(url: str) -> HostBudget:
+    """Return the shared politeness budget for the host of ``url``."""
+    host = urlparse(url).netloc
+    with _host_budgets_lock:
+        if host not in _host_budgets:
+            config = get_config()
+            _host_budgets[host] = HostBudget(
+                max_concurrency=config.get("google_news_max_concurrency", 2),
+                min_interval=config.get("google_news_min_interval_seconds", 1.5),
+                jitter=config.get("google_news_jitter_seconds", 1.0),
+            )
+        return _host_budgets[host]
+
+
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
     return response.status_code == 429
@@ -25,12 +78,57 @@ def is_rate_limited(response):
 )
 def make_request(url, headers):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    # Spacing, jitter and concurrency come from the host's shared budget
+    with get_host_budget(url):
+        response = requests.get(url, headers=headers, timeout=get_config().get("http_timeout_seconds", 30))
     return response
 
 
+def _page_cache_path(query, start_date, end_date, page):
+    config = get_config()
+    cache_dir = config.get("google_news_cache_dir") or os.path.join(
+        config["data_cache_dir"], "google_news_pages"
+    )
+    digest = hashlib.sha1(json.dumps([query, start_date, end_date, page]).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def _read_cached_page(query, start_date, end_date, page):
+    path = _page_cache_path(query, start_date, end_date, page)
+    try:
+        with open(path, "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Pages of a range that reaches today can still change; older ranges are final
+    end_dt = datetime.strptime(end_date, "%m/%d/%Y")
+    if end_dt.date() >= datetime.now().date():
+        ttl = get_config().get("google_news_page_ttl_seconds", 6 * 3600)
+        if time.time() - cached.get("fetched_at", 0) > ttl:
+            return None
+    return cached
+
+
+def _write_cached_page(query, start_date, end_date, page, results, has_next):
+    path = _page_cache_path(query, start_date, end_date, page)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {
+                "query": query,
+                "start_date": start_date,
+                "end_date": end_date,
+                "page": page,
+                "fetched_at": time.time(),
+                "results": results,
+                "has_next": has_next,
+            },
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
 def getNewsData(query, start_date, end_date):
     """
     Scrape Google News search results for a given query and date range.
@@ -56,6 +154,14 @@ def getNewsData(query, start_date, end_date):
     news_results = []
     page = 0
     while True:
+        cached = _read_cached_page(query, start_date, end_date, page)
+        if cached is not None:
+            news_results.extend(cached["results"])
+            if not cached["has_next"]:
+                break
+            page += 1
+            continue
+
         offset = page * 10
         url = (
             f"https://www.google.com/search?q={query}"
@@ -69,8 +175,10 @@ def getNewsData(query, start_date, end_date):
             results_on_page = soup.select("div.SoaBEf")
 
             if not results_on_page:
+                # Not cached: an empty page may also be a block/consent page
                 break  # No more results found
 
+            page_results = []
             for el in results_on_page:
                 try:
                     link = el.find("a")["href"]
@@ -78,7 +186,7 @@ def getNewsData(query, start_date, end_date):
                     snippet = el.select_one(".GI74Re").get_text()
                     date = el.select_one(".LfVVr").get_text()
                     source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
+                    page_results.append(
                         {
                             "link": link,
                             "title": title,
@@ -91,11 +199,12 @@ def getNewsData(query, start_date, end_date):
                     print(f"Error processing result: {e}")
                     # If one of the fields is not found, skip this result
                     continue
-
-            # Update the progress bar with the current count of results scraped
+            news_results.extend(page_results)
 
             # Check for the "Next" link (pagination)
             next_link = soup.find("a", id="pnnext")
+            if response.status_code == 200:
+                _write_cached_page(query, start_date, end_date, page, page_results, bool(next_link))
             if not next_link:
                 break
 
@@ -1,13 +1,21 @@
 from typing import Annotated
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
 
 # Import from vendor-specific modules
-from .local import get_YFin_data, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
-from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
+from .local import get_YFin_data_frame, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
+from .y_finance import get_YFin_price_frame, get_stock_stats_indicators_window, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
 from .google import get_google_news
 from .openai import get_stock_news_openai, get_global_news_openai, get_fundamentals_openai
 from .zhipu import get_stock_news_zhipu, get_global_news_zhipu, get_fundamentals_zhipu
 from .alpha_vantage import (
-    get_stock as get_alpha_vantage_stock,
+    get_stock_frame as get_alpha_vantage_stock_frame,
     get_indicator as get_alpha_vantage_indicator,
     get_fundamentals as get_alpha_vantage_fundamentals,
     get_balance_sheet as get_alpha_vantage_balance_sheet,
@@ -18,16 +26,21 @@ from .alpha_vantage import (
     get_news as get_alpha_vantage_news
 )
 from .alpha_vantage_common import AlphaVantageRateLimitError
+from .utils import VendorInputError
 
 # Configuration and routing logic
 from .config import get_config
+from .vendor_cache import get_vendor_cache
+from .vendor_health import get_vendor_health_registry
+from .vendor_replay import get_replay_mode, get_vendor_recording
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
     "core_stock_apis": {
         "description": "OHLCV stock price data",
         "tools": [
-            "get_stock_data"
+            "get_stock_data",
+            "get_price_frame"
         ]
     },
     "technical_indicators": {
@@ -66,11 +79,13 @@ VENDOR_LIST = [
 
 # Mapping of methods to their vendor-specific implementations
 VENDOR_METHODS = {
-    # core_stock_apis
-    "get_stock_data": {
-        "alpha_vantage": get_alpha_vantage_stock,
-        "yfinance": get_YFin_data_online,
-        "local": get_YFin_data,
+    # core_stock_apis: the get_stock_data tool and internal callers (risk
+    # manager, reflection, backtests) all read this typed frame (see market_data);
+    # vendor settings keyed by "get_stock_data" apply to it
+    "get_price_frame": {
+        "alpha_vantage": get_alpha_vantage_stock_frame,
+        "yfinance": get_YFin_price_frame,
+        "local": get_YFin_data_frame,
     },
     # technical_indicators
     "get_indicators": {
@@ -125,6 +140,11 @@ VENDOR_METHODS = {
     },
 }
 
+# Typed methods -> the tool whose ``tool_vendors`` override they share
+VENDOR_CONFIG_ALIASES = {
+    "get_price_frame": "get_stock_data",
+}
+
 def get_category_for_method(method: str) -> str:
     """Get the category that contains the specified method."""
     for category, info in TOOLS_CATEGORIES.items():
@@ -138,17 +158,386 @@ def get_vendor(category: str, method: str = None) -> str:
     """
     config = get_config()
 
-    # Check tool-level configuration first (if method provided)
+    # Check tool-level configuration first (if method provided); typed
+    # variants follow the vendor configured for their LLM-facing tool
     if method:
         tool_vendors = config.get("tool_vendors", {})
-        if method in tool_vendors:
-            return tool_vendors[method]
+        for name in (method, VENDOR_CONFIG_ALIASES.get(method)):
+            if name in tool_vendors:
+                return tool_vendors[name]
 
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
+def _call_vendor_impl(
+    method: str, category: str, vendor: str, impl_func, args: tuple, kwargs: dict, source: dict = None
+):
+    """Call one vendor implementation through the persistent response cache."""
+    cache = get_vendor_cache()
+    if cache is None or vendor in get_config().get("vendor_cache_skip_vendors", []):
+        if source is not None:
+            source["upstream"] = True
+        return impl_func(*args, **kwargs)
+    return cache.call(method, category, vendor, impl_func, args, kwargs, source=source)
+
+class _HealthReport:
+    """One-shot right to report a vendor call's health outcome.
+
+    A caller that gives up on a running ``_run_vendor`` (timeout, deadline)
+    records the failure itself; the abandoned worker then finds the report
+    taken and records nothing, so every call yields exactly one outcome.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._taken = False
+
+    def take(self) -> bool:
+        with self._lock:
+            if self._taken:
+                return False
+            self._taken = True
+            return True
+
+
+def _run_vendor(
+    method: str, category: str, vendor: str, vendor_impl, args: tuple, kwargs: dict,
+    report: _HealthReport = None,
+) -> list:
+    """Run every implementation of one vendor and return the successful results.
+
+    Every failure feeds the vendor's health except ``VendorInputError``, which
+    rejects the caller's arguments and is re-raised without being recorded.
+    Calls answered by the response cache never reached the vendor and leave
+    its health untouched, as does a call whose ``report`` its caller already
+    took after giving up on it.
+    """
+    # Handle list of methods for a vendor
+    if isinstance(vendor_impl, list):
+        vendor_methods = [(impl, vendor) for impl in vendor_impl]
+        print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
+    else:
+        vendor_methods = [(vendor_impl, vendor)]
+
+    # Several implementations run concurrently; outcomes keep declaration order
+    parallel = len(vendor_methods) > 1 and get_config().get("vendor_fanout_parallel", True)
+    # One box per implementation; the cache reports whether the vendor was contacted
+    sources = [{} for _ in vendor_methods]
+    started = time.monotonic()
+    if parallel:
+        print(f"DEBUG: Running {len(vendor_methods)} implementations of vendor '{vendor}' concurrently")
+        outcomes = _fan_out(
+            [
+                (lambda impl_func=impl_func, source=source: _call_vendor_impl(
+                    method, category, vendor, impl_func, args, kwargs, source=source
+                ))
+                for (impl_func, _), source in zip(vendor_methods, sources)
+            ],
+            _fanout_timeout(method),
+            f"fanout-{vendor}",
+        )
+
+    # Run methods for this vendor
+    vendor_results = []
+    rate_limited = False
+    last_error = None
+    for index, (impl_func, vendor_name) in enumerate(vendor_methods):
+        try:
+            if parallel:
+                ok, result = outcomes[index]
+                if not ok:
+                    raise result
+            else:
+                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
+                result = _call_vendor_impl(
+                    method, category, vendor_name, impl_func, args, kwargs, source=sources[index]
+                )
+            vendor_results.append(result)
+            print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
+
+        except AlphaVantageRateLimitError as e:
+            rate_limited = True
+            last_error = str(e)
+            if vendor == "alpha_vantage":
+                print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
+                print(f"DEBUG: Rate limit details: {e}")
+            # Continue to next vendor for fallback
+            continue
+        except Exception as e:
+            if isinstance(e, VendorInputError):
+                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' rejected the request: {e}")
+                raise
+            last_error = str(e)
+            # Log error but continue with other implementations
+            print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
+            continue
+
+    # Feed the vendor's health; a rate-limit answer opens its breaker at once
+    health = get_vendor_health_registry()
+    if report is not None and not report.take():
+        print(f"DEBUG: Vendor '{vendor}' returned after its caller gave up; outcome already recorded")
+        return vendor_results
+    # An unset box means the call never reported back (e.g. it timed out) and counts as upstream
+    if not any(source.get("upstream", True) for source in sources):
+        # Served entirely from the cache: no outcome, but free a half-open probe slot
+        health.release(vendor, method)
+        return vendor_results
+    latency = time.monotonic() - started
+    if vendor_results:
+        health.record_success(vendor, method, latency)
+    else:
+        health.record_failure(vendor, method, latency, error=last_error, trip=rate_limited)
+
+    return vendor_results
+
+def _per_method_setting(overrides: dict, method: str, default):
+    """Per-method override, falling back to the tool name the method is configured under."""
+    for name in (method, VENDOR_CONFIG_ALIASES.get(method)):
+        if name in overrides:
+            return overrides[name]
+    return default
+
+def _fanout_timeout(method: str) -> float:
+    config = get_config()
+    return _per_method_setting(
+        config.get("vendor_fanout_timeouts", {}), method, config.get("vendor_fanout_timeout_seconds", 60.0)
+    )
+
+
+def _fan_out(calls: list, timeout: float, name: str) -> list:
+    """Run ``calls`` in a bounded thread pool and return ``[(ok, result_or_error)]`` in call order.
+
+    Each call gets ``timeout`` seconds from the moment it starts running;
+    calls still running after that are abandoned with a ``TimeoutError``.
+    Abandoned calls keep their worker until they return, so calls that are
+    still queued once every wave could have used its full timeout are
+    cancelled rather than left waiting for a worker indefinitely.
+    """
+    max_workers = max(1, min(get_config().get("vendor_fanout_max_workers", 4), len(calls)))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+    started = {}
+    queue_deadline = time.monotonic() + timeout * -(-len(calls) // max_workers)
+
+    def run(index, call):
+        started[index] = time.monotonic()
+        return call()
+
+    futures = {executor.submit(run, index, call): index for index, call in enumerate(calls)}
+    outcomes = [None] * len(calls)
+    pending = set(futures)
+    try:
+        while pending:
+            expiries = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+            if len(expiries) < len(pending):
+                expiries.append(queue_deadline)
+            wait_for = max(0.0, min(expiries) - time.monotonic())
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    outcomes[futures[future]] = (True, future.result())
+                except Exception as e:
+                    outcomes[futures[future]] = (False, e)
+
+            now = time.monotonic()
+            for future in list(pending):
+                index = futures[future]
+                if index in started and now - started[index] >= timeout:
+                    pending.discard(future)
+                    future.cancel()
+                    outcomes[index] = (False, TimeoutError(f"timed out after {timeout}s"))
+                elif index not in started and now >= queue_deadline and future.cancel():
+                    pending.discard(future)
+                    outcomes[index] = (False, TimeoutError("never started: fan-out pool saturated"))
+    finally:
+        # Abandoned calls finish in the background; their results are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+    return outcomes
+
+# Hedged routing: shared worker pool and counters (see _route_hedged)
+_hedge_executor = None
+_hedge_lock = threading.Lock()
+_HEDGE_STATS = {
+    "calls": 0,
+    "hedged": 0,
+    "hedge_wins": 0,
+    "fallbacks": 0,
+    "deadline_exceeded": 0,
+}
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=get_config().get("vendor_hedge_max_workers", 8),
+                thread_name_prefix="vendor-hedge",
+            )
+        return _hedge_executor
+
+
+def get_routing_stats() -> dict:
+    """Counters of the hedged routing mode, including the hedge rate."""
+    with _hedge_lock:
+        stats = dict(_HEDGE_STATS)
+    stats["hedge_rate"] = stats["hedged"] / stats["calls"] if stats["calls"] else 0.0
+    return stats
+
+
+def _route_hedged(method: str, category: str, candidates: list, args: tuple, kwargs: dict):
+    """Race the vendors of a single-vendor config against a per-method deadline.
+
+    The primary vendor starts first. If it has not answered within the hedge
+    delay, the next fallback starts in parallel; a failed vendor starts the
+    next one immediately. The first vendor with results wins, vendors that
+    have not started yet are cancelled and late results are discarded.
+    """
+    config = get_config()
+    hedge_delay = config.get("vendor_hedge_delay_seconds", 5.0)
+    deadline_seconds = _per_method_setting(
+        config.get("vendor_deadlines", {}), method, config.get("vendor_default_deadline_seconds", 90.0)
+    )
+    deadline = time.monotonic() + deadline_seconds
+    executor = _get_hedge_executor()
+
+    queue = list(candidates)
+    pending = {}
+    launched = []
+    reports = {}
+
+    health = get_vendor_health_registry()
+
+    def launch():
+        while queue and not health.allow(queue[0], method):
+            print(f"INFO: Circuit open for vendor '{queue[0]}' on {method}, skipping")
+            queue.pop(0)
+        if not queue:
+            return
+        vendor = queue.pop(0)
+        launched.append(vendor)
+        print(f"DEBUG: Starting vendor '{vendor}' for {method} (hedged, #{len(launched)})")
+        reports[vendor] = _HealthReport()
+        future = executor.submit(
+            _run_vendor, method, category, vendor, VENDOR_METHODS[method][vendor], args, kwargs, reports[vendor]
+        )
+        pending[future] = vendor
+
+    with _hedge_lock:
+        _HEDGE_STATS["calls"] += 1
+    launch()
+    next_hedge = time.monotonic() + hedge_delay
+
+    while pending:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        timeout = deadline - now
+        if queue:
+            timeout = min(timeout, max(0.0, next_hedge - now))
+        done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            vendor = pending.pop(future)
+            try:
+                vendor_results = future.result()
+            except Exception as e:
+                if isinstance(e, VendorInputError):
+                    for other in pending:
+                        other.cancel()
+                    raise
+                print(f"FAILED: Vendor '{vendor}' failed: {e}")
+                vendor_results = []
+
+            if vendor_results:
+                for other in pending:
+                    other.cancel()
+                with _hedge_lock:
+                    if vendor != launched[0]:
+                        _HEDGE_STATS["hedge_wins"] += 1
+                print(f"SUCCESS: Vendor '{vendor}' won the hedged request for {method}")
+                if len(vendor_results) == 1 or isinstance(vendor_results[0], pd.DataFrame):
+                    return vendor_results[0]
+                return '\n'.join(str(result) for result in vendor_results)
+
+            print(f"FAILED: Vendor '{vendor}' produced no results")
+            if queue:
+                with _hedge_lock:
+                    _HEDGE_STATS["fallbacks"] += 1
+                launch()
+                next_hedge = time.monotonic() + hedge_delay
+
+        if not done and queue and time.monotonic() >= next_hedge:
+            print(f"HEDGE: No answer for {method} after {hedge_delay}s, starting next vendor in parallel")
+            with _hedge_lock:
+                _HEDGE_STATS["hedged"] += 1
+            launch()
+            next_hedge = time.monotonic() + hedge_delay
+
+    for future in pending:
+        future.cancel()
+    if pending:
+        with _hedge_lock:
+            _HEDGE_STATS["deadline_exceeded"] += 1
+        # A vendor that blew the deadline counts as failed for its breaker,
+        # unless it finished in the meantime and recorded its own outcome
+        for vendor in pending.values():
+            if reports[vendor].take():
+                health.record_failure(vendor, method, deadline_seconds, error="deadline exceeded")
+        print(f"FAILURE: Deadline of {deadline_seconds}s exceeded for method '{method}'")
+        raise RuntimeError(f"Deadline of {deadline_seconds}s exceeded for method '{method}'")
+    print(f"FAILURE: All {len(launched)} vendor attempts failed for method '{method}'")
+    raise RuntimeError(f"All vendor implementations failed for method '{method}'")
+
 def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    With ``vendor_replay_mode="record"`` every successful response is also
+    written to the replay archive; with ``"replay"`` responses come only from
+    that archive (no vendor is called) and a missing recording raises
+    ``VendorReplayMissError``.
+    """
+    mode = get_replay_mode()
+    if mode == "replay":
+        return get_vendor_recording().replay(method, args, kwargs)
+
+    result = _route_live(method, *args, **kwargs)
+    if mode == "record":
+        get_vendor_recording().record(method, args, kwargs, result)
+    return result
+
+# Async entry points: blocking vendor calls run on a dedicated bounded pool
+_async_executor = None
+_async_lock = threading.Lock()
+
+
+def _get_async_executor() -> ThreadPoolExecutor:
+    global _async_executor
+    with _async_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(
+                max_workers=get_config().get("vendor_async_max_workers", 16),
+                thread_name_prefix="vendor-async",
+            )
+        return _async_executor
+
+
+async def arun_vendor_io(func, *args, **kwargs):
+    """Await a blocking dataflow call without blocking the event loop.
+
+    All coroutines share one bounded pool (``vendor_async_max_workers``), so
+    many graph runs on the same loop cannot open unbounded vendor traffic.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(_get_async_executor(), call)
+
+
+async def aroute_to_vendor(method: str, *args, **kwargs):
+    """Async variant of ``route_to_vendor`` (same caching, health, replay and fallback)."""
+    return await arun_vendor_io(route_to_vendor, method, *args, **kwargs)
+
+def _route_live(method: str, *args, **kwargs):
+    """Call the configured vendors for ``method`` (health-ordered, cached, with fallback)."""
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
 
@@ -167,11 +556,27 @@ def route_to_vendor(method: str, *args, **kwargs):
         if vendor not in fallback_vendors:
             fallback_vendors.append(vendor)
 
+    # Degraded vendors move behind healthy ones (single-vendor configs only;
+    # comma-separated configs keep their order because results are concatenated)
+    health = get_vendor_health_registry()
+    if len(primary_vendors) == 1:
+        fallback_vendors = health.order(method, fallback_vendors)
+
     # Debug: Print fallback ordering
     primary_str = " → ".join(primary_vendors)
     fallback_str = " → ".join(fallback_vendors)
     print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
 
+    # Hedged mode only applies to single-vendor configs; comma-separated
+    # configs collect from every vendor and keep the sequential path
+    if get_config().get("vendor_routing_mode", "sequential") == "hedged" and len(primary_vendors) == 1:
+        candidates = [v for v in fallback_vendors if v in VENDOR_METHODS[method]]
+        return _route_hedged(method, category, candidates, args, kwargs)
+
+    # Comma-separated configs collect from every vendor; do it concurrently
+    if len(primary_vendors) > 1 and get_config().get("vendor_fanout_parallel", True):
+        return _route_fanout(method, category, fallback_vendors, args, kwargs)
+
     # Track results and execution state
     results = []
     vendor_attempt_count = 0
@@ -184,6 +589,10 @@ def route_to_vendor(method: str, *args, **kwargs):
                 print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
             continue
 
+        if not health.allow(vendor, method):
+            print(f"INFO: Circuit open for vendor '{vendor}' on {method}, skipping")
+            continue
+
         vendor_impl = VENDOR_METHODS[method][vendor]
         is_primary_vendor = vendor in primary_vendors
         vendor_attempt_count += 1
@@ -196,32 +605,7 @@ def route_to_vendor(method: str, *args, **kwargs):
         vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
         print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
 
-        # Handle list of methods for a vendor
-        if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
-        else:
-            vendor_methods = [(vendor_impl, vendor)]
-
-        # Run methods for this vendor
-        vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
-                continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
-                continue
+        vendor_results = _run_vendor(method, category, vendor, vendor_impl, args, kwargs)
 
         # Add this vendor's results
         if vendor_results:
@@ -245,8 +629,58 @@ def route_to_vendor(method: str, *args, **kwargs):
     else:
         print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
 
-    # Return single result if only one, otherwise concatenate as string
-    if len(results) == 1:
+    return _combine_results(results)
+
+def _route_fanout(method: str, category: str, vendors: list, args: tuple, kwargs: dict):
+    """Collect from every vendor of a multi-vendor config concurrently, merged in config order."""
+    health = get_vendor_health_registry()
+    candidates = []
+    for vendor in vendors:
+        if vendor not in VENDOR_METHODS[method]:
+            continue
+        if not health.allow(vendor, method):
+            print(f"INFO: Circuit open for vendor '{vendor}' on {method}, skipping")
+            continue
+        candidates.append(vendor)
+
+    print(f"DEBUG: Fanning out {method} to vendors [{', '.join(candidates)}] concurrently")
+    timeout = _fanout_timeout(method)
+    reports = [_HealthReport() for _ in candidates]
+    outcomes = _fan_out(
+        [
+            (lambda vendor=vendor, report=report: _run_vendor(
+                method, category, vendor, VENDOR_METHODS[method][vendor], args, kwargs, report
+            ))
+            for vendor, report in zip(candidates, reports)
+        ],
+        timeout,
+        f"fanout-{method}",
+    )
+
+    results = []
+    for vendor, report, (ok, value) in zip(candidates, reports, outcomes):
+        if ok and value:
+            results.extend(value)
+            print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(value)} result(s)")
+            continue
+        if not ok and isinstance(value, VendorInputError):
+            raise value
+        if not ok and report.take():
+            # A vendor that blew its timeout counts as failed for its breaker;
+            # the abandoned worker finds the report taken and records nothing
+            health.record_failure(vendor, method, timeout, error=str(value))
+        print(f"FAILED: Vendor '{vendor}' produced no results")
+
+    if not results:
+        print(f"FAILURE: All {len(candidates)} vendor attempts failed for method '{method}'")
+        raise RuntimeError(f"All vendor implementations failed for method '{method}'")
+    print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {len(candidates)} vendor attempt(s)")
+    return _combine_results(results)
+
+def _combine_results(results: list):
+    # Return single result if only one, otherwise concatenate as string;
+    # typed (DataFrame) results are never concatenated, the first vendor wins
+    if len(results) == 1 or isinstance(results[0], pd.DataFrame):
         return results[0]
     else:
         # Convert all results to strings and concatenate
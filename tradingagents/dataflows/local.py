@@ -6,6 +6,9 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
 from .reddit_utils import fetch_top_from_category
+from .simfin_store import get_simfin_store
+from .finnhub_store import get_finnhub_cache, dedupe_entries
+from .market_data import to_price_frame, slice_price_frame
 from tqdm import tqdm
 
 def get_YFin_data_window(
@@ -82,6 +85,16 @@ def get_YFin_data(
 
     return filtered_data
 
+def get_YFin_data_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format, exclusive"],
+) -> pd.DataFrame:
+    """Typed OHLCV frame from the local price CSV (``end_date`` exclusive)."""
+    # get_YFin_data filters inclusively and rejects ends past the CSV's range
+    last_day = (datetime.strptime(end_date, "%Y-%m-%d") - relativedelta(days=1)).strftime("%Y-%m-%d")
+    return slice_price_frame(to_price_frame(get_YFin_data(symbol, start_date, last_day)), start_date, end_date)
+
 def get_finnhub_news(
     query: Annotated[str, "Search query or ticker symbol"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -140,12 +153,8 @@ def get_finnhub_company_insider_sentiment(
         return ""
 
     result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    for entry in dedupe_entries(data):
+        result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -178,12 +187,8 @@ def get_finnhub_company_insider_transactions(
 
     result_str = ""
 
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    for entry in dedupe_entries(data):
+        result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -214,15 +219,9 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
-
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    # Parsed once and kept as a sorted date index (see finnhub_store); the
+    # range lookup is a bisect instead of a scan over every date key
+    return get_finnhub_cache().get_range(data_path, start_date, end_date)
 
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
@@ -232,35 +231,14 @@ def get_simfin_balance_sheet(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "balance_sheet",
-        "companies",
-        "us",
-        f"us-balance-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Point-in-time lookup on the per-ticker partition (latest Publish Date <= curr_date)
+    latest_balance_sheet = get_simfin_store().as_of("balance_sheet", freq, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -279,35 +257,14 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "cash_flow",
-        "companies",
-        "us",
-        f"us-cashflow-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Point-in-time lookup on the per-ticker partition (latest Publish Date <= curr_date)
+    latest_cash_flow = get_simfin_store().as_of("cash_flow", freq, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -326,35 +283,14 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "income_statements",
-        "companies",
-        "us",
-        f"us-income-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Point-in-time lookup on the per-ticker partition (latest Publish Date <= curr_date)
+    latest_income = get_simfin_store().as_of("income_statements", freq, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -365,6 +301,18 @@ def get_simfin_income_statements(
     )
 
 
+def get_simfin_statements_batch(
+    statement: Annotated[str, "balance_sheet / cash_flow / income_statements"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+    requests: Annotated[list, "(ticker, yyyy-mm-dd) pairs, e.g. every decision date of a backtest"],
+) -> pd.DataFrame:
+    """Point-in-time SimFin statements for many (ticker, date) pairs in one pass."""
+    return get_simfin_store().as_of_batch(statement, freq, requests)
+
+
 def get_reddit_global_news(
     curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "Number of days to look back"] = 7,
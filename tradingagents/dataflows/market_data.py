@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import Annotated
+
+import pandas as pd
+
+# Fixed schema of every typed price frame, whatever vendor produced it
+PRICE_FRAME_SCHEMA = {
+    "date": "datetime64[ns]",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+}
+
+# Vendor column spellings -> schema column
+_COLUMN_ALIASES = {
+    "date": "date",
+    "datetime": "date",
+    "timestamp": "date",
+    "open": "open",
+    "high": "high",
+    "low": "low",
+    "close": "close",
+    "volume": "volume",
+}
+
+
+def empty_price_frame() -> pd.DataFrame:
+    return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in PRICE_FRAME_SCHEMA.items()})
+
+
+def to_price_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a vendor price table into the fixed schema.
+
+    Column names are matched case-insensitively (``Date``/``timestamp`` become
+    ``date``); extra columns such as ``Adj Close`` or dividends are dropped.
+    Dates are tz-naive midnight timestamps, rows are sorted and unique.
+    """
+    if data is None or data.empty:
+        return empty_price_frame()
+
+    if not any(str(c).strip().lower() in ("date", "datetime", "timestamp") for c in data.columns):
+        data = data.reset_index()
+    renamed = {}
+    for column in data.columns:
+        target = _COLUMN_ALIASES.get(str(column).strip().lower())
+        if target is not None and target not in renamed.values():
+            renamed[column] = target
+    if "date" not in renamed.values():
+        raise ValueError(f"Price table has no date column: {list(data.columns)}")
+    frame = data[list(renamed)].rename(columns=renamed)
+
+    dates = pd.to_datetime(frame["date"], errors="coerce")
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_localize(None)
+    frame = frame.assign(date=dates.dt.normalize()).dropna(subset=["date"])
+
+    for name, dtype in PRICE_FRAME_SCHEMA.items():
+        if name == "date":
+            continue
+        if name in frame.columns:
+            frame[name] = pd.to_numeric(frame[name], errors="coerce").astype(dtype)
+        else:
+            frame[name] = pd.Series(float("nan"), index=frame.index, dtype=dtype)
+
+    frame = frame[list(PRICE_FRAME_SCHEMA)]
+    frame = frame.drop_duplicates(subset="date", keep="last").sort_values("date")
+    return frame.reset_index(drop=True).astype(PRICE_FRAME_SCHEMA)
+
+
+def slice_price_frame(frame: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    """Keep rows with ``start_date <= date < end_date`` (end exclusive, like yfinance)."""
+    mask = (frame["date"] >= pd.Timestamp(start_date)) & (frame["date"] < pd.Timestamp(end_date))
+    return frame[mask].reset_index(drop=True)
+
+
+def format_price_frame(
+    frame: pd.DataFrame,
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> str:
+    """Render a typed price frame as the CSV text the agents read."""
+    if frame.empty:
+        return f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
+
+    data = frame.rename(columns={name: name.capitalize() for name in PRICE_FRAME_SCHEMA}).set_index("Date")
+
+    # Round numerical values to 2 decimal places for cleaner display
+    for col in ["Open", "High", "Low", "Close"]:
+        data[col] = data[col].round(2)
+    data["Volume"] = data["Volume"].round().astype("Int64")
+
+    header = f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
+    header += f"# Total records: {len(data)}\n"
+    header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    return header + data.to_csv()
+
+
+def get_price_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format, exclusive"],
+) -> pd.DataFrame:
+    """Daily OHLCV bars as a typed frame from the configured core_stock_apis vendor.
+
+    This is the only price route: the ``get_stock_data`` tool renders this
+    frame as text (passing the day after its inclusive ``end_date``), and
+    internal code paths (risk manager, delayed reflection, backtests) use it
+    directly.
+    """
+    from .interface import route_to_vendor
+
+    return route_to_vendor("get_price_frame", symbol, start_date, end_date)
@@ -0,0 +1,504 @@
+import os
+import json
+import glob
+import hashlib
+import threading
+from datetime import datetime
+from typing import Annotated, Callable, Dict, Iterable, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+
+# Parquet is preferred when pyarrow is installed; otherwise fall back to pickle,
+# which still keeps the frame in pandas' native columnar blocks.
+try:
+    import pyarrow  # noqa: F401
+
+    _STORE_EXT = "parquet"
+except ImportError:
+    _STORE_EXT = "pkl"
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+HISTORY_YEARS = 15
+# Relative tolerance when comparing the overlapping bar of a tail fetch against
+# the stored history. A larger drift means yfinance re-adjusted the series
+# (split/dividend) and the whole history has to be downloaded again.
+ADJUSTMENT_TOLERANCE = 1e-3
+
+
+class PriceStore:
+    """Persistent per-symbol daily OHLCV store.
+
+    Each ticker keeps exactly one canonical history file under ``root_dir``.
+    ``ensure`` downloads the full 15-year history the first time a symbol is
+    seen and afterwards only fetches the bars after the last stored date, at
+    most once per calendar day.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._meta_path = os.path.join(self.root_dir, "_meta.json")
+        self._meta = self._load_meta()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # public API
+    # ------------------------------------------------------------------ #
+    def get_history(
+        self,
+        symbol: Annotated[str, "ticker symbol of the company"],
+        start_date: Annotated[Optional[str], "inclusive start date, yyyy-mm-dd"] = None,
+        end_date: Annotated[Optional[str], "inclusive end date, yyyy-mm-dd"] = None,
+    ) -> pd.DataFrame:
+        """Return a copy of the stored bars between ``start_date`` and ``end_date``."""
+        data = self.ensure(symbol)
+        if data.empty:
+            return data.copy()
+
+        dates = data["Date"]
+        lo = 0 if start_date is None else dates.searchsorted(pd.Timestamp(start_date), side="left")
+        hi = len(data) if end_date is None else dates.searchsorted(pd.Timestamp(end_date), side="right")
+        return data.iloc[lo:hi].reset_index(drop=True)
+
+    def ensure(self, symbol: Annotated[str, "ticker symbol of the company"]) -> pd.DataFrame:
+        """Make sure the history for ``symbol`` is current and return it."""
+        symbol = symbol.upper()
+        today = pd.Timestamp.today().normalize()
+        today_str = today.strftime("%Y-%m-%d")
+
+        with self._lock_for(symbol):
+            data = self._read(symbol)
+            if data is not None and self._meta.get(symbol, {}).get("checked") == today_str:
+                return data
+
+            if data is None or data.empty:
+                data = self._download(symbol, today - pd.DateOffset(years=HISTORY_YEARS), today)
+                _purge_legacy_csv(symbol)
+            else:
+                data = self._extend(symbol, data, today)
+
+            self._write(symbol, data, checked=today_str)
+            return data
+
+    def put(self, symbol: Annotated[str, "ticker symbol of the company"], bars: pd.DataFrame) -> pd.DataFrame:
+        """Merge externally downloaded bars (e.g. a bulk download) into the store."""
+        symbol = symbol.upper()
+        bars = _normalize(bars)
+        with self._lock_for(symbol):
+            existing = self._read(symbol)
+            merged = bars if existing is None else _merge(existing, bars)
+            checked = self._meta.get(symbol, {}).get("checked")
+            self._write(symbol, merged, checked=checked)
+            return merged
+
+    def last_date(self, symbol: Annotated[str, "ticker symbol of the company"]) -> Optional[str]:
+        """Return the date of the last stored bar without touching the network."""
+        data = self._read(symbol.upper())
+        if data is None or data.empty:
+            return None
+        return data["Date"].iloc[-1].strftime("%Y-%m-%d")
+
+    def warm(self, symbols: Annotated[Iterable[str], "ticker universe of a batch"]) -> Dict[str, str]:
+        """Bring many symbols up to date with multi-symbol ``yf.download`` calls.
+
+        New symbols are fetched over the full history horizon in one request,
+        already stored ones from their oldest last bar in a second request.
+        Symbols brought current are marked as checked today, so later
+        ``ensure`` calls are local reads. Returns ``{symbol: status}`` where
+        status is "ok", "cached" or the reason it could not be fetched.
+        """
+        today = pd.Timestamp.today().normalize()
+        today_str = today.strftime("%Y-%m-%d")
+        report: Dict[str, str] = {}
+        new_symbols, stale = [], {}
+
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            data = self._read(symbol)
+            if data is None or data.empty:
+                new_symbols.append(symbol)
+            elif self._meta.get(symbol, {}).get("checked") == today_str:
+                report[symbol] = "cached"
+            elif data["Date"].iloc[-1] >= today - pd.Timedelta(days=1):
+                with self._lock_for(symbol):
+                    self._write(symbol, data, checked=today_str)
+                report[symbol] = "cached"
+            else:
+                stale[symbol] = data
+
+        groups = []
+        if new_symbols:
+            groups.append((new_symbols, today - pd.DateOffset(years=HISTORY_YEARS)))
+        if stale:
+            groups.append((list(stale), min(d["Date"].iloc[-1] for d in stale.values())))
+
+        for group, start in groups:
+            try:
+                frame = yf.download(
+                    group,
+                    start=start.strftime("%Y-%m-%d"),
+                    end=today.strftime("%Y-%m-%d"),
+                    group_by="ticker",
+                    auto_adjust=True,
+                    progress=False,
+                    threads=True,
+                    timeout=get_config().get("http_timeout_seconds", 30),
+                )
+            except Exception as e:
+                for symbol in group:
+                    report[symbol] = f"download failed: {e}"
+                continue
+
+            for symbol in group:
+                bars = _split_bulk_frame(frame, symbol)
+                if bars.empty:
+                    report[symbol] = "no data returned"
+                    continue
+                with self._lock_for(symbol):
+                    if symbol in stale:
+                        merged = _apply_tail(stale[symbol], bars)
+                        if merged is None:
+                            # Re-adjusted upstream: leave it to ``ensure`` to refetch in full
+                            report[symbol] = "history re-adjusted, will refresh on first use"
+                            continue
+                    else:
+                        merged = bars
+                        _purge_legacy_csv(symbol)
+                    self._write(symbol, merged, checked=today_str)
+                report[symbol] = "ok"
+        return report
+
+    # ------------------------------------------------------------------ #
+    # internals
+    # ------------------------------------------------------------------ #
+    def _extend(self, symbol: str, data: pd.DataFrame, today: pd.Timestamp) -> pd.DataFrame:
+        last = data["Date"].iloc[-1]
+        if last >= today - pd.Timedelta(days=1):
+            return data
+
+        # Re-fetch the last stored bar together with the tail so that a
+        # re-adjusted history can be detected.
+        tail = self._download(symbol, last, today)
+        merged = _apply_tail(data, tail)
+        if merged is None:
+            print(f"INFO: {symbol} history was re-adjusted upstream, refreshing full price history")
+            return self._download(symbol, today - pd.DateOffset(years=HISTORY_YEARS), today)
+        return merged
+
+    def _download(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        # yfinance treats ``end`` as exclusive, so today's (possibly still open)
+        # bar is never written to the store.
+        data = yf.download(
+            symbol,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+            timeout=get_config().get("http_timeout_seconds", 30),
+        )
+        if data is None or data.empty:
+            return _empty_frame()
+        return _normalize(data.reset_index())
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.root_dir, f"{symbol}.{_STORE_EXT}")
+
+    def _read(self, symbol: str) -> Optional[pd.DataFrame]:
+        if symbol in self._frames:
+            return self._frames[symbol]
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        if _STORE_EXT == "parquet":
+            data = pd.read_parquet(path)
+        else:
+            data = pd.read_pickle(path)
+        self._frames[symbol] = data
+        return data
+
+    def _write(self, symbol: str, data: pd.DataFrame, checked: Optional[str]) -> None:
+        path = self._path(symbol)
+        tmp_path = path + ".tmp"
+        if _STORE_EXT == "parquet":
+            data.to_parquet(tmp_path, index=False)
+        else:
+            data.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        self._frames[symbol] = data
+
+        with self._guard:
+            entry = {"rows": int(len(data))}
+            if not data.empty:
+                entry["last_date"] = data["Date"].iloc[-1].strftime("%Y-%m-%d")
+            if checked:
+                entry["checked"] = checked
+            self._meta[symbol] = entry
+            self._save_meta()
+
+    def _lock_for(self, symbol: str) -> threading.Lock:
+        with self._guard:
+            if symbol not in self._locks:
+                self._locks[symbol] = threading.Lock()
+            return self._locks[symbol]
+
+    def _load_meta(self) -> dict:
+        if not os.path.exists(self._meta_path):
+            return {}
+        try:
+            with open(self._meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_meta(self) -> None:
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._meta, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._meta_path)
+
+
+def _empty_frame() -> pd.DataFrame:
+    frame = pd.DataFrame(columns=["Date"] + PRICE_COLUMNS)
+    frame["Date"] = pd.to_datetime(frame["Date"])
+    return frame
+
+
+def _normalize(data: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a yfinance frame into the store schema: naive ``Date`` + OHLCV, sorted, unique."""
+    if "Date" not in data.columns:
+        data = data.reset_index().rename(columns={"index": "Date", "Datetime": "Date"})
+    data = data.copy()
+    data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
+    if getattr(data["Date"].dt, "tz", None) is not None:
+        data["Date"] = data["Date"].dt.tz_localize(None)
+    data["Date"] = data["Date"].dt.normalize()
+    data = data.dropna(subset=["Date"])
+
+    columns = ["Date"] + [c for c in PRICE_COLUMNS if c in data.columns]
+    data = data[columns]
+    data = data.drop_duplicates(subset="Date", keep="last").sort_values("Date")
+    return data.reset_index(drop=True)
+
+
+def _merge(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    merged = pd.concat([existing, new], ignore_index=True)
+    merged = merged.drop_duplicates(subset="Date", keep="last").sort_values("Date")
+    return merged.reset_index(drop=True)
+
+
+def _apply_tail(data: pd.DataFrame, tail: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Merge a tail fetch that starts at the last stored bar.
+
+    Returns None when the overlapping bar drifted, i.e. the upstream history
+    was re-adjusted and has to be downloaded again in full.
+    """
+    if tail.empty:
+        return data
+    last = data["Date"].iloc[-1]
+    overlap = tail[tail["Date"] == last]
+    if not overlap.empty:
+        stored_close = float(data["Close"].iloc[-1])
+        fetched_close = float(overlap["Close"].iloc[0])
+        if stored_close and abs(fetched_close - stored_close) / abs(stored_close) > ADJUSTMENT_TOLERANCE:
+            return None
+    return _merge(data, tail)
+
+
+def _split_bulk_frame(frame: Optional[pd.DataFrame], symbol: str) -> pd.DataFrame:
+    """Extract one symbol's bars from a multi-symbol ``yf.download`` frame."""
+    if frame is None or frame.empty:
+        return _empty_frame()
+    if isinstance(frame.columns, pd.MultiIndex):
+        if symbol not in frame.columns.get_level_values(0):
+            return _empty_frame()
+        bars = frame[symbol]
+    else:
+        bars = frame
+    bars = bars.dropna(how="all")
+    if bars.empty:
+        return _empty_frame()
+    return _normalize(bars.reset_index())
+
+
+def _purge_legacy_csv(symbol: str) -> None:
+    """Delete the old ``{symbol}-YFin-data-{start}-{end}.csv`` snapshots from the data cache."""
+    cache_dir = get_config().get("data_cache_dir")
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return
+    for path in glob.glob(os.path.join(cache_dir, f"{symbol}-YFin-data-*.csv")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class IndicatorSeriesStore:
+    """Persistent full-history indicator series, one file per (symbol, function, params).
+
+    Vendors that compute indicators server-side (Alpha Vantage) return the whole
+    series in one response. The series is stored once and look-back windows
+    are served by slicing it; it is only fetched again when a request needs a
+    date past the last stored one, and then at most once per calendar day.
+    Values are kept exactly as the vendor sent them.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._meta_path = os.path.join(self.root_dir, "_meta.json")
+        self._meta = _load_json(self._meta_path)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def get(
+        self,
+        symbol: Annotated[str, "ticker symbol of the company"],
+        function_name: Annotated[str, "vendor function, e.g. SMA or MACD"],
+        params: Annotated[dict, "vendor parameters that define the series"],
+        fetch: Callable[[], pd.DataFrame],
+        needed_through: Annotated[Optional[str], "latest yyyy-mm-dd the caller needs"] = None,
+    ) -> pd.DataFrame:
+        """Return the stored series (index: ascending yyyy-mm-dd), fetching it if required."""
+        key = self._key(symbol, function_name, params)
+        today = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+        with self._lock_for(key):
+            data = self._read(key)
+            entry = self._meta.get(key, {})
+            covered = data is not None and not data.empty and (
+                needed_through is None or str(data.index[-1]) >= needed_through
+            )
+            if data is not None and (covered or entry.get("checked") == today):
+                return data
+
+            try:
+                fresh = fetch().sort_index()
+            except Exception:
+                if data is None:
+                    raise
+                print(f"INFO: Refreshing {function_name} for {symbol} failed, serving the stored series")
+                return data
+
+            self._write(key, fresh, {
+                "symbol": symbol.upper(),
+                "function": function_name,
+                "params": {k: str(v) for k, v in sorted(params.items())},
+                "checked": today,
+                "rows": int(len(fresh)),
+            })
+            return fresh
+
+    @staticmethod
+    def _key(symbol: str, function_name: str, params: dict) -> str:
+        # Credentials and output format do not define the series
+        relevant = {k: str(v) for k, v in sorted(params.items()) if k not in ("apikey", "datatype", "symbol")}
+        digest = hashlib.sha1(json.dumps(relevant, sort_keys=True).encode()).hexdigest()[:10]
+        return f"{symbol.upper()}-{function_name}-{digest}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, f"{key}.{_STORE_EXT}")
+
+    def _read(self, key: str) -> Optional[pd.DataFrame]:
+        if key in self._frames:
+            return self._frames[key]
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        data = pd.read_parquet(path) if _STORE_EXT == "parquet" else pd.read_pickle(path)
+        self._frames[key] = data
+        return data
+
+    def _write(self, key: str, data: pd.DataFrame, entry: dict) -> None:
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        if _STORE_EXT == "parquet":
+            data.to_parquet(tmp_path)
+        else:
+            data.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        self._frames[key] = data
+        with self._guard:
+            self._meta[key] = entry
+            tmp_meta = self._meta_path + ".tmp"
+            with open(tmp_meta, "w") as f:
+                json.dump(self._meta, f, indent=2, sort_keys=True)
+            os.replace(tmp_meta, self._meta_path)
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+
+def _load_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+_stores: Dict[str, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Return the process-wide price store for the configured directory."""
+    config = get_config()
+    root_dir = config.get("price_store_dir") or os.path.join(
+        config["data_cache_dir"], "price_store"
+    )
+    with _stores_lock:
+        if root_dir not in _stores:
+            _stores[root_dir] = PriceStore(root_dir)
+        return _stores[root_dir]
+
+
+_indicator_stores: Dict[str, IndicatorSeriesStore] = {}
+
+
+def get_indicator_series_store() -> IndicatorSeriesStore:
+    """Return the process-wide indicator series store (``indicators/`` under the price store)."""
+    config = get_config()
+    root_dir = os.path.join(
+        config.get("price_store_dir") or os.path.join(config["data_cache_dir"], "price_store"),
+        "indicators",
+    )
+    with _stores_lock:
+        if root_dir not in _indicator_stores:
+            _indicator_stores[root_dir] = IndicatorSeriesStore(root_dir)
+        return _indicator_stores[root_dir]
+
+
+# Data tools whose yfinance implementation reads the price store
+PRICE_STORE_TOOLS = ("get_stock_data", "get_indicators")
+
+
+def price_store_in_use() -> bool:
+    """Whether the configured price or indicator vendor is yfinance (the price store's source)."""
+    from .interface import get_category_for_method, get_vendor
+
+    return any(
+        "yfinance" in (v.strip() for v in get_vendor(get_category_for_method(tool), tool).split(","))
+        for tool in PRICE_STORE_TOOLS
+    )
+
+
+def warm_price_store(symbols: Annotated[Iterable[str], "ticker universe of a batch"]) -> Dict[str, str]:
+    """Bulk-refresh the price store for a batch before per-ticker work starts.
+
+    Returns an empty report without downloading anything when neither prices
+    nor indicators come from yfinance.
+    """
+    if not price_store_in_use():
+        return {}
+    return get_price_store().warm(symbols)
@@ -6,6 +6,7 @@ from contextlib import contextmanager
 from typing import Annotated
 import os
 import re
+import threading
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,6 +50,131 @@ ticker_to_company = {
 }
 
 
+def _search_terms(query: str) -> list:
+    if "OR" in ticker_to_company[query]:
+        search_terms = ticker_to_company[query].split(" OR ")
+    else:
+        search_terms = [ticker_to_company[query]]
+    search_terms.append(query)
+    return search_terms
+
+
+# Compiled once instead of per term per post
+_TICKER_PATTERNS = {
+    ticker: [re.compile(term, re.IGNORECASE) for term in _search_terms(ticker)]
+    for ticker in ticker_to_company
+}
+
+
+class RedditIndex:
+    """Per-date, per-ticker index over the subreddit JSONL dumps of one category.
+
+    Every file is parsed once. For each subreddit file the posts of a date are
+    kept sorted by upvotes (stable, so ties keep file order), which makes the
+    top-N of any date a simple prefix. In company categories each post is also
+    filed under every ticker it mentions, using the same search terms as the
+    former per-post ``re.search`` scan.
+    """
+
+    def __init__(self, category_path: str, signature: tuple, company: bool):
+        self.category_path = category_path
+        self.signature = signature
+        self.company = company
+        self.file_count = len(signature)
+        # file name -> date -> posts sorted by upvotes
+        self.by_date: dict = {}
+        # file name -> (date, ticker) -> posts sorted by upvotes
+        self.by_ticker: dict = {}
+        self._build()
+
+    def top_posts(self, date: str, max_limit: int, query: str = None) -> list:
+        if max_limit < self.file_count:
+            raise ValueError(
+                "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+            )
+        limit_per_subreddit = max_limit // self.file_count
+
+        all_content = []
+        for data_file, _, _ in self.signature:
+            if not data_file.endswith(".jsonl"):
+                continue
+            if query and self.company:
+                if query not in _TICKER_PATTERNS:
+                    if self.by_date[data_file].get(date):
+                        # same failure as looking the query up per post
+                        raise KeyError(query)
+                    continue
+                posts = self.by_ticker[data_file].get((date, query), [])
+            else:
+                posts = self.by_date[data_file].get(date, [])
+            all_content.extend(dict(post) for post in posts[:limit_per_subreddit])
+        return all_content
+
+    def _build(self) -> None:
+        for data_file, _, _ in self.signature:
+            if not data_file.endswith(".jsonl"):
+                continue
+            by_date = {}
+            by_ticker = {}
+            with open(os.path.join(self.category_path, data_file), "rb") as f:
+                for line in f:
+                    # skip empty lines
+                    if not line.strip():
+                        continue
+
+                    parsed_line = json.loads(line)
+                    post_date = datetime.utcfromtimestamp(
+                        parsed_line["created_utc"]
+                    ).strftime("%Y-%m-%d")
+                    post = {
+                        "title": parsed_line["title"],
+                        "content": parsed_line["selftext"],
+                        "url": parsed_line["url"],
+                        "upvotes": parsed_line["ups"],
+                        "posted_date": post_date,
+                    }
+                    by_date.setdefault(post_date, []).append(post)
+
+                    if self.company:
+                        title = parsed_line["title"]
+                        selftext = parsed_line["selftext"]
+                        for ticker, patterns in _TICKER_PATTERNS.items():
+                            if any(p.search(title) or p.search(selftext) for p in patterns):
+                                by_ticker.setdefault((post_date, ticker), []).append(post)
+
+            for posts in by_date.values():
+                posts.sort(key=lambda x: x["upvotes"], reverse=True)
+            for posts in by_ticker.values():
+                posts.sort(key=lambda x: x["upvotes"], reverse=True)
+            self.by_date[data_file] = by_date
+            self.by_ticker[data_file] = by_ticker
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _category_signature(category_path: str) -> tuple:
+    """(name, mtime, size) of every entry, in ``os.listdir`` order."""
+    signature = []
+    for name in os.listdir(category_path):
+        stat = os.stat(os.path.join(category_path, name))
+        signature.append((name, stat.st_mtime, stat.st_size))
+    return tuple(signature)
+
+
+def get_reddit_index(category_path: str, company: bool = False) -> RedditIndex:
+    """Return the index of a category folder, rebuilding it when any file changed."""
+    signature = _category_signature(category_path)
+    key = (category_path, company)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.signature != signature:
+            index = RedditIndex(category_path, signature, company)
+            _indexes[key] = index
+        return index
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -61,75 +187,8 @@ def fetch_top_from_category(
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
-
-    all_content = []
-
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
-        raise ValueError(
-            "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
-        )
-
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
-
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
-
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
-
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
-
-    return all_content
+    # Served from the per-date/per-ticker index, which parses each subreddit
+    # file once per process instead of once per requested day
+    company = "company" in category
+    index = get_reddit_index(os.path.join(data_path, category), company)
+    return index.top_posts(date, max_limit, query if company else None)
@@ -0,0 +1,203 @@
+import os
+import json
+import threading
+from typing import Annotated, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .config import get_config
+
+# statement name -> (SimFin directory, file name template)
+SIMFIN_STATEMENTS = {
+    "balance_sheet": ("balance_sheet", "us-balance-{freq}.csv"),
+    "cash_flow": ("cash_flow", "us-cashflow-{freq}.csv"),
+    "income_statements": ("income_statements", "us-income-{freq}.csv"),
+}
+
+
+class SimFinStore:
+    """Per-ticker partitioned, point-in-time store for the SimFin bulk files.
+
+    The all-companies CSV of a statement/frequency is ingested once: dates are
+    parsed, rows are split by ticker and each partition is written sorted by
+    ``Publish Date``. Lookups then only read the partition of the requested
+    ticker. A partition set is rebuilt when its source CSV changes.
+    """
+
+    def __init__(self, data_dir: str, root_dir: str):
+        self.data_dir = data_dir
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._partitions: Dict[Tuple[str, str, str], Optional[pd.DataFrame]] = {}
+        self._ingested: Dict[Tuple[str, str], bool] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------ #
+    # public API
+    # ------------------------------------------------------------------ #
+    def as_of(
+        self,
+        statement: Annotated[str, "balance_sheet / cash_flow / income_statements"],
+        freq: Annotated[str, "annual / quarterly"],
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "point-in-time date, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """Return the latest report with ``Publish Date <= curr_date``, or None."""
+        data = self.get_partition(statement, freq, ticker)
+        if data is None or data.empty:
+            return None
+
+        publish = pd.DatetimeIndex(data["Publish Date"])
+        curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+        pos = publish.searchsorted(curr_date_dt, side="right") - 1
+        if pos < 0:
+            return None
+        # Among reports published on the same day keep the first in file order,
+        # like ``idxmax`` on the unpartitioned file did
+        pos = publish.searchsorted(publish[pos], side="left")
+        return data.iloc[pos]
+
+    def as_of_batch(
+        self,
+        statement: Annotated[str, "balance_sheet / cash_flow / income_statements"],
+        freq: Annotated[str, "annual / quarterly"],
+        requests: Annotated[Iterable[Tuple[str, str]], "(ticker, yyyy-mm-dd) pairs"],
+    ) -> pd.DataFrame:
+        """Answer many point-in-time lookups at once.
+
+        Returns one row per request (in request order) with ``query_ticker`` and
+        ``query_date`` columns prepended; requests without a published report
+        yield a row of NaN.
+        """
+        requests = list(requests)
+        by_ticker: Dict[str, List[int]] = {}
+        for i, (ticker, _) in enumerate(requests):
+            by_ticker.setdefault(ticker, []).append(i)
+
+        positions: Dict[int, Tuple[str, int]] = {}
+        columns: Optional[pd.Index] = None
+        for ticker, idx in by_ticker.items():
+            data = self.get_partition(statement, freq, ticker)
+            if data is None or data.empty:
+                continue
+            columns = data.columns if columns is None else columns
+            publish = pd.DatetimeIndex(data["Publish Date"])
+            dates = pd.to_datetime([requests[i][1] for i in idx], utc=True).normalize()
+            found = publish.searchsorted(dates, side="right") - 1
+            for i, pos in zip(idx, found):
+                if pos >= 0:
+                    positions[i] = (ticker, int(publish.searchsorted(publish[pos], side="left")))
+
+        rows = []
+        for i in range(len(requests)):
+            if i in positions:
+                ticker, pos = positions[i]
+                rows.append(self._partitions[(statement, freq, ticker)].iloc[pos])
+            else:
+                rows.append(pd.Series(dtype=object))
+        result = pd.DataFrame(rows, columns=columns).reset_index(drop=True)
+        result.insert(0, "query_date", [date for _, date in requests])
+        result.insert(0, "query_ticker", [ticker for ticker, _ in requests])
+        return result
+
+    def get_partition(
+        self,
+        statement: Annotated[str, "balance_sheet / cash_flow / income_statements"],
+        freq: Annotated[str, "annual / quarterly"],
+        ticker: Annotated[str, "ticker symbol"],
+    ) -> Optional[pd.DataFrame]:
+        """Return all reports of ``ticker`` sorted by ``Publish Date`` (None if unknown)."""
+        key = (statement, freq, ticker)
+        with self._lock:
+            if key in self._partitions:
+                return self._partitions[key]
+            self._ensure_ingested(statement, freq)
+            path = self._partition_path(statement, freq, ticker)
+            data = pd.read_pickle(path) if os.path.exists(path) else None
+            self._partitions[key] = data
+            return data
+
+    # ------------------------------------------------------------------ #
+    # internals
+    # ------------------------------------------------------------------ #
+    def _source_path(self, statement: str, freq: str) -> str:
+        directory, template = SIMFIN_STATEMENTS[statement]
+        return os.path.join(
+            self.data_dir,
+            "fundamental_data",
+            "simfin_data_all",
+            directory,
+            "companies",
+            "us",
+            template.format(freq=freq),
+        )
+
+    def _partition_dir(self, statement: str, freq: str) -> str:
+        return os.path.join(self.root_dir, statement, freq)
+
+    def _partition_path(self, statement: str, freq: str, ticker: str) -> str:
+        # Pickle keeps the tz-aware dates and the original row labels intact
+        safe = str(ticker).replace(os.sep, "_")
+        return os.path.join(self._partition_dir(statement, freq), f"{safe}.pkl")
+
+    def _ensure_ingested(self, statement: str, freq: str) -> None:
+        if self._ingested.get((statement, freq)):
+            return
+
+        source = self._source_path(statement, freq)
+        stat = os.stat(source)  # FileNotFoundError surfaces like the former read_csv
+        signature = {"source": source, "mtime": stat.st_mtime, "size": stat.st_size}
+
+        part_dir = self._partition_dir(statement, freq)
+        manifest_path = os.path.join(part_dir, "_manifest.json")
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, "r") as f:
+                    if json.load(f) == signature:
+                        self._ingested[(statement, freq)] = True
+                        return
+            except (OSError, json.JSONDecodeError):
+                pass
+
+        print(f"INFO: Ingesting SimFin {statement} ({freq}) into per-ticker store")
+        df = pd.read_csv(source, sep=";")
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        os.makedirs(part_dir, exist_ok=True)
+        for name in os.listdir(part_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(part_dir, name))
+        for ticker, group in df.groupby("Ticker", sort=False):
+            # Stable sort keeps file order between reports published the same day
+            group = group.sort_values("Publish Date", kind="mergesort")
+            path = self._partition_path(statement, freq, ticker)
+            group.to_pickle(path + ".tmp")
+            os.replace(path + ".tmp", path)
+
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(signature, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+        # Drop partitions loaded from a previous ingest
+        for key in [k for k in self._partitions if k[:2] == (statement, freq)]:
+            del self._partitions[key]
+        self._ingested[(statement, freq)] = True
+
+
+_stores: Dict[Tuple[str, str], SimFinStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_simfin_store() -> SimFinStore:
+    """Return the process-wide SimFin store for the configured directories."""
+    config = get_config()
+    root_dir = config.get("simfin_store_dir") or os.path.join(
+        config["data_cache_dir"], "simfin_store"
+    )
+    key = (config["data_dir"], root_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SimFinStore(config["data_dir"], root_dir)
+        return _stores[key]
@@ -1,9 +1,160 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+import threading
 import os
 from .config import get_config, DATA_DIR
+from .price_store import get_price_store
+
+
+class StockstatsFrameCache:
+    """Bounded, memory-aware LRU of wrapped stockstats frames.
+
+    Entries are keyed by ``(symbol, data source, last bar date)`` so a new bar
+    naturally invalidates the old frame. Indicator columns computed on a cached
+    frame stay on it, so later requests only pay for columns they add. Cached
+    frames are only touched under the lock; callers get their own copy.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_indicator_frame(
+        self,
+        key: Hashable,
+        indicator: str,
+        loader: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Return a copy of the ``Date`` and ``indicator`` columns of the cached frame for ``key``."""
+        with self._lock:
+            df = self._entries.get(key)
+            if df is None:
+                self.misses += 1
+                df = loader()
+                self._entries[key] = df
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+            if indicator not in df.columns:
+                df[indicator]  # trigger stockstats to calculate the indicator
+            self._sizes[key] = int(df.memory_usage(deep=True).sum())
+            self._evict(keep=key)
+            # Another thread may add columns to the shared frame once the lock is released
+            return df.loc[:, ["Date", indicator]].copy()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": sum(self._sizes.values()),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _evict(self, keep: Hashable) -> None:
+        total = sum(self._sizes.values())
+        while self._entries and (
+            len(self._entries) > self.max_entries or total > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                # Never drop the frame that is being handed back to the caller
+                break
+            self._entries.pop(oldest)
+            total -= self._sizes.pop(oldest, 0)
+            self.evictions += 1
+
+
+_frame_cache: Optional[StockstatsFrameCache] = None
+
+
+def get_stockstats_cache() -> StockstatsFrameCache:
+    """Return the process-wide stockstats frame cache, sized from the config."""
+    global _frame_cache
+    if _frame_cache is None:
+        config = get_config()
+        _frame_cache = StockstatsFrameCache(
+            max_entries=config.get("stockstats_cache_max_entries", 32),
+            max_bytes=int(config.get("stockstats_cache_max_mb", 256)) * 1024 * 1024,
+        )
+    return _frame_cache
+
+
+def get_stockstats_cache_stats() -> dict:
+    """Hit/miss counters of the stockstats frame cache, for sizing it."""
+    return get_stockstats_cache().stats()
+
+
+def _wrap_price_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Wrap raw OHLCV data for stockstats with ``Date`` as a yyyy-mm-dd string column."""
+    df = wrap(data)
+    # 确保 Date 列是 datetime 类型后再转字符串
+    if not pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df = df.dropna(subset=["Date"])  # 删除无效日期
+    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    return df
+
+
+def get_indicator_frame(
+    symbol: Annotated[str, "ticker symbol for the company"],
+    indicator: Annotated[str, "stockstats indicator column to compute"],
+) -> pd.DataFrame:
+    """Return ``Date`` and the computed ``indicator`` column for ``symbol``.
+
+    The indicator is computed on the in-process LRU cache's frame whenever the
+    underlying price history has not gained a new bar since it was built; the
+    caller receives a private copy of the two columns.
+    """
+    config = get_config()
+    online = config["data_vendors"]["technical_indicators"] != "local"
+
+    if not online:
+        try:
+            data = pd.read_csv(
+                os.path.join(
+                    DATA_DIR,
+                    f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+                )
+            )
+        except FileNotFoundError:
+            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+        # 确保 Date 列格式正确
+        data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
+        data = data.dropna(subset=["Date"])
+        source = "local"
+    else:
+        # Read the canonical history from the persistent price store
+        data = get_price_store().get_history(symbol)
+        source = "yfinance"
+
+    if data.empty:
+        raise Exception(f"Stockstats fail: no price data available for {symbol}")
+
+    last_bar = pd.Timestamp(data["Date"].max()).strftime("%Y-%m-%d")
+    key = (symbol.upper(), source, last_bar)
+    return get_stockstats_cache().get_indicator_frame(
+        key, indicator, lambda: _wrap_price_frame(data)
+    )
 
 
 class StockstatsUtils:
@@ -17,78 +168,9 @@ class StockstatsUtils:
             str, "curr date for retrieving stock price data, YYYY-mm-dd"
         ],
     ):
-        # Get config and set up data directory path
-        config = get_config()
-        online = config["data_vendors"]["technical_indicators"] != "local"
-
-        df = None
-        data = None
-
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        DATA_DIR,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                # 确保 Date 列格式正确
-                if "Date" in data.columns:
-                    data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
-                    data = data.dropna(subset=["Date"])
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
+        df = get_indicator_frame(symbol, indicator)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                # 强制解析 Date 列，处理异常值
-                try:
-                    data["Date"] = pd.to_datetime(data["Date"], format="%Y-%m-%d", errors="coerce")
-                except Exception:
-                    # 如果解析失败，尝试推断格式
-                    data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
-                # 删除无效日期行
-                data = data.dropna(subset=["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            # 确保 Date 列是 datetime 类型后再转字符串
-            if not pd.api.types.is_datetime64_any_dtype(df["Date"]):
-                df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-            df = df.dropna(subset=["Date"])  # 删除无效日期
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
-        
         # 确保 Date 列是字符串类型，且格式正确
         try:
             matching_rows = df[df["Date"].astype(str).str.startswith(curr_date)]
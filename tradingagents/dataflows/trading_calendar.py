@@ -0,0 +1,217 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Annotated, Dict, List, Optional, Union
+
+import pandas as pd
+
+from .config import get_config
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+SUPPORTED_EXCHANGES = ("NYSE", "NASDAQ")
+
+# Unscheduled full-day closures (national days of mourning, weather, 9/11)
+SPECIAL_CLOSURES = {
+    "1994-04-27": "Nixon national day of mourning",
+    "2001-09-11": "September 11",
+    "2001-09-12": "September 11",
+    "2001-09-13": "September 11",
+    "2001-09-14": "September 11",
+    "2004-06-11": "Reagan national day of mourning",
+    "2007-01-02": "Ford national day of mourning",
+    "2012-10-29": "Hurricane Sandy",
+    "2012-10-30": "Hurricane Sandy",
+    "2018-12-05": "George H.W. Bush national day of mourning",
+    "2025-01-09": "Carter national day of mourning",
+}
+
+
+def _to_date(day: DateLike) -> date:
+    if isinstance(day, str):
+        return datetime.strptime(day[:10], "%Y-%m-%d").date()
+    if isinstance(day, datetime):
+        return day.date()
+    return day
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The ``n``-th ``weekday`` (Mon=0) of a month; ``n=-1`` is the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    # Saturday holidays are observed on Friday, Sunday holidays on Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+class TradingCalendar:
+    """Offline session calendar for the US equity exchanges (NYSE and NASDAQ).
+
+    Holidays are generated from the exchange rules (fixed dates with weekend
+    observance, floating Mondays/Thursdays, Good Friday) plus the known
+    unscheduled closures, so no network access or extra package is needed.
+    Early closes count as full sessions.
+    """
+
+    def __init__(self, exchange: str = "NYSE"):
+        exchange = exchange.upper()
+        if exchange not in SUPPORTED_EXCHANGES:
+            raise ValueError(
+                f"Unsupported exchange: {exchange}. Please choose from: {list(SUPPORTED_EXCHANGES)}"
+            )
+        self.exchange = exchange
+        self._holidays: Dict[int, Dict[date, str]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # public API
+    # ------------------------------------------------------------------ #
+    def holidays(self, year: int) -> Dict[date, str]:
+        """Full-day closures of ``year`` as ``{date: name}``."""
+        with self._lock:
+            if year not in self._holidays:
+                self._holidays[year] = self._build_holidays(year)
+            return self._holidays[year]
+
+    def is_session(self, day: DateLike) -> bool:
+        day = _to_date(day)
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def sessions(
+        self,
+        start_date: Annotated[DateLike, "inclusive start date"],
+        end_date: Annotated[DateLike, "inclusive end date"],
+    ) -> List[str]:
+        """Sessions in ``[start_date, end_date]`` as ascending yyyy-mm-dd strings."""
+        start, end = _to_date(start_date), _to_date(end_date)
+        return [
+            day.strftime("%Y-%m-%d")
+            for day in pd.bdate_range(start, end)
+            if day.date() not in self.holidays(day.year)
+        ]
+
+    def sessions_back(
+        self,
+        end_date: Annotated[DateLike, "inclusive end date"],
+        count: Annotated[int, "number of sessions"],
+    ) -> List[str]:
+        """The last ``count`` sessions on or before ``end_date``, ascending."""
+        if count <= 0:
+            return []
+        end = _to_date(end_date)
+        span = count * 7 // 5 + 10
+        while True:
+            found = self.sessions(end - timedelta(days=span), end)
+            if len(found) >= count:
+                return found[-count:]
+            span *= 2
+
+    def previous_session(self, day: DateLike) -> str:
+        """The latest session on or before ``day``."""
+        return self.sessions_back(day, 1)[0]
+
+    def session_after(
+        self,
+        day: Annotated[DateLike, "anchor date"],
+        count: Annotated[int, "number of sessions to move forward"],
+    ) -> str:
+        """The ``count``-th session strictly after ``day``."""
+        start = _to_date(day) + timedelta(days=1)
+        span = count * 7 // 5 + 10
+        while True:
+            found = self.sessions(start, start + timedelta(days=span))
+            if len(found) >= count:
+                return found[count - 1]
+            span *= 2
+
+    # ------------------------------------------------------------------ #
+    # internals
+    # ------------------------------------------------------------------ #
+    def _build_holidays(self, year: int) -> Dict[date, str]:
+        days: Dict[date, str] = {}
+
+        new_year = date(year, 1, 1)
+        # A Saturday New Year's Day is not made up on the Friday before
+        if new_year.weekday() != 5:
+            days[_observed(new_year)] = "New Year's Day"
+        if year >= 1998:
+            days[_nth_weekday(year, 1, 0, 3)] = "Martin Luther King Jr. Day"
+        days[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+        days[_easter(year) - timedelta(days=2)] = "Good Friday"
+        days[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+        if year >= 2022:
+            days[_observed(date(year, 6, 19))] = "Juneteenth"
+        days[_observed(date(year, 7, 4))] = "Independence Day"
+        days[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+        days[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+        days[_observed(date(year, 12, 25))] = "Christmas Day"
+
+        for day_str, name in SPECIAL_CLOSURES.items():
+            if day_str.startswith(str(year)):
+                days[_to_date(day_str)] = name
+        return days
+
+
+_calendars: Dict[str, TradingCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_trading_calendar(exchange: Optional[str] = None) -> TradingCalendar:
+    """Return the process-wide calendar for ``exchange`` (default: the configured one)."""
+    exchange = (exchange or get_config().get("trading_calendar_exchange", "NYSE")).upper()
+    with _calendars_lock:
+        if exchange not in _calendars:
+            _calendars[exchange] = TradingCalendar(exchange)
+        return _calendars[exchange]
+
+
+def uses_sessions() -> bool:
+    """Whether look-back/look-forward windows are counted in sessions (see ``trading_window_unit``)."""
+    return get_config().get("trading_window_unit", "sessions") == "sessions"
+
+
+def window_start(
+    curr_date: Annotated[str, "window end date, yyyy-mm-dd"],
+    look_back: Annotated[int, "window length in sessions or calendar days"],
+) -> str:
+    """First date of a look-back window ending at ``curr_date``.
+
+    In session mode it starts ``look_back`` sessions before the last session
+    on or before ``curr_date``; in calendar mode ``look_back`` days earlier.
+    """
+    if uses_sessions() and look_back > 0:
+        return get_trading_calendar().sessions_back(curr_date, look_back + 1)[0]
+    return (_to_date(curr_date) - timedelta(days=look_back)).strftime("%Y-%m-%d")
+
+
+def window_end(
+    start_date: Annotated[str, "window start date, yyyy-mm-dd"],
+    look_forward: Annotated[int, "window length in sessions or calendar days"],
+) -> str:
+    """Last date of a look-forward window starting at ``start_date``."""
+    if uses_sessions() and look_forward > 0:
+        return get_trading_calendar().session_after(start_date, look_forward)
+    return (_to_date(start_date) + timedelta(days=look_forward)).strftime("%Y-%m-%d")
@@ -6,6 +6,14 @@ from typing import Annotated
 
 SavePathType = Annotated[str, "File path to save data. If None, data is not saved."]
 
+
+class VendorInputError(ValueError):
+    """A vendor rejected the caller's arguments (unsupported indicator, malformed date, ...).
+
+    The router raises it back to the caller instead of falling back to the
+    next vendor or counting it against the vendor's health.
+    """
+
 def save_output(data: pd.DataFrame, tag: str, save_path: SavePathType = None) -> None:
     if save_path:
         data.to_csv(save_path)
@@ -37,3 +45,58 @@ def get_next_weekday(date):
         return next_weekday
     else:
         return date
+
+
+def normalize_indicator_list(indicators) -> list:
+    """Accept a single indicator, a comma-separated string or a list and return a de-duplicated list."""
+    if isinstance(indicators, str):
+        indicators = indicators.split(",")
+    normalized = []
+    for name in indicators:
+        name = str(name).strip().lower()
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
+
+
+def format_indicator_table(
+    symbol: str,
+    panel: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    descriptions: dict,
+) -> str:
+    """Render an aligned indicator panel (index: yyyy-mm-dd, one column per indicator) for the LLM.
+
+    Rows are trading days only, newest first; each indicator description is listed once below the table.
+    """
+    panel = panel.sort_index(ascending=False)
+    columns = list(panel.columns)
+
+    def _fmt(value):
+        if value is None or pd.isna(value):
+            return "N/A"
+        try:
+            return f"{float(value):.4f}".rstrip("0").rstrip(".")
+        except (TypeError, ValueError):
+            return str(value)
+
+    lines = [
+        "| Date | " + " | ".join(columns) + " |",
+        "|" + "---|" * (len(columns) + 1),
+    ]
+    for date_str, row in zip(panel.index, panel.itertuples(index=False, name=None)):
+        lines.append(f"| {date_str} | " + " | ".join(_fmt(v) for v in row) + " |")
+
+    if panel.empty:
+        lines.append("No trading days in the specified date range.")
+
+    legend = "\n".join(
+        f"- {name}: {descriptions.get(name, 'No description available.')}" for name in columns
+    )
+    return (
+        f"## Technical indicators for {symbol.upper()} from {start_date} to {end_date} (trading days only):\n\n"
+        + "\n".join(lines)
+        + "\n\n"
+        + legend
+    )
@@ -0,0 +1,272 @@
+import os
+import re
+import json
+import time
+import pickle
+import sqlite3
+import inspect
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from .config import get_config
+
+# Default time-to-live in seconds per data category. "live" applies when the
+# request reaches today (prices can still move, news keeps arriving),
+# "historical" when every date in the request lies in the past.
+DEFAULT_TTLS = {
+    "core_stock_apis": {"live": 15 * 60, "historical": 30 * 86400},
+    "technical_indicators": {"live": 15 * 60, "historical": 30 * 86400},
+    "fundamental_data": {"live": 86400, "historical": 90 * 86400},
+    "news_data": {"live": 60 * 60, "historical": 86400},
+}
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Vendor answers that report a failure instead of data ("Error retrieving ...")
+# and answers that report no data ("No data found for ...", "No search results found.")
+_ERROR_PATTERN = re.compile(r"^\s*error\b", re.IGNORECASE)
+_NO_DATA_PATTERN = re.compile(r"^\s*no\b[^\n]*\b(found|available)\b", re.IGNORECASE)
+
+
+class _InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class VendorResponseCache:
+    """SQLite-backed cache of vendor responses for ``route_to_vendor``.
+
+    Responses are keyed by ``(method, vendor, implementation, normalized
+    arguments)`` and expire after the TTL chosen for the request. Identical
+    requests that arrive while the first one is still running wait for its
+    result instead of hitting the vendor again. Vendor error strings are never
+    stored; "no data" answers are kept for at most ``negative_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[Dict[str, Dict[str, int]]] = None,
+        negative_ttl: int = 10 * 60,
+    ):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                vendor TEXT NOT NULL,
+                created REAL NOT NULL,
+                expires REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "expired": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # public API
+    # ------------------------------------------------------------------ #
+    def call(
+        self,
+        method: str,
+        category: str,
+        vendor: str,
+        impl_func: Callable,
+        args: tuple,
+        kwargs: dict,
+        source: Optional[dict] = None,
+    ) -> Any:
+        """Return the cached response for this call or run ``impl_func`` and store it.
+
+        When ``source`` is given, ``source["upstream"]`` tells whether this call
+        ran ``impl_func`` itself (False for cache hits and for calls that waited
+        on an identical in-flight request), also when the call raises.
+        """
+        if source is None:
+            source = {}
+        arguments = normalize_arguments(impl_func, args, kwargs)
+        key = json.dumps(
+            [method, vendor, getattr(impl_func, "__name__", repr(impl_func)), arguments],
+            sort_keys=True,
+            default=str,
+        )
+
+        with self._lock:
+            cached = self._get(key)
+            if cached is not None:
+                source["upstream"] = False
+                return cached
+            waiter = self._inflight.get(key)
+            owner = waiter is None
+            source["upstream"] = owner
+            if owner:
+                waiter = self._inflight[key] = _InFlight()
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            waiter.event.wait()
+            if waiter.error is not None:
+                raise waiter.error
+            return waiter.value
+
+        try:
+            result = impl_func(*args, **kwargs)
+            waiter.value = result
+            kind = _classify(result)
+            if kind is not None:
+                ttl = self.ttl_for(category, arguments)
+                if kind == "negative":
+                    ttl = min(ttl, self.negative_ttl)
+                self._put(key, method, vendor, result, ttl)
+            return result
+        except BaseException as e:
+            waiter.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiter.event.set()
+
+    def ttl_for(self, category: str, arguments: dict) -> int:
+        """Pick the live or historical TTL depending on the latest date in the request."""
+        ttl = self.ttls.get(category, {"live": 0, "historical": 0})
+        dates = [v for v in arguments.values() if isinstance(v, str) and _DATE_PATTERN.match(v)]
+        today = datetime.now().strftime("%Y-%m-%d")
+        if dates and max(dates) < today:
+            return ttl["historical"]
+        return ttl["live"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"], stats["bytes_stored"] = row
+        return stats
+
+    def prune(self) -> int:
+        """Delete expired responses and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    # ------------------------------------------------------------------ #
+    # internals (called with ``self._lock`` held unless noted)
+    # ------------------------------------------------------------------ #
+    def _get(self, key: str) -> Any:
+        row = self._conn.execute(
+            "SELECT expires, payload FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self._stats["misses"] += 1
+            return None
+        expires, payload = row
+        if expires <= time.time():
+            self._stats["misses"] += 1
+            self._stats["expired"] += 1
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._stats["hits"] += 1
+        self._stats["bytes_read"] += len(payload)
+        return pickle.loads(payload)
+
+    def _put(self, key: str, method: str, vendor: str, result: Any, ttl: int) -> None:
+        # Called without the lock; serialization happens outside of it
+        if ttl <= 0:
+            return
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, method, vendor, created, expires, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, method, vendor, now, now + ttl, len(payload), payload),
+            )
+            self._conn.commit()
+            self._stats["bytes_written"] += len(payload)
+
+
+def normalize_arguments(impl_func: Callable, args: tuple, kwargs: dict) -> dict:
+    """Bind the call to ``impl_func``'s signature so positional and keyword forms share a key."""
+    try:
+        bound = inspect.signature(impl_func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except (TypeError, ValueError):
+        arguments = {f"arg{i}": value for i, value in enumerate(args)}
+        arguments.update(kwargs)
+    return {
+        name: value.strip() if isinstance(value, str) else value
+        for name, value in arguments.items()
+    }
+
+
+def _classify(result: Any) -> Optional[str]:
+    """``"ok"`` for data, ``"negative"`` for a "no data" answer, None when it must not be cached."""
+    # Empty answers and vendor error strings are retried next time
+    if result is None:
+        return None
+    if isinstance(result, str):
+        if not result.strip() or _ERROR_PATTERN.match(result):
+            return None
+        return "negative" if _NO_DATA_PATTERN.match(result) else "ok"
+    if hasattr(result, "empty"):
+        return None if result.empty else "ok"
+    return "ok"
+
+
+_cache: Optional[VendorResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_vendor_cache() -> Optional[VendorResponseCache]:
+    """Return the process-wide vendor response cache, or None when it is disabled."""
+    global _cache
+    config = get_config()
+    if not config.get("vendor_cache_enabled", True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            path = config.get("vendor_cache_path") or os.path.join(
+                config["data_cache_dir"], "vendor_cache.sqlite"
+            )
+            _cache = VendorResponseCache(
+                path,
+                config.get("vendor_cache_ttl"),
+                config.get("vendor_cache_negative_ttl_seconds", 10 * 60),
+            )
+        return _cache
+
+
+def get_vendor_cache_stats() -> dict:
+    """Hit/miss/byte counters of the vendor response cache (empty when disabled)."""
+    cache = get_vendor_cache()
+    return cache.stats() if cache is not None else {}
@@ -0,0 +1,206 @@
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class VendorHealth:
+    """Rolling health of one (vendor, method) pair with a circuit breaker.
+
+    The breaker opens after ``failure_threshold`` consecutive failures (or
+    immediately on a rate-limit answer), rejects calls for ``cooldown``
+    seconds, then lets a single probe through (half-open). A successful probe
+    closes it again, a failed one re-opens it.
+    """
+
+    def __init__(self, window: int, failure_threshold: int, cooldown: float, ewma_alpha: float):
+        self.outcomes = deque(maxlen=window)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.ewma_alpha = ewma_alpha
+        self.latency_ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.probe_in_flight = False
+        self.probe_started: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.calls = 0
+        self.rejected = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+    def allow(self, now: float) -> bool:
+        if self.state == OPEN:
+            if now - self.opened_at < self.cooldown:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        if self.state == HALF_OPEN:
+            # A probe that never reported back (e.g. cancelled) expires after a cooldown
+            if self.probe_in_flight and now - self.probe_started < self.cooldown:
+                self.rejected += 1
+                return False
+            self.probe_in_flight = True
+            self.probe_started = now
+        return True
+
+    def release_probe(self) -> None:
+        """Let the next call probe again when the allowed probe never reached the vendor."""
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+
+    def record(self, ok: bool, latency: float, now: float, trip: bool = False, error: str = None) -> None:
+        self.calls += 1
+        self.outcomes.append(1 if ok else 0)
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = self.ewma_alpha * latency + (1 - self.ewma_alpha) * self.latency_ewma
+
+        if ok:
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self.opened_at = None
+            self.probe_in_flight = False
+            return
+
+        self.consecutive_failures += 1
+        self.last_error = error
+        if trip or self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = now
+            self.probe_in_flight = False
+
+    def snapshot(self, now: float) -> dict:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.cooldown - (now - self.opened_at))
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate, 4),
+            "latency_ewma": None if self.latency_ewma is None else round(self.latency_ewma, 4),
+            "consecutive_failures": self.consecutive_failures,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "retry_in_seconds": retry_in,
+            "last_error": self.last_error,
+        }
+
+
+class VendorHealthRegistry:
+    """Process-wide health state for every (vendor, method) the router uses."""
+
+    def __init__(
+        self,
+        window: int = 20,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        error_rate_threshold: float = 0.5,
+        ewma_alpha: float = 0.3,
+    ):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.error_rate_threshold = error_rate_threshold
+        self.ewma_alpha = ewma_alpha
+        self._health: Dict[Tuple[str, str], VendorHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, vendor: str, method: str) -> VendorHealth:
+        key = (vendor, method)
+        if key not in self._health:
+            self._health[key] = VendorHealth(
+                self.window, self.failure_threshold, self.cooldown, self.ewma_alpha
+            )
+        return self._health[key]
+
+    def allow(self, vendor: str, method: str) -> bool:
+        """Whether the breaker lets a call to ``vendor`` for ``method`` through now."""
+        with self._lock:
+            return self._get(vendor, method).allow(time.monotonic())
+
+    def record_success(self, vendor: str, method: str, latency: float) -> None:
+        with self._lock:
+            self._get(vendor, method).record(True, latency, time.monotonic())
+
+    def record_failure(self, vendor: str, method: str, latency: float, error: str = None, trip: bool = False) -> None:
+        """Record a failed call; ``trip`` opens the breaker at once (e.g. quota exhausted)."""
+        with self._lock:
+            self._get(vendor, method).record(False, latency, time.monotonic(), trip=trip, error=error)
+
+    def release(self, vendor: str, method: str) -> None:
+        """Report a call that never reached the vendor (e.g. served from the response cache)."""
+        with self._lock:
+            self._get(vendor, method).release_probe()
+
+    def order(self, method: str, vendors: List[str]) -> List[str]:
+        """Stable-reorder ``vendors`` so degraded ones (high error rate, half-open) go last."""
+        with self._lock:
+            def degraded(vendor):
+                health = self._health.get((vendor, method))
+                if health is None:
+                    return 0
+                if health.state != CLOSED or health.error_rate >= self.error_rate_threshold:
+                    return 1
+                return 0
+
+            return sorted(vendors, key=degraded)
+
+    def is_open(self, vendor: str, method: str) -> bool:
+        """True while the breaker rejects calls (open and still cooling down)."""
+        with self._lock:
+            health = self._health.get((vendor, method))
+            return (
+                health is not None
+                and health.state == OPEN
+                and time.monotonic() - health.opened_at < health.cooldown
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """Health of every tracked pair as ``{vendor: {method: state}}`` for dashboards."""
+        now = time.monotonic()
+        with self._lock:
+            result: Dict[str, Dict[str, dict]] = {}
+            for (vendor, method), health in self._health.items():
+                result.setdefault(vendor, {})[method] = health.snapshot(now)
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._health.clear()
+
+
+_registry: Optional[VendorHealthRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_vendor_health_registry() -> VendorHealthRegistry:
+    """Return the process-wide vendor health registry configured from the config."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            config = get_config()
+            _registry = VendorHealthRegistry(
+                window=config.get("vendor_health_window", 20),
+                failure_threshold=config.get("vendor_breaker_failure_threshold", 3),
+                cooldown=config.get("vendor_breaker_cooldown_seconds", 60.0),
+                error_rate_threshold=config.get("vendor_health_error_rate_threshold", 0.5),
+            )
+        return _registry
+
+
+def get_vendor_health() -> Dict[str, Dict[str, dict]]:
+    """Current breaker state, error rate and latency EWMA per vendor and method."""
+    return get_vendor_health_registry().snapshot()
@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import zlib
+import pickle
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Optional
+
+from .config import get_config
+
+REPLAY_MODES = ("off", "record", "replay")
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class VendorReplayMissError(LookupError):
+    """Raised in replay mode when a call was never recorded."""
+
+
+class VendorRecording:
+    """Compressed archive of ``route_to_vendor`` responses for offline replays.
+
+    Every routed call is keyed by ``(method, normalized arguments)``; the
+    arguments contain the trade/as-of dates, so a recording is point in time.
+    Payloads are pickled and zlib-compressed into a single SQLite file that
+    can be copied between machines.
+    """
+
+    def __init__(self, path: str, compression_level: int = 6):
+        self.path = path
+        self.compression_level = compression_level
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS recordings (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                trade_date TEXT,
+                recorded_at TEXT NOT NULL,
+                raw_size INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+    # ------------------------------------------------------------------ #
+    # public API
+    # ------------------------------------------------------------------ #
+    def record(self, method: str, args: tuple, kwargs: dict, result: Any) -> None:
+        """Store (or overwrite) the response of one routed call."""
+        key, arguments = recording_key(method, args, kwargs)
+        raw = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        payload = zlib.compress(raw, self.compression_level)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recordings (key, method, trade_date, recorded_at, raw_size, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    method,
+                    _trade_date(arguments),
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    len(raw),
+                    len(payload),
+                    payload,
+                ),
+            )
+            self._conn.commit()
+            self._stats["recorded"] += 1
+
+    def replay(self, method: str, args: tuple, kwargs: dict) -> Any:
+        """Return the recorded response, or raise ``VendorReplayMissError``."""
+        key, arguments = recording_key(method, args, kwargs)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM recordings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["replayed"] += 1
+        if row is None:
+            raise VendorReplayMissError(
+                f"No recorded response for {method} {json.dumps(arguments, default=str)} in {self.path}; "
+                "record it first with vendor_replay_mode='record'"
+            )
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(size), 0) FROM recordings"
+            ).fetchone()
+        stats["entries"], stats["raw_bytes"], stats["stored_bytes"] = row
+        return stats
+
+
+def recording_key(method: str, args: tuple, kwargs: dict) -> tuple:
+    """Canonical key of a routed call; returns ``(key, normalized arguments)``."""
+    arguments = {f"arg{i}": _normalize(value) for i, value in enumerate(args)}
+    arguments.update({name: _normalize(value) for name, value in kwargs.items()})
+    return json.dumps([method, arguments], sort_keys=True, default=str), arguments
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _trade_date(arguments: dict) -> Optional[str]:
+    dates = [v for v in arguments.values() if isinstance(v, str) and _DATE_PATTERN.match(v)]
+    return max(dates) if dates else None
+
+
+_recordings = {}
+_recordings_lock = threading.Lock()
+
+
+def get_replay_mode() -> str:
+    """Configured record/replay mode: "off", "record" or "replay"."""
+    mode = get_config().get("vendor_replay_mode", "off") or "off"
+    if mode not in REPLAY_MODES:
+        raise ValueError(f"Unsupported vendor_replay_mode: {mode}. Please choose from: {list(REPLAY_MODES)}")
+    return mode
+
+
+def get_vendor_recording() -> VendorRecording:
+    """Return the process-wide recording archive for the configured path."""
+    config = get_config()
+    path = config.get("vendor_replay_path") or os.path.join(
+        config["data_cache_dir"], "vendor_recording.sqlite"
+    )
+    with _recordings_lock:
+        if path not in _recordings:
+            _recordings[path] = VendorRecording(path)
+        return _recordings[path]
+
+
+def get_vendor_replay_stats() -> dict:
+    """Recorded/replayed/miss counters and archive size (empty when the mode is off)."""
+    if get_replay_mode() == "off":
+        return {}
+    return get_vendor_recording().stats()
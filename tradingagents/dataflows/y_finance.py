@@ -1,178 +1,161 @@
-from typing import Annotated
+from typing import Annotated, List, Union
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import yfinance as yf
+import pandas as pd
 import os
-from .stockstats_utils import StockstatsUtils
-
-def get_YFin_data_online(
+from .stockstats_utils import StockstatsUtils, get_indicator_frame
+from .price_store import get_price_store
+from .fundamentals_store import get_fundamentals_store
+from .utils import VendorInputError, normalize_indicator_list, format_indicator_table
+from .market_data import to_price_frame
+from .trading_calendar import get_trading_calendar, uses_sessions, window_start
+
+def get_YFin_price_frame(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
-    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
-):
-
+    end_date: Annotated[str, "End date in yyyy-mm-dd format, exclusive"],
+) -> pd.DataFrame:
+    """Typed OHLCV frame sliced from the persistent price store."""
     datetime.strptime(start_date, "%Y-%m-%d")
-    datetime.strptime(end_date, "%Y-%m-%d")
-
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
-
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
-
-    # Check if data is empty
-    if data.empty:
-        return (
-            f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
-        )
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+
+    # ``end_date`` stays exclusive as with ``yf.Ticker.history``
+    last_day = (end_dt - relativedelta(days=1)).strftime("%Y-%m-%d")
+    return to_price_frame(get_price_store().get_history(symbol, start_date, last_day))
+
+INDICATOR_DESCRIPTIONS = {
+    # Moving Averages
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_10_ema": (
+        "10 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
 
-    # Remove timezone info from index for cleaner output
-    if data.index.tz is not None:
-        data.index = data.index.tz_localize(None)
-
-    # Round numerical values to 2 decimal places for cleaner display
-    numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
-    for col in numeric_columns:
-        if col in data.columns:
-            data[col] = data[col].round(2)
-
-    # Convert DataFrame to CSV string
-    csv_string = data.to_csv()
-
-    # Add header information
-    header = f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
-    header += f"# Total records: {len(data)}\n"
-    header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-
-    return header + csv_string
 
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to get the analysis and report of"],
+    indicator: Annotated[
+        Union[str, List[str]],
+        "technical indicator, or a list of indicators, to get the analysis and report of",
+    ],
     curr_date: Annotated[
         str, "The current trading date you are trading on, YYYY-mm-dd"
     ],
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
 
-    best_ind_params = {
-        # Moving Averages
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
+    indicators = normalize_indicator_list(indicator)
+    if len(indicators) > 1:
+        # Several indicators are answered with one aligned table
+        return get_stock_stats_indicators_table(symbol, indicators, curr_date, look_back_days)
+    if indicators:
+        indicator = indicators[0]
+
+    best_ind_params = INDICATOR_DESCRIPTIONS
 
     if indicator not in best_ind_params:
-        raise ValueError(
+        raise VendorInputError(
             f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
         )
 
     end_date = curr_date
-    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = curr_date_dt - relativedelta(days=look_back_days)
+    before = datetime.strptime(window_start(curr_date, look_back_days), "%Y-%m-%d")
+
+    if uses_sessions():
+        # Exchange sessions only, newest first: no weekend/holiday filler lines
+        window_days = pd.Index(get_trading_calendar().sessions(before, end_date)[::-1])
+        missing_label = "N/A"
+    else:
+        # Every calendar day in the window, newest first
+        window_days = pd.date_range(before, end_date, freq="D")[::-1].strftime("%Y-%m-%d")
+        missing_label = "N/A: Not a trading day (weekend or holiday)"
 
-    # Optimized: Get stock data once and calculate indicators for all dates
+    # Vectorized: slice a date-indexed series with searchsorted bounds and
+    # reindex onto the calendar window in a single pass
     try:
-        indicator_data = _get_stock_stats_bulk(symbol, indicator, curr_date)
-        
-        # Generate the date range we need
-        current_dt = curr_date_dt
-        date_values = []
-        
-        while current_dt >= before:
-            date_str = current_dt.strftime('%Y-%m-%d')
-            
-            # Look up the indicator value for this date
-            if date_str in indicator_data:
-                indicator_value = indicator_data[date_str]
-            else:
-                indicator_value = "N/A: Not a trading day (weekend or holiday)"
-            
-            date_values.append((date_str, indicator_value))
-            current_dt = current_dt - relativedelta(days=1)
-        
-        # Build the result string
-        ind_string = ""
-        for date_str, value in date_values:
-            ind_string += f"{date_str}: {value}\n"
-        
+        indicator_series = _get_stock_stats_series(symbol, indicator)
+        lo = indicator_series.index.searchsorted(before.strftime("%Y-%m-%d"), side="left")
+        hi = indicator_series.index.searchsorted(end_date, side="right")
+        window = indicator_series.iloc[lo:hi]
+
+        formatted = window.map(str).where(window.notna(), "N/A")
+        window_values = formatted.reindex(window_days).fillna(missing_label)
     except Exception as e:
         print(f"Error getting bulk stockstats data: {e}")
-        # Fallback to original implementation if bulk method fails
-        ind_string = ""
-        curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-        while curr_date_dt >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date_dt.strftime("%Y-%m-%d")
-            )
-            ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
-            curr_date_dt = curr_date_dt - relativedelta(days=1)
+        # Same output as the former per-day fallback, which yielded an empty
+        # value for every day once the price history could not be loaded
+        window_values = pd.Series("", index=window_days)
+
+    ind_string = "".join(
+        f"{date_str}: {value}\n"
+        for date_str, value in zip(window_values.index, window_values.to_numpy())
+    )
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
@@ -184,107 +167,49 @@ def get_stock_stats_indicators_window(
     return result_str
 
 
-def _get_stock_stats_bulk(
+def get_stock_stats_indicators_table(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[List[str], "technical indicators to include in the panel"],
+    curr_date: Annotated[
+        str, "The current trading date you are trading on, YYYY-mm-dd"
+    ],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
+    """Return several stockstats indicators over the window as one aligned table."""
+    indicators = normalize_indicator_list(indicators)
+    unsupported = [name for name in indicators if name not in INDICATOR_DESCRIPTIONS]
+    if unsupported or not indicators:
+        raise VendorInputError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(INDICATOR_DESCRIPTIONS.keys())}"
+        )
+
+    before = window_start(curr_date, look_back_days)
+
+    # All indicator columns live on the same cached stockstats frame, so the
+    # rows are aligned by construction
+    columns = {}
+    for name in indicators:
+        series = _get_stock_stats_series(symbol, name)
+        lo = series.index.searchsorted(before, side="left")
+        hi = series.index.searchsorted(curr_date, side="right")
+        columns[name] = series.iloc[lo:hi]
+    panel = pd.DataFrame(columns)
+
+    return format_indicator_table(symbol, panel, before, curr_date, INDICATOR_DESCRIPTIONS)
+
+
+def _get_stock_stats_series(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to calculate"],
-    curr_date: Annotated[str, "current date for reference"]
-) -> dict:
+) -> pd.Series:
     """
-    Optimized bulk calculation of stock stats indicators.
-    Fetches data once and calculates indicator for all available dates.
-    Returns dict mapping date strings to indicator values.
+    Return the indicator over the full price history as a Series indexed by
+    ascending yyyy-mm-dd date strings.
     """
-    from .config import get_config
-    import pandas as pd
-    from stockstats import wrap
-    import os
-    
-    config = get_config()
-    online = config["data_vendors"]["technical_indicators"] != "local"
-    
-    if not online:
-        # Local data path
-        try:
-            data = pd.read_csv(
-                os.path.join(
-                    config.get("data_cache_dir", "data"),
-                    f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                )
-            )
-            # 确保 Date 列格式正确
-            if "Date" in data.columns:
-                data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
-                data = data.dropna(subset=["Date"])
-            df = wrap(data)
-        except FileNotFoundError:
-            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-    else:
-        # Online data fetching with caching
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-        
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-        
-        data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
-        )
-        
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            # 强制解析 Date 列，处理异常值
-            try:
-                data["Date"] = pd.to_datetime(data["Date"], format="%Y-%m-%d", errors="coerce")
-            except Exception:
-                data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
-            # 删除无效日期行
-            data = data.dropna(subset=["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
-            )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-        
-        df = wrap(data)
-        # 确保 Date 列是 datetime 类型后再转字符串
-        if not pd.api.types.is_datetime64_any_dtype(df["Date"]):
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df = df.dropna(subset=["Date"])
-        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    
-    # Calculate the indicator for all rows at once
-    df[indicator]  # This triggers stockstats to calculate the indicator
-    
-    # Create a dictionary mapping date strings to indicator values
-    result_dict = {}
-    for _, row in df.iterrows():
-        try:
-            date_str = str(row["Date"]) if pd.notna(row["Date"]) else ""
-            if not date_str or date_str == "":
-                continue
-            indicator_value = row[indicator]
-            
-            # Handle NaN/None values
-            if pd.isna(indicator_value):
-                result_dict[date_str] = "N/A"
-            else:
-                result_dict[date_str] = str(indicator_value)
-        except Exception as e:
-            # Skip rows with invalid data
-            continue
-    
-    return result_dict
+    # Wrapped frames (with already computed indicator columns) are shared
+    # across calls through the in-process stockstats LRU cache
+    df = get_indicator_frame(symbol, indicator)
+    return pd.Series(df[indicator].to_numpy(), index=df["Date"].to_numpy(), name=indicator)
 
 
 def get_stockstats_indicator(
@@ -320,12 +245,8 @@ def get_balance_sheet(
 ):
     """Get balance sheet data from yfinance."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        
-        if freq.lower() == "quarterly":
-            data = ticker_obj.quarterly_balance_sheet
-        else:
-            data = ticker_obj.balance_sheet
+        # Served from the fiscal-period-keyed store until the next filing is due
+        data, retrieved_at = get_fundamentals_store().get(ticker, "balance_sheet", freq)
             
         if data.empty:
             return f"No balance sheet data found for symbol '{ticker}'"
@@ -335,7 +256,7 @@ def get_balance_sheet(
         
         # Add header information
         header = f"# Balance Sheet data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {retrieved_at}\n\n"
         
         return header + csv_string
         
@@ -350,12 +271,8 @@ def get_cashflow(
 ):
     """Get cash flow data from yfinance."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        
-        if freq.lower() == "quarterly":
-            data = ticker_obj.quarterly_cashflow
-        else:
-            data = ticker_obj.cashflow
+        # Served from the fiscal-period-keyed store until the next filing is due
+        data, retrieved_at = get_fundamentals_store().get(ticker, "cashflow", freq)
             
         if data.empty:
             return f"No cash flow data found for symbol '{ticker}'"
@@ -365,7 +282,7 @@ def get_cashflow(
         
         # Add header information
         header = f"# Cash Flow data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {retrieved_at}\n\n"
         
         return header + csv_string
         
@@ -380,12 +297,8 @@ def get_income_statement(
 ):
     """Get income statement data from yfinance."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        
-        if freq.lower() == "quarterly":
-            data = ticker_obj.quarterly_income_stmt
-        else:
-            data = ticker_obj.income_stmt
+        # Served from the fiscal-period-keyed store until the next filing is due
+        data, retrieved_at = get_fundamentals_store().get(ticker, "income_stmt", freq)
             
         if data.empty:
             return f"No income statement data found for symbol '{ticker}'"
@@ -395,7 +308,7 @@ def get_income_statement(
         
         # Add header information
         header = f"# Income Statement data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {retrieved_at}\n\n"
         
         return header + csv_string
         
@@ -408,8 +321,7 @@ def get_insider_transactions(
 ):
     """Get insider transactions data from yfinance."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        data = ticker_obj.insider_transactions
+        data, retrieved_at = get_fundamentals_store().get(ticker, "insider_transactions")
         
         if data is None or data.empty:
             return f"No insider transactions data found for symbol '{ticker}'"
@@ -419,7 +331,7 @@ def get_insider_transactions(
         
         # Add header information
         header = f"# Insider Transactions data for {ticker.upper()}\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"# Data retrieved on: {retrieved_at}\n\n"
         
         return header + csv_string
         
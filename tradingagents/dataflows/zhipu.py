@@ -6,6 +6,8 @@ import os
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
+from .utils import VendorInputError
+
 
 def _format_search_results(results: List[Dict[str, Any]]) -> str:
     """
@@ -105,7 +107,7 @@ def get_global_news_zhipu(curr_date: str, look_back_days: int = 7, limit: int =
     try:
         curr_date_obj = datetime.strptime(curr_date, "%Y-%m-%d")
     except ValueError:
-        raise ValueError(f"Invalid date format. Expected yyyy-mm-dd, got {curr_date}")
+        raise VendorInputError(f"Invalid date format. Expected yyyy-mm-dd, got {curr_date}")
     
     start_date_obj = curr_date_obj - timedelta(days=look_back_days)
     
@@ -256,7 +258,7 @@ def get_fundamentals_zhipu(ticker: str, curr_date: str) -> str:
     try:
         curr_date_obj = datetime.strptime(curr_date, "%Y-%m-%d")
     except ValueError:
-        raise ValueError(f"Invalid date format. Expected yyyy-mm-dd, got {curr_date}")
+        raise VendorInputError(f"Invalid date format. Expected yyyy-mm-dd, got {curr_date}")
     
     # Get previous month
     first_day_of_curr_month = curr_date_obj.replace(day=1)
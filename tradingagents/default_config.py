@@ -8,15 +8,52 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # 持久化的按股票价格库（每个ticker一份完整历史，只增量拉取新K线）
+    "price_store_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/price_store",
+    ),
+    # CLI 批量运行前用一次多标的 yf.download 预热价格库
+    "price_warmup_enabled": True,
+    # SimFin 基本面按股票分区的时点存储（首次访问时从全量CSV一次性导入）
+    "simfin_store_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/simfin_store",
+    ),
+    # Finnhub 本地 JSON 数据集缓存："memory" 每个进程只解析一次；"sqlite" 持久化为带日期索引的表，跨运行复用
+    "finnhub_cache_backend": "memory",
+    "finnhub_sqlite_path": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/finnhub.sqlite",
+    ),
+    "finnhub_cache_max_datasets": 64,
+    # yfinance 财报按财期持久化存储（下一次财报披露前复用；披露滞后天数用于估算下一次披露日）
+    "fundamentals_store_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/fundamentals_store",
+    ),
+    "fundamentals_filing_lag_days": {"quarterly": 45, "annual": 90},
+    # 批量运行前预取全部标的的 yfinance 财报（仅预取数据源配置为 yfinance 的报表）
+    "fundamentals_prefetch_enabled": True,
+    "fundamentals_prefetch_workers": 8,
+    # 进程内 stockstats 指标帧 LRU 缓存上限
+    "stockstats_cache_max_entries": 32,
+    "stockstats_cache_max_mb": 256,
     # LLM settings
     "llm_provider": "ollama",
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "http://100.103.46.96:11434/v1",
+    # 分析师执行模式："sequential" 依次运行；"parallel" 作为并行分支运行（各自独立的消息通道），在 Bull Researcher 前汇合
+    "analyst_execution_mode": "sequential",
     # Debate and discussion settings
     "max_debate_rounds": 3,
     "max_risk_discuss_rounds": 3,
     "max_recur_limit": 100,
+    # 交易日历：离线 NYSE/NASDAQ 节假日规则
+    "trading_calendar_exchange": "NYSE",
+    "schedule_sessions_only": True,        # CLI 批量运行只在交易日调度（跳过周末和交易所节假日）
+    "trading_window_unit": "sessions",     # 指标/价格回看与前瞻窗口单位："sessions" 交易日，"calendar" 自然日
     # Trading and backtesting defaults
     "default_trade_quantity": 1,
     "backtest_lookback_days": 30,
@@ -48,5 +85,77 @@ DEFAULT_CONFIG = {
         "get_stock_data": "yfinance",  # Override category default
         # Example: "get_news": "openai",               # Override category default
     },
+    # 数据源响应缓存（SQLite，按 (方法, 数据源, 参数) 缓存，TTL 按数据类别区分当日/历史请求，单位：秒）
+    "vendor_cache_enabled": True,
+    "vendor_cache_path": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/vendor_cache.sqlite",
+    ),
+    "vendor_cache_ttl": {
+        "core_stock_apis": {"live": 15 * 60, "historical": 30 * 86400},
+        "technical_indicators": {"live": 15 * 60, "historical": 30 * 86400},
+        "fundamental_data": {"live": 86400, "historical": 90 * 86400},
+        "news_data": {"live": 60 * 60, "historical": 86400},
+    },
+    "vendor_cache_negative_ttl_seconds": 10 * 60,  # “No data found …”类空结果最多缓存多久；“Error …”类错误文本从不缓存
+    "vendor_cache_skip_vendors": ["local"],  # 本地文件数据源已有自己的索引，不再重复缓存
+    # 数据源调用录制/回放："record" 把每次路由结果压缩写入本地归档；"replay" 只从归档读取（零网络），未录制的调用直接报错
+    "vendor_replay_mode": "off",           # Options: off, record, replay
+    "vendor_replay_path": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/vendor_recording.sqlite",
+    ),
+    # 数据源路由模式："sequential" 逐个尝试；"hedged" 主数据源超过 hedge 延迟未返回时并行启动下一个，先成功者胜出
+    "vendor_routing_mode": "sequential",
+    "vendor_hedge_delay_seconds": 5.0,
+    "vendor_default_deadline_seconds": 90.0,
+    "vendor_deadlines": {                   # 按方法覆盖的总截止时间（秒）
+        "get_stock_data": 30.0,
+        "get_indicators": 30.0,
+    },
+    "vendor_hedge_max_workers": 8,
+    # 多实现数据源（如 local 的 get_news）与逗号分隔的多数据源配置并发执行，结果按配置顺序合并
+    "vendor_fanout_parallel": True,
+    "vendor_fanout_max_workers": 4,
+    "vendor_fanout_timeout_seconds": 60.0,  # 每个实现从开始运行起的超时
+    "vendor_fanout_timeouts": {},           # 按方法覆盖，例如 {"get_news": 90.0}
+    # 异步执行（apropagate）：工具调用在共享的有界线程池中执行，同一事件循环上并发运行的图数量上限
+    "vendor_async_max_workers": 16,
+    "async_max_concurrent_runs": 4,
+    # LLM 响应精确匹配缓存（默认关闭）：同一模型配置 + 同一组消息直接复用上次响应，便于反复调试下游环节
+    "llm_cache_enabled": False,
+    "llm_cache_path": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/llm_cache.sqlite",
+    ),
+    "llm_cache_max_bytes": 256 * 1024 * 1024,  # 超过后按最近使用时间淘汰
+    "llm_cache_bypass_nodes": [],           # 不走缓存的节点名，例如 ["Risk Judge"]
+    "llm_cache_ignore_patterns": None,      # 计算键时忽略的易变文本正则，None 表示默认（数据抓取时间戳）
+    # 辩论历史滚动压缩（默认关闭）：提示词中的辩论历史超出预算时，最近一轮保留原文，更早的发言折叠成增量摘要
+    "debate_history_compaction": False,
+    "debate_history_token_budget": 2000,    # 每个提示词中辩论历史部分的 token 上限（按约 4 字符/token 估算）
+    "http_timeout_seconds": 30,            # 所有数据源 HTTP 请求的超时时间（秒）
+    # Google News 抓取礼貌预算（按主机共享）与结果页磁盘缓存
+    "google_news_max_concurrency": 2,      # 同一主机同时进行的请求数
+    "google_news_min_interval_seconds": 1.5,  # 相邻请求启动的最小间隔
+    "google_news_jitter_seconds": 1.0,     # 间隔上附加的随机抖动
+    "google_news_page_ttl_seconds": 6 * 3600,  # 仅对截止日期为今天的结果页生效；历史区间的页永久缓存
+    "google_news_cache_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/google_news_pages",
+    ),
+    # Alpha Vantage 客户端限速（按订阅计划设置；默认为免费计划 5次/分钟、25次/天，None 表示不限每日次数）
+    "alpha_vantage_calls_per_minute": 5,
+    "alpha_vantage_calls_per_day": 25,
+    "alpha_vantage_max_wait_seconds": 120,  # 排队等待令牌的最长时间，超过则视为限流并回退到其他数据源
+    "alpha_vantage_usage_path": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/alpha_vantage_usage.json",
+    ),
+    # 数据源健康度与熔断：连续失败达到阈值（或遇到限流）即熔断，冷却后放行一次探测请求
+    "vendor_health_window": 20,            # 滚动错误率统计窗口（最近N次调用）
+    "vendor_health_error_rate_threshold": 0.5,  # 错误率超过该值的数据源排到后面
+    "vendor_breaker_failure_threshold": 3,  # 连续失败多少次后熔断
+    "vendor_breaker_cooldown_seconds": 60.0,  # 熔断后冷却多久再放行探测请求（秒）
     "chroma_persist_path": "./chroma_memory",  # chromadb 持久化路径
 }
@@ -0,0 +1,177 @@
+"""
+多标的批量运行器
+同一交易日的多个标的并发运行交易图，再按确定顺序把各自的交易建议对共享账户逐笔撮合后统一提交
+"""
+
+import asyncio
+import copy
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from tradingagents.agents.utils.account import apply_trade
+
+# 撮合顺序中各动作的先后：先卖出释放现金，再买入，最后是观望
+ACTION_ORDER = {"SELL": 0, "BUY": 1, "HOLD": 2}
+
+
+def _safe_float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _position(account_state: Dict[str, Any], ticker: str) -> Dict[str, Any]:
+    positions = account_state.get("positions") or {}
+    return positions.get(ticker, {}) if isinstance(positions, dict) else {}
+
+
+def reconcile_trades(
+    account_state: Dict[str, Any],
+    proposals: List[Dict[str, Any]],
+    priorities: Optional[Dict[str, int]] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """把各标的独立给出的交易建议按确定顺序撮合到同一个账户上。
+
+    顺序：卖出 → 买入 → 观望；同类动作按 ``priorities``（数值小者优先，默认按建议列表顺序），
+    再按代码排序，因此结果与各运行完成的先后无关。
+    每笔买入按撮合时的实时现金重新计算上限（可用现金 × max_allocation_pct），
+    卖出不超过当前持仓；被削减或无法成交的建议会在成交记录中标明。
+
+    Returns:
+        (提交后的账户状态, 按撮合顺序排列的成交记录列表)
+    """
+    priorities = priorities or {}
+    ranked = sorted(
+        enumerate(proposals),
+        key=lambda item: (
+            ACTION_ORDER.get(item[1].get("action", "HOLD"), len(ACTION_ORDER)),
+            priorities.get(item[1]["ticker"], item[0]),
+            item[1]["ticker"],
+        ),
+    )
+
+    account = copy.deepcopy(account_state)
+    fills = []
+    for _, proposal in ranked:
+        ticker = proposal["ticker"]
+        action = proposal.get("action", "HOLD")
+        requested = max(int(proposal.get("quantity") or 0), 0)
+        price = _safe_float(proposal.get("reference_price"))
+        cash_before = _safe_float(account.get("cash_balance"))
+        position_before = _position(account, ticker)
+        held = int(position_before.get("shares", 0))
+
+        filled, status = 0, "hold"
+        if action in ("BUY", "SELL"):
+            if price <= 0:
+                status = "no price"
+            elif action == "SELL":
+                filled = min(requested, held)
+            else:
+                allocation_pct = max(min(_safe_float(account.get("max_allocation_pct"), 0.1), 1.0), 0.0)
+                usable_cash = max(cash_before - _safe_float(account.get("min_cash_reserve")), 0.0)
+                filled = min(requested, int(usable_cash * allocation_pct // price))
+            if price > 0:
+                status = "filled" if filled == requested else ("clipped" if filled > 0 else "rejected")
+            account = apply_trade(account, ticker, action, filled, price)
+
+        position_after = _position(account, ticker)
+        fills.append(
+            {
+                "ticker": ticker,
+                "action": action,
+                "requested_quantity": requested,
+                "quantity": filled,
+                "reference_price": price,
+                "trade_value": round(filled * price, 2),
+                "status": status,
+                "cash_before": cash_before,
+                "cash_after": _safe_float(account.get("cash_balance")),
+                "position_before": held,
+                "position_after": int(position_after.get("shares", 0)),
+                "avg_cost_before": position_before.get("avg_cost", 0.0),
+                "avg_cost_after": position_after.get("avg_cost", 0.0),
+            }
+        )
+    return account, fills
+
+
+def save_account_state(path: str, account_state: Dict[str, Any]) -> None:
+    """原子写入账户状态文件（先写临时文件再替换）"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(account_state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class BatchRunner:
+    """同一交易日多标的并发运行，结束后对共享账户确定性撮合"""
+
+    def __init__(self, graph, max_workers: Optional[int] = None):
+        self.graph = graph
+        if max_workers is None:
+            max_workers = graph.config.get("async_max_concurrent_runs", 4)
+        self.max_workers = max(1, int(max_workers))
+
+    def run(
+        self,
+        tickers: Iterable[str],
+        trade_date: str,
+        account_state: Dict[str, Any],
+        priorities: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
+        """同步入口，见 ``arun``"""
+        return asyncio.run(self.arun(tickers, trade_date, account_state, priorities))
+
+    async def arun(
+        self,
+        tickers: Iterable[str],
+        trade_date: str,
+        account_state: Dict[str, Any],
+        priorities: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
+        """并发运行所有标的并撮合交易。
+
+        每个标的都从同一份账户快照出发独立决策（最多 ``max_workers`` 个同时运行），
+        全部完成后才调用 ``reconcile_trades`` 得到唯一的提交账户；运行失败的标的不参与撮合。
+
+        Returns:
+            {"trade_date", "account_state": 提交后的账户, "fills": 成交记录,
+             "runs": {ticker: {"final_state", "decision", "error"}}}
+        """
+        tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        snapshot = copy.deepcopy(account_state)
+        results = await self.graph.apropagate_many(
+            [(ticker, trade_date) for ticker in tickers],
+            max_concurrency=self.max_workers,
+            account_state=snapshot,
+        )
+
+        runs, proposals = {}, []
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, BaseException):
+                runs[ticker] = {"final_state": None, "decision": "", "error": str(result)}
+                print(f"FAILED: Batch run for {ticker} on {trade_date}: {result}")
+                continue
+            final_state, decision = result
+            runs[ticker] = {"final_state": final_state, "decision": decision, "error": None}
+            trade = final_state.get("recommended_trade") or {}
+            proposals.append(
+                {
+                    "ticker": ticker,
+                    "action": (trade.get("action") or decision or "HOLD").upper(),
+                    "quantity": trade.get("quantity", 0),
+                    "reference_price": trade.get("reference_price"),
+                }
+            )
+
+        committed, fills = reconcile_trades(snapshot, proposals, priorities)
+        return {
+            "trade_date": trade_date,
+            "account_state": committed,
+            "fills": fills,
+            "runs": runs,
+        }
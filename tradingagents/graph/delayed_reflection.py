@@ -8,7 +8,6 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import pandas as pd
-from io import StringIO
 
 
 class DelayedReflectionManager:
@@ -82,7 +81,8 @@ class DelayedReflectionManager:
         Returns:
             处理统计信息
         """
-        from tradingagents.agents.utils.core_stock_tools import get_stock_data
+        from tradingagents.dataflows.market_data import get_price_frame
+        from tradingagents.dataflows.trading_calendar import window_end
         
         pending_queue = self._load_queue()
         current_dt = datetime.strptime(current_date, "%Y-%m-%d").date()
@@ -101,25 +101,19 @@ class DelayedReflectionManager:
             
             decision_dt = datetime.strptime(item["decision_date"], "%Y-%m-%d").date()
             age_days = (current_dt - decision_dt).days
+            # 前瞻窗口按交易日计算，必须整段都不晚于当前日期，否则回测会读到未来价格
+            end_date = window_end(item["decision_date"], lookforward_days)
             
             # 检查是否已经有足够的未来数据
-            if age_days < min_age_days:
+            if age_days < min_age_days or end_date > current_date:
                 updated_queue.append(item)
                 skipped_count += 1
                 continue
             
             try:
-                # 获取决策日期之后的价格数据
-                end_date = (decision_dt + timedelta(days=lookforward_days)).isoformat()
-                
-                price_data_str = get_stock_data.invoke({
-                    "symbol": item["ticker"],
-                    "start_date": item["decision_date"],
-                    "end_date": end_date,
-                })
-                
-                price_data = pd.read_csv(StringIO(price_data_str), comment="#")
-                price_data.columns = price_data.columns.str.strip().str.lower()
+                # get_price_frame 的结束日期不含当天：传入窗口最后一个交易日的次日，才能读满整个前瞻窗口
+                price_end = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+                price_data = get_price_frame(item["ticker"], item["decision_date"], price_end)
                 
                 if price_data.empty:
                     updated_queue.append(item)
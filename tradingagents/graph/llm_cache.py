@@ -0,0 +1,201 @@
+"""
+LLM 响应精确匹配缓存
+以 LangChain BaseCache 的形式挂到 TradingAgentsGraph 创建的聊天模型上：同一模型配置、同一组消息再次调用时直接返回上次的响应
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+from langchain_core.caches import BaseCache
+
+# 消息序列化中与内容无关、每次调用都会变化的字段
+_VOLATILE_MESSAGE_FIELDS = ("response_metadata", "usage_metadata")
+
+# 默认忽略的易变文本：工具输出里的数据抓取时间戳
+DEFAULT_IGNORE_PATTERNS = [r"# Data retrieved on: [0-9: -]+"]
+
+_OUTSIDE_GRAPH = "(outside graph)"
+
+
+def _current_node() -> str:
+    """当前正在执行的 LangGraph 节点名；不在图中调用时返回占位名"""
+    try:
+        from langgraph.config import get_config
+
+        return get_config().get("metadata", {}).get("langgraph_node") or _OUTSIDE_GRAPH
+    except Exception:
+        return _OUTSIDE_GRAPH
+
+
+class LLMResponseCache(BaseCache):
+    """SQLite 持久化的聊天模型响应缓存。
+
+    键为 ``(llm_string, 规范化消息)`` 的 SHA-256：``llm_string`` 由 LangChain 生成，
+    包含模型类（即 provider）、模型名、temperature 等参数以及 bind_tools 绑定的工具 schema；
+    消息去掉 id、响应元数据与 ``ignore_patterns`` 匹配的易变文本后序列化。
+    总大小超过 ``max_bytes`` 时按最近使用时间淘汰最旧的条目。
+    ``bypass_nodes`` 中的节点既不读也不写缓存。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        bypass_nodes: Optional[Iterable[str]] = None,
+        ignore_patterns: Optional[Iterable[str]] = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.bypass_nodes = set(bypass_nodes or [])
+        self._ignore = [re.compile(p) for p in (DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns)]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                node TEXT,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._bytes_stored = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "evicted": 0}
+        self._by_node: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------ #
+    # BaseCache 接口
+    # ------------------------------------------------------------------ #
+    def lookup(self, prompt: str, llm_string: str):
+        node = _current_node()
+        if node in self.bypass_nodes:
+            self._count(node, "bypassed")
+            return None
+        key = self.cache_key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+        self._count(node, "misses" if row is None else "hits")
+        if row is None:
+            return None
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        node = _current_node()
+        if node in self.bypass_nodes:
+            return
+        key = self.cache_key(prompt, llm_string)
+        payload = zlib.compress(pickle.dumps(return_val, protocol=pickle.HIGHEST_PROTOCOL))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, node, created, last_used, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, node, now, now, len(payload), payload),
+            )
+            self._bytes_stored += len(payload) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._bytes_stored = 0
+
+    # ------------------------------------------------------------------ #
+    # 键与统计
+    # ------------------------------------------------------------------ #
+    def cache_key(self, prompt: str, llm_string: str) -> str:
+        normalized = self._normalize_prompt(prompt)
+        return hashlib.sha256(f"{llm_string}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def stats(self) -> dict:
+        """命中/未命中/绕过/淘汰计数、命中率、按节点的明细以及存储大小"""
+        with self._lock:
+            stats = dict(self._stats)
+            by_node = {node: dict(counts) for node, counts in self._by_node.items()}
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            stats["bytes_stored"] = self._bytes_stored
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        for counts in by_node.values():
+            node_lookups = counts.get("hits", 0) + counts.get("misses", 0)
+            counts["hit_rate"] = counts.get("hits", 0) / node_lookups if node_lookups else 0.0
+        stats["entries"] = entries
+        stats["by_node"] = by_node
+        return stats
+
+    def _normalize_prompt(self, prompt: str) -> str:
+        try:
+            messages = json.loads(prompt)
+        except (TypeError, ValueError):
+            text = prompt
+        else:
+            for message in messages if isinstance(messages, list) else []:
+                kwargs = message.get("kwargs") if isinstance(message, dict) else None
+                if isinstance(kwargs, dict):
+                    for field in _VOLATILE_MESSAGE_FIELDS:
+                        kwargs.pop(field, None)
+            text = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+        for pattern in self._ignore:
+            text = pattern.sub("", text)
+        return text
+
+    def _count(self, node: str, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+            counts = self._by_node.setdefault(node, {"hits": 0, "misses": 0, "bypassed": 0})
+            counts[outcome] += 1
+
+    def _evict(self) -> None:
+        # 调用方持有锁；淘汰到上限的 90%，避免每次写入都触发
+        if self.max_bytes is None or self._bytes_stored <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC").fetchall()
+        for key, size in rows:
+            if self._bytes_stored <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._bytes_stored -= size
+            self._stats["evicted"] += 1
+
+
+_caches: Dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache(config: Dict[str, Any]) -> Optional[LLMResponseCache]:
+    """按配置返回进程内共享的 LLM 响应缓存；未开启 ``llm_cache_enabled`` 时返回 None"""
+    if not config.get("llm_cache_enabled", False):
+        return None
+    path = config.get("llm_cache_path") or os.path.join(config["data_cache_dir"], "llm_cache.sqlite")
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = LLMResponseCache(
+                path,
+                max_bytes=config.get("llm_cache_max_bytes", 256 * 1024 * 1024),
+                bypass_nodes=config.get("llm_cache_bypass_nodes", []),
+                ignore_patterns=config.get("llm_cache_ignore_patterns"),
+            )
+        cache = _caches[path]
+        # 同一缓存文件可被不同实验复用，绕过节点以最新配置为准
+        cache.bypass_nodes = set(config.get("llm_cache_bypass_nodes", []))
+        return cache
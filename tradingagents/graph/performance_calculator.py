@@ -23,6 +23,9 @@ def backtest(trade_signals: List[Dict[str, Any]], price_data: pd.DataFrame, init
     if "date" not in df_signals.columns:
         raise ValueError("trade_signals 缺少 date 字段")
     price_df = price_data.rename(columns={"Date": "date", "Close": "close"})
+    if pd.api.types.is_datetime64_any_dtype(price_df["date"]):
+        # 类型化价格帧的日期为 Timestamp，交易信号中为 yyyy-mm-dd 字符串
+        price_df = price_df.assign(date=price_df["date"].dt.strftime("%Y-%m-%d"))
     df = pd.merge(df_signals, price_df, on="date", how="left")
     
     cash = initial_cash
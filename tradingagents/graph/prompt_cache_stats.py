@@ -0,0 +1,117 @@
+"""
+服务端前缀缓存命中统计
+从模型响应的 usage 元数据中读取命中提供方 KV/前缀缓存的输入 token 数，按 LangGraph 节点汇总，
+用来验证“静态指令在前、易变内容在后”的提示词布局在各节点上的实际效果
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+_OUTSIDE_GRAPH = "(outside graph)"
+
+
+def cached_token_usage(message: Any) -> Optional[Tuple[int, int]]:
+    """返回一条模型响应的 (输入 token 数, 其中命中前缀缓存的 token 数)；提供方未返回用量时为 None。
+
+    优先读取 LangChain 统一的 ``usage_metadata``（OpenAI 的 ``cached_tokens``、Anthropic 的
+    ``cache_read_input_tokens`` 都会映射到 ``input_token_details.cache_read``），
+    否则回退到 OpenAI 兼容服务原样返回的 ``token_usage.prompt_tokens_details.cached_tokens``。
+    不报告缓存命中的服务（例如 Ollama 的 OpenAI 兼容端点）命中数记为 0。
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        details = usage.get("input_token_details") or {}
+        return int(usage.get("input_tokens") or 0), int(details.get("cache_read") or 0)
+
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    if "prompt_tokens" in token_usage:
+        details = token_usage.get("prompt_tokens_details") or {}
+        return int(token_usage["prompt_tokens"] or 0), int(details.get("cached_tokens") or 0)
+    return None
+
+
+def _empty_counts() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "reported_calls": 0,
+        "response_cache_hits": 0,
+        "input_tokens": 0,
+        "cached_tokens": 0,
+        "latency_seconds": 0.0,
+    }
+
+
+class PromptCacheTracker(BaseCallbackHandler):
+    """挂在聊天模型上的回调：按节点累计输入 token、缓存命中 token 与调用耗时。
+
+    命中本地 LLM 响应缓存（``llm_cache``）的调用没有真正请求提供方，LangChain 会在其 usage 中
+    写入 ``total_cost: 0`` 标记；这类调用只计入 ``response_cache_hits``，不计入 token 与耗时。
+    """
+
+    # 在事件循环中直接执行回调，保证同一调用的 start 先于 end 被处理
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[UUID, Tuple[str, float]] = {}
+        self._by_node: Dict[str, Dict[str, Any]] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node") or _OUTSIDE_GRAPH
+        with self._lock:
+            self._pending[run_id] = (node, time.monotonic())
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            node, started = self._pending.pop(run_id, (_OUTSIDE_GRAPH, None))
+        elapsed = time.monotonic() - started if started is not None else 0.0
+
+        message = None
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                break
+            break
+        usage = getattr(message, "usage_metadata", None) or {}
+
+        with self._lock:
+            counts = self._by_node.setdefault(node, _empty_counts())
+            counts["calls"] += 1
+            if "total_cost" in usage:
+                counts["response_cache_hits"] += 1
+                return
+            counts["latency_seconds"] += elapsed
+            token_usage = cached_token_usage(message)
+            if token_usage is not None:
+                counts["reported_calls"] += 1
+                counts["input_tokens"] += token_usage[0]
+                counts["cached_tokens"] += token_usage[1]
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._pending.pop(run_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """汇总与按节点的调用数、输入/缓存 token、缓存 token 占比（cached_ratio）与平均耗时"""
+        with self._lock:
+            by_node = {node: dict(counts) for node, counts in self._by_node.items()}
+        total = _empty_counts()
+        for counts in by_node.values():
+            for field in total:
+                total[field] += counts[field]
+        for counts in list(by_node.values()) + [total]:
+            counts["cached_ratio"] = (
+                counts["cached_tokens"] / counts["input_tokens"] if counts["input_tokens"] else 0.0
+            )
+            provider_calls = counts["calls"] - counts["response_cache_hits"]
+            counts["avg_latency_seconds"] = counts["latency_seconds"] / provider_calls if provider_calls else 0.0
+        total["by_node"] = by_node
+        return total
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_node.clear()
@@ -4,9 +4,11 @@ from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.debate_compaction import DebateHistoryCompactor
 from tradingagents.agents.researchers.philosophical_researcher import (
     create_philosophical_bull_researcher,
     create_philosophical_bear_researcher,
@@ -14,6 +16,14 @@ from tradingagents.agents.researchers.philosophical_researcher import (
 
 from .conditional_logic import ConditionalLogic
 
+# 每个分析师写入的报告字段
+ANALYST_REPORT_FIELDS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
 
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
@@ -91,6 +101,14 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        # 辩论历史压缩（默认关闭）：超出预算时较早的发言由快速模型折叠成增量摘要
+        compactor = None
+        if self.config.get("debate_history_compaction", False):
+            compactor = DebateHistoryCompactor(
+                self.quick_thinking_llm,
+                token_budget=self.config.get("debate_history_token_budget", 2000),
+            )
+
         # Create researcher and manager nodes
         # 检查是否启用哲学三观系统
         use_philosophical_worldview = self.config.get("use_philosophical_worldview", False)
@@ -119,35 +137,45 @@ class GraphSetup:
         else:
             # 使用传统的Researcher
             bull_researcher_node = create_bull_researcher(
-                self.quick_thinking_llm, self.bull_memory
+                self.quick_thinking_llm, self.bull_memory, compactor=compactor
             )
             bear_researcher_node = create_bear_researcher(
-                self.quick_thinking_llm, self.bear_memory
+                self.quick_thinking_llm, self.bear_memory, compactor=compactor
             )
         
         research_manager_node = create_research_manager(
-            self.deep_thinking_llm, self.invest_judge_memory
+            self.deep_thinking_llm, self.invest_judge_memory, compactor=compactor
         )
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(self.quick_thinking_llm, compactor=compactor)
+        neutral_analyst = create_neutral_debator(self.quick_thinking_llm, compactor=compactor)
+        safe_analyst = create_safe_debator(self.quick_thinking_llm, compactor=compactor)
         risk_manager_node = create_risk_manager(
-            self.deep_thinking_llm, self.risk_manager_memory
+            self.deep_thinking_llm, self.risk_manager_memory, compactor=compactor
         )
 
         # Create workflow
         workflow = StateGraph(AgentState)
 
+        # 分析师执行模式："sequential" 依次运行；"parallel" 各自作为独立分支并行运行，在 Bull Researcher 前汇合
+        parallel_analysts = self.config.get("analyst_execution_mode", "sequential") == "parallel"
+
         # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
-            workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
-            )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        if parallel_analysts:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._build_analyst_branch(analyst_type, node, tool_nodes[analyst_type]),
+                )
+        else:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+                workflow.add_node(
+                    f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                )
+                workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -160,30 +188,37 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
+        if parallel_analysts:
+            # Fan out from START, join before Bull Researcher
+            branches = [f"{analyst_type.capitalize()} Analyst" for analyst_type in selected_analysts]
+            for branch in branches:
+                workflow.add_edge(START, branch)
+            workflow.add_edge(branches, "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -233,3 +268,37 @@ class GraphSetup:
 
         # Compile and return
         return workflow.compile()
+
+    def _build_analyst_branch(self, analyst_type: str, analyst_node, tool_node):
+        """Wrap one analyst and its tool loop as a single node with its own message channel.
+
+        The analyst runs in a private subgraph that starts from the initial
+        messages of the run; only its report field is written back, so parallel
+        branches never touch the shared ``messages`` channel.
+        """
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+
+        branch = StateGraph(AgentState)
+        branch.add_node(analyst_name, analyst_node)
+        branch.add_node(tools_name, tool_node)
+        branch.add_edge(START, analyst_name)
+        branch.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {tools_name: tools_name, f"Msg Clear {analyst_type.capitalize()}": END},
+        )
+        branch.add_edge(tools_name, analyst_name)
+        subgraph = branch.compile()
+        report_field = ANALYST_REPORT_FIELDS[analyst_type]
+
+        def analyst_branch(state, config: RunnableConfig):
+            # 分支内的工具调用消息只存在于子图中，互不干扰
+            result = subgraph.invoke({**state, "messages": list(state["messages"])}, config)
+            return {report_field: result.get(report_field, "")}
+
+        async def aanalyst_branch(state, config: RunnableConfig):
+            result = await subgraph.ainvoke({**state, "messages": list(state["messages"])}, config)
+            return {report_field: result.get(report_field, "")}
+
+        return RunnableLambda(analyst_branch, afunc=aanalyst_branch, name=analyst_name)
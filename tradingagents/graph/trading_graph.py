@@ -1,6 +1,8 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import copy
+import asyncio
 from pathlib import Path
 import json
 from datetime import date
@@ -20,6 +22,7 @@ from tradingagents.agents.utils.agent_states import (
     InvestDebateState,
     RiskDebateState,
 )
+from tradingagents.agents.utils.debate_compaction import compaction_report
 from tradingagents.dataflows.config import set_config
 
 # Import the new abstract tool methods from agent_utils
@@ -42,6 +45,8 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .llm_cache import get_llm_cache
+from .prompt_cache_stats import PromptCacheTracker
 
 
 class TradingAgentsGraph:
@@ -72,16 +77,19 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
+        # Initialize LLMs (optionally behind the exact-match response cache); the tracker
+        # records provider-side prefix cache hits reported in usage metadata, per node
+        self.llm_cache = get_llm_cache(self.config)
+        self.prompt_cache_tracker = PromptCacheTracker()
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"].lower() == "zhipu" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache, callbacks=[self.prompt_cache_tracker])
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache, callbacks=[self.prompt_cache_tracker])
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache, callbacks=[self.prompt_cache_tracker])
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache, callbacks=[self.prompt_cache_tracker])
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=self.llm_cache, callbacks=[self.prompt_cache_tracker])
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=self.llm_cache, callbacks=[self.prompt_cache_tracker])
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -143,7 +151,7 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.log_states_dict = {}  # ticker -> date -> full state dict
 
         # Set up the graph
         self.graph = self.graph_setup.setup_graph(selected_analysts)
@@ -186,24 +194,13 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def propagate(self, company_name, trade_date, account_state=None):
+        """Run the trading agents graph for a company on a specific date.
 
-        self.ticker = company_name
-        
-        # 如果使用分层记忆，设置当前ticker
-        if self.config.get("use_hierarchical_memory", False):
-            self.bull_memory.set_ticker(company_name)
-            self.bear_memory.set_ticker(company_name)
-            self.trader_memory.set_ticker(company_name)
-            self.invest_judge_memory.set_ticker(company_name)
-            self.risk_manager_memory.set_ticker(company_name)
-
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
-        )
-        args = self.propagator.get_graph_args()
+        ``account_state`` (cash, positions, limits) replaces the configured
+        starting account when given.
+        """
+        init_agent_state, args = self._start_run(company_name, trade_date, account_state)
 
         if self.debug:
             # Debug mode with tracing
@@ -220,6 +217,78 @@ class TradingAgentsGraph:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
 
+        return self._finish_run(trade_date, final_state)
+
+    async def apropagate(self, company_name, trade_date, account_state=None):
+        """Async variant of ``propagate``: LLM calls are awaited and tools run on the vendor pool.
+
+        Several runs can share one event loop (see ``apropagate_many``); the
+        return value is the same ``(final_state, processed_decision)`` pair.
+        """
+        init_agent_state, args = self._start_run(company_name, trade_date, account_state)
+
+        if self.debug:
+            trace = []
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
+            final_state = trace[-1]
+        else:
+            final_state = await self.graph.ainvoke(init_agent_state, **args)
+
+        # Signal extraction may call the LLM and logging writes files; keep both off the loop
+        return await asyncio.to_thread(self._finish_run, trade_date, final_state)
+
+    async def apropagate_many(self, runs, max_concurrency=None, account_state=None):
+        """Run ``[(company_name, trade_date), ...]`` concurrently on the current event loop.
+
+        At most ``max_concurrency`` (default ``async_max_concurrent_runs``)
+        graphs are in flight at once; every run starts from its own copy of
+        ``account_state``. Results are returned in input order; a failed run
+        yields its exception instead of a result.
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config.get("async_max_concurrent_runs", 4)
+        if self.config.get("use_hierarchical_memory", False):
+            # 分层记忆按实例记录当前 ticker，并发运行会互相覆盖
+            max_concurrency = 1
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+        async def run(company_name, trade_date):
+            async with semaphore:
+                return await self.apropagate(company_name, trade_date, account_state)
+
+        return await asyncio.gather(
+            *(run(company_name, trade_date) for company_name, trade_date in runs),
+            return_exceptions=True,
+        )
+
+    def _start_run(self, company_name, trade_date, account_state=None):
+        """Prepare memories and the initial state of one run."""
+        self.ticker = company_name
+
+        # 如果使用分层记忆，设置当前ticker
+        if self.config.get("use_hierarchical_memory", False):
+            self.bull_memory.set_ticker(company_name)
+            self.bear_memory.set_ticker(company_name)
+            self.trader_memory.set_ticker(company_name)
+            self.invest_judge_memory.set_ticker(company_name)
+            self.risk_manager_memory.set_ticker(company_name)
+
+        # Initialize state
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        if account_state is not None:
+            init_agent_state["account_state"] = copy.deepcopy(account_state)
+        return init_agent_state, self.propagator.get_graph_args()
+
+    def _finish_run(self, trade_date, final_state):
+        """Attach signals, store and log the final state, and extract the decision."""
         trade_signals = self.attach_trade_signals(final_state)
 
         # Store current state for reflection
@@ -237,7 +306,10 @@ class TradingAgentsGraph:
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        # Keyed by ticker first so concurrent runs of different tickers keep separate logs
+        ticker = final_state["company_of_interest"]
+        ticker_log = self.log_states_dict.setdefault(ticker, {})
+        ticker_log[str(trade_date)] = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -276,16 +348,18 @@ class TradingAgentsGraph:
             "account_state": final_state.get("account_state", {}),
             "recommended_trade": final_state.get("recommended_trade", {}),
         }
+        if self.config.get("debate_history_compaction", False):
+            ticker_log[str(trade_date)]["debate_compaction"] = compaction_report(final_state)
 
         # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
         with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
             "w",
         ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            json.dump(ticker_log, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
@@ -305,6 +379,14 @@ class TradingAgentsGraph:
             self.curr_state, returns_losses, self.risk_manager_memory
         )
 
+    def get_llm_cache_stats(self):
+        """Hit/miss/bypass counters of the LLM response cache, overall and per node (empty when disabled)."""
+        return self.llm_cache.stats() if self.llm_cache is not None else {}
+
+    def get_prompt_cache_stats(self):
+        """Provider prefix-cache usage: input vs cached prompt tokens and latency, overall and per node."""
+        return self.prompt_cache_tracker.stats()
+
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)